@@ -2,7 +2,9 @@
 
 import json
 import os
+import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, TypedDict
 
 # --- Dépendances externes (à installer) ---
@@ -10,7 +12,12 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 from apify_client import ApifyClient
 import http.client
-from tavily import TavilyClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from Lead_Identification.common.config import PERSONNEL_RESEARCH_MAX_WORKERS
+from Lead_Identification.common.json_parsing import extract_json
+from Lead_Identification.common.search_cache import get_search_client
 
 # --- Configuration initiale ---
 load_dotenv()
@@ -23,7 +30,7 @@ TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
 # Configuration des clients
 genai.configure(api_key=GEMINI_API_KEY)
-tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
+tavily_client = get_search_client()
 llm = genai.GenerativeModel('models/gemini-1.5-flash')
 
 
@@ -39,43 +46,48 @@ class KeyPersonnel(TypedDict):
     points_of_interest: Optional[List[str]]
     potential_pain_points: Optional[List[str]]
 
-def get_enriched_personnel_profiles(
-    personnel_list: List[Dict[str, Any]],
+def search_person_context(queries: List[str]) -> str:
+    """Lance les recherches Tavily d'une personne en parallèle ; le contexte garde l'ordre des requêtes."""
+    def run_query(q):
+        try:
+            resp = tavily_client.search(query=q, search_depth="advanced", max_results=2)
+            return "\n".join([res.get("content","") for res in resp.get("results", [])]) + "\n"
+        except Exception as e:
+            print(f"Erreur lors de la recherche Tavily pour la requête '{q}': {e}")
+            return ""
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        return "".join(pool.map(run_query, queries))
+
+def research_person(
+    person: Dict[str, Any],
     company_name: str,
     icp: Dict[str, Any]
-) -> List[KeyPersonnel]:
-    """Enrichit les profils via Tavily et Gemini."""
-    enriched_personnel_list: List[KeyPersonnel] = []
-    for person in personnel_list:
-        name = person.get("name")
-        if not name:
-            continue
-        
-        enriched: KeyPersonnel = {
-            "name": name,
-            "title": person.get("title"),
-            "linkedin_profile": person.get("linkedin_profile"),
-            "recent_activity": "No specific recent activity found.",
-            "points_of_interest": [],
-            "potential_pain_points": []
-        }
-        
-        queries = [
-            f'recent articles or interviews by "{name}" "{company_name}"',
-            f'"{name}" "{company_name}" professional focus priorities',
-            f'linkedin posts by "{name}" on challenges in the {icp.get("industry", {}).get("tier1_core_focus",[None])[0]} sector'
-        ]
-        
-        context = ""
-        for q in queries:
-            try:
-                resp = tavily_client.search(query=q, search_depth="advanced", max_results=2)
-                context += "\n".join([res.get("content","") for res in resp.get("results", [])]) + "\n"
-            except Exception as e:
-                print(f"Erreur lors de la recherche Tavily pour la requête '{q}': {e}")
+) -> Optional[KeyPersonnel]:
+    """Enrichit le profil d'une personne via Tavily et Gemini."""
+    name = person.get("name")
+    if not name:
+        return None
+    
+    enriched: KeyPersonnel = {
+        "name": name,
+        "title": person.get("title"),
+        "linkedin_profile": person.get("linkedin_profile"),
+        "recent_activity": "No specific recent activity found.",
+        "points_of_interest": [],
+        "potential_pain_points": []
+    }
+    
+    queries = [
+        f'recent articles or interviews by "{name}" "{company_name}"',
+        f'"{name}" "{company_name}" professional focus priorities',
+        f'linkedin posts by "{name}" on challenges in the {icp.get("industry", {}).get("tier1_core_focus",[None])[0]} sector'
+    ]
+    
+    context = search_person_context(queries)
 
-        if context.strip():
-            prompt = f"""
+    if context.strip():
+        prompt = f"""
 Based on the following information about {name}, {enriched['title']} at {company_name}, and ICP pain points: {', '.join(icp.get('pain_points',[]))}:
 
 Research context:
@@ -90,19 +102,28 @@ Please return a JSON object with:
   "potential_pain_points": ["...", "..."]
 }}
 """
-            try:
-                resp = llm.generate_content(prompt)
-                text = resp.text.strip()
-                js_start = text.find("{")
-                js_end = text.rfind("}")
-                if js_start != -1 and js_end != -1:
-                    parsed = json.loads(text[js_start:js_end+1])
-                    enriched.update(parsed)
-            except Exception as e:
-                print(f"Erreur lors de l'appel à Gemini pour {name}: {e}")
-
-        enriched_personnel_list.append(enriched)
-    return enriched_personnel_list
+        try:
+            resp = llm.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(response_mime_type="application/json")
+            )
+            enriched.update(extract_json(resp.text, expect=dict))
+        except Exception as e:
+            print(f"Erreur lors de l'appel à Gemini pour {name}: {e}")
+
+    return enriched
+
+def get_enriched_personnel_profiles(
+    personnel_list: List[Dict[str, Any]],
+    company_name: str,
+    icp: Dict[str, Any]
+) -> List[KeyPersonnel]:
+    """Enrichit les profils via Tavily et Gemini, toutes les personnes en parallèle (ordre conservé)."""
+    if not personnel_list:
+        return []
+    with ThreadPoolExecutor(max_workers=min(PERSONNEL_RESEARCH_MAX_WORKERS, len(personnel_list))) as pool:
+        results = pool.map(lambda person: research_person(person, company_name, icp), personnel_list)
+        return [enriched for enriched in results if enriched is not None]
 
 def linkedinsearch(username):
     """Recherche sur LinkedIn via Apify."""
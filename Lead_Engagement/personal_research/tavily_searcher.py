@@ -1,10 +1,16 @@
 import os
-import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, TypedDict
 from dotenv import load_dotenv
 import google.generativeai as genai
 from langchain_google_genai import ChatGoogleGenerativeAI
-from tavily import TavilyClient
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from Lead_Identification.common.config import PERSONNEL_RESEARCH_MAX_WORKERS
+from Lead_Identification.common.json_parsing import JSONParseError, extract_json
+from Lead_Identification.common.search_cache import get_search_client
 load_dotenv()
 
 
@@ -14,7 +20,7 @@ llm = ChatGoogleGenerativeAI(
     temperature=0,
     google_api_key=os.getenv("GEMINI_API_KEY")
 )
-tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+tavily_client = get_search_client()
 
 class KeyPersonnel(TypedDict):
     name: str
@@ -24,35 +30,35 @@ class KeyPersonnel(TypedDict):
     points_of_interest: Optional[List[str]]
     potential_pain_points: Optional[List[str]]
 
-def get_enriched_personnel_profiles(
-    personnel_list: List[Dict[str, Any]],
+def research_person(
+    person: Dict[str, Any],
     company_name: str,
     icp: Dict[str, Any]
-) -> List[KeyPersonnel]:
-    enriched_personnel_list: List[KeyPersonnel] = []
-    for person in personnel_list:
-        name = person.get("name")
-        if not name:
-            continue
-        enriched: KeyPersonnel = {
-            "name": name,
-            "title": person.get("title"),
-            "linkedin_profile": person.get("linkedin_profile"),
-            "recent_activity": "No specific recent activity found.",
-            "points_of_interest": [],
-            "potential_pain_points": []
-        }
-        queries = [
-            f'recent articles or interviews by "{name}" "{company_name}"',
-            f'"{name}" "{company_name}" professional focus priorities',
-            f'linkedin posts by "{name}" on challenges in the {icp.get("industry", {}).get("tier1_core_focus",[None])[0]} sector'
-        ]
-        context = ""
-        for q in queries:
-            resp = tavily_client.search(query=q, search_depth="advanced", max_results=2)
-            context += "\n".join([res.get("content","") for res in resp.get("results", [])]) + "\n"
-        if context.strip():
-            prompt = f"""
+) -> Optional[KeyPersonnel]:
+    name = person.get("name")
+    if not name:
+        return None
+    enriched: KeyPersonnel = {
+        "name": name,
+        "title": person.get("title"),
+        "linkedin_profile": person.get("linkedin_profile"),
+        "recent_activity": "No specific recent activity found.",
+        "points_of_interest": [],
+        "potential_pain_points": []
+    }
+    queries = [
+        f'recent articles or interviews by "{name}" "{company_name}"',
+        f'"{name}" "{company_name}" professional focus priorities',
+        f'linkedin posts by "{name}" on challenges in the {icp.get("industry", {}).get("tier1_core_focus",[None])[0]} sector'
+    ]
+    # The three searches run in parallel; map keeps the query order so the context is deterministic.
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        responses = list(pool.map(lambda q: tavily_client.search(query=q, search_depth="advanced", max_results=2), queries))
+    context = ""
+    for resp in responses:
+        context += "\n".join([res.get("content","") for res in resp.get("results", [])]) + "\n"
+    if context.strip():
+        prompt = f"""
 Based on the following information about {name}, {enriched['title']} at {company_name}, and ICP pain points: {', '.join(icp.get('pain_points',[]))}:
 
 Research context:
@@ -67,18 +73,24 @@ Please return a JSON object with:
   "potential_pain_points": ["...", "..."]
 }}
 """
-            resp = llm.invoke(prompt)
-            text = resp.content.strip()
-            js_start = text.find("{")
-            js_end = text.rfind("}")
-            if js_start != -1 and js_end != -1:
-                try:
-                    parsed = json.loads(text[js_start:js_end+1])
-                    enriched.update(parsed)
-                except json.JSONDecodeError:
-                    pass
-        enriched_personnel_list.append(enriched)
-    return enriched_personnel_list
+        resp = llm.invoke(prompt)
+        try:
+            enriched.update(extract_json(resp.content, expect=dict))
+        except JSONParseError:
+            pass
+    return enriched
+
+def get_enriched_personnel_profiles(
+    personnel_list: List[Dict[str, Any]],
+    company_name: str,
+    icp: Dict[str, Any]
+) -> List[KeyPersonnel]:
+    if not personnel_list:
+        return []
+    # Everyone is researched at once; results come back in personnel_list order.
+    with ThreadPoolExecutor(max_workers=min(PERSONNEL_RESEARCH_MAX_WORKERS, len(personnel_list))) as pool:
+        results = pool.map(lambda person: research_person(person, company_name, icp), personnel_list)
+        return [enriched for enriched in results if enriched is not None]
 
 # if __name__ == "__main__":
 #     personnel_list = [
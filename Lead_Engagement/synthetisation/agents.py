@@ -1,7 +1,12 @@
 import json
 import os
+import sys
 import google.generativeai as genai
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from Lead_Identification.common.json_parsing import extract_json
+
 class DataConsolidationAgent:
     def __init__(self, lead_data_path: str):
         self.lead_data_path = lead_data_path
@@ -127,12 +132,10 @@ class EngagementStrategyAgent:
             )
             response = self.model.generate_content(prompt, generation_config=generation_config)
             
-            # Essayer de nettoyer et parser la réponse JSON
-            # Le modèle peut parfois retourner le JSON dans un bloc de démarquage
-            cleaned_response_text = response.text.strip().replace('```json', '').replace('```', '')
-            
-            return json.loads(cleaned_response_text)
-        except (json.JSONDecodeError, Exception) as e:
+            # Le modèle peut parfois retourner le JSON dans un bloc de démarquage ou tronqué :
+            # extraction tolérante avec réparation locale.
+            return extract_json(response.text, expect=dict, schema={"markdown_report": str, "json_report": dict})
+        except Exception as e:
             error_message = f"Erreur lors de la génération ou du parsing de la réponse JSON de Gemini: {e}"
             print(error_message)
             # Retourner une structure d'erreur cohérente
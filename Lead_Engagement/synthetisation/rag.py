@@ -3,10 +3,20 @@ import nltk
 from dotenv import load_dotenv
 from pathlib import Path
 
-# Télécharger les ressources nécessaires de NLTK (une seule fois)
-nltk.download('punkt')
-nltk.download('wordnet')
-nltk.download('omw-1.4')
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "wordnet": "corpora/wordnet",
+    "omw-1.4": "corpora/omw-1.4",
+}
+
+
+def ensure_nltk_resources():
+    """Télécharge les ressources NLTK manquantes, au lancement et non à l'import."""
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name)
 
 from langchain_community.document_loaders import DirectoryLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -35,6 +45,7 @@ class LLMManager:
 
 def main():
     load_dotenv()
+    ensure_nltk_resources()
 
     # --- Dossiers ---
     data_root = Path("outputs")  # Contient les rapports .md
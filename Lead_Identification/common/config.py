@@ -0,0 +1,138 @@
+# Lead_Identification/common/config.py
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+# --- LLM client pool ---
+# Number of distinct hosts a provider session keeps pools for, and keep-alive
+# connections kept per host.
+LLM_HTTP_POOL_CONNECTIONS = int(os.getenv("LLM_HTTP_POOL_CONNECTIONS", "4"))
+LLM_HTTP_POOL_MAXSIZE = int(os.getenv("LLM_HTTP_POOL_MAXSIZE", "16"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+
+# Maximum number of in-flight calls per provider, shared by every call site.
+LLM_MAX_CONCURRENCY = {
+    "gemini": int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")),
+    "mistral": int(os.getenv("MISTRAL_MAX_CONCURRENCY", "4")),
+    "together": int(os.getenv("TOGETHER_MAX_CONCURRENCY", "4")),
+}
+
+# Requests per minute allowed per provider (0 = no rate limit).
+LLM_RATE_LIMITS = {
+    "gemini": float(os.getenv("GEMINI_RPM", "0")),
+    "mistral": float(os.getenv("MISTRAL_RPM", "0")),
+    "together": float(os.getenv("TOGETHER_RPM", "0")),
+}
+
+
+# --- Tavily search ---
+# Searches per minute shared by every Tavily call site (0 = no rate limit) and
+# concurrent searches per graph node.
+TAVILY_RPM = float(os.getenv("TAVILY_RPM", "100"))
+TAVILY_MAX_WORKERS = int(os.getenv("TAVILY_MAX_WORKERS", "5"))
+# People researched at once by the personal research pipeline.
+PERSONNEL_RESEARCH_MAX_WORKERS = int(os.getenv("PERSONNEL_RESEARCH_MAX_WORKERS", "8"))
+
+
+# --- Lead dedup ---
+# Ambiguous pairs per LLM prompt, and the most pairs sent to the LLM per run
+# (the most similar pairs first; the rest stay separate).
+DEDUP_LLM_PAIRS_PER_PROMPT = int(os.getenv("DEDUP_LLM_PAIRS_PER_PROMPT", "25"))
+DEDUP_LLM_MAX_PAIRS = int(os.getenv("DEDUP_LLM_MAX_PAIRS", "200"))
+
+
+# --- Local caches ---
+CACHE_DIR = os.getenv("LEAD_CACHE_DIR", ".cache")
+
+# LLM responses, keyed on (model, prompt hash, temperature, max_tokens).
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "20000"))
+# When set, every raw LLM response is appended to <dir>/<provider>.jsonl
+# (corpus for Lead_Identification/detection/test/json_parsing_benchmark.py).
+LLM_CAPTURE_DIR = os.getenv("LLM_CAPTURE_DIR", "")
+# Times a JSON response that local repair cannot fix is asked for again.
+LLM_JSON_MAX_REASKS = int(os.getenv("LLM_JSON_MAX_REASKS", "1"))
+
+# Tavily search results, keyed on (normalized query, depth, max_results, options).
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(CACHE_DIR, "search_cache.sqlite3"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(3 * 24 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "50000"))
+
+
+# --- Shared crawler pool ---
+# Warm browsers kept by the pool, concurrent crawls allowed per domain and
+# minimum delay in seconds between two requests to the same domain.
+CRAWLER_POOL_SIZE = int(os.getenv("CRAWLER_POOL_SIZE", "3"))
+CRAWLER_DOMAIN_CONCURRENCY = int(os.getenv("CRAWLER_DOMAIN_CONCURRENCY", "2"))
+CRAWLER_DOMAIN_DELAY = float(os.getenv("CRAWLER_DOMAIN_DELAY", "1.0"))
+
+
+# --- Crawl cache ---
+# Cleaned pages younger than CRAWL_CACHE_FRESHNESS seconds are served as-is;
+# older ones are revalidated with ETag / Last-Modified before re-crawling.
+CRAWL_CACHE_ENABLED = os.getenv("CRAWL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CRAWL_CACHE_PATH = os.getenv("CRAWL_CACHE_PATH", os.path.join(CACHE_DIR, "crawl_cache.sqlite3"))
+CRAWL_CACHE_FRESHNESS = float(os.getenv("CRAWL_CACHE_FRESHNESS", str(24 * 3600)))
+CRAWL_CACHE_MAX_ENTRIES = int(os.getenv("CRAWL_CACHE_MAX_ENTRIES", "50000"))
+CRAWL_REVALIDATION_TIMEOUT = float(os.getenv("CRAWL_REVALIDATION_TIMEOUT", "10"))
+
+
+# --- Cloudinary uploads ---
+UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", "4"))
+UPLOAD_MAX_RETRIES = int(os.getenv("UPLOAD_MAX_RETRIES", "4"))
+UPLOAD_BACKOFF_BASE = float(os.getenv("UPLOAD_BACKOFF_BASE", "0.5"))
+UPLOAD_BACKOFF_MAX = float(os.getenv("UPLOAD_BACKOFF_MAX", "8"))
+# Hash of the last uploaded content per public id, used to skip unchanged uploads.
+UPLOAD_MANIFEST_PATH = os.getenv("UPLOAD_MANIFEST_PATH", os.path.join(CACHE_DIR, "upload_manifest.sqlite3"))
+
+
+# --- Lead qualification ---
+# "split": parsing, GPCT parsing and GPCT judge are three Gemini calls.
+# "fused": a single JSON-mode call reads the report once and returns all three.
+QUALIFICATION_MODE = os.getenv("QUALIFICATION_MODE", "split").lower()
+QUALIFICATION_MAX_WORKERS = int(os.getenv("QUALIFICATION_MAX_WORKERS", "6"))
+# Leads parsed per batch by process_leads: their semantic scores are encoded
+# together, then they are scored and written while the next batch is parsed.
+QUALIFICATION_BATCH_SIZE = int(os.getenv("QUALIFICATION_BATCH_SIZE", "24"))
+# Final justification of ScoringAgent: "template" (local), "llm" (blocking Together
+# call) or "deferred" (local first, LLM paragraph written to Firestore later).
+JUSTIFICATION_BACKEND = os.getenv("JUSTIFICATION_BACKEND", "deferred").lower()
+JUSTIFICATION_MAX_WORKERS = int(os.getenv("JUSTIFICATION_MAX_WORKERS", "4"))
+REPORT_FETCH_TIMEOUT = float(os.getenv("REPORT_FETCH_TIMEOUT", "30"))
+# Concurrent report downloads, and reports downloaded ahead of the ones being analysed.
+REPORT_FETCH_MAX_WORKERS = int(os.getenv("REPORT_FETCH_MAX_WORKERS", "8"))
+REPORT_PREFETCH = int(os.getenv("REPORT_PREFETCH", "8"))
+# Downloaded reports, keyed on URL. Entries younger than REPORT_CACHE_FRESHNESS
+# seconds are served as-is, older ones are revalidated with ETag / Last-Modified.
+REPORT_CACHE_ENABLED = os.getenv("REPORT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+REPORT_CACHE_PATH = os.getenv("REPORT_CACHE_PATH", os.path.join(CACHE_DIR, "report_cache.sqlite3"))
+REPORT_CACHE_FRESHNESS = float(os.getenv("REPORT_CACHE_FRESHNESS", str(7 * 24 * 3600)))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+SBERT_MODEL_NAME = os.getenv("SBERT_MODEL_NAME", "paraphrase-MiniLM-L6-v2")
+SBERT_BATCH_SIZE = int(os.getenv("SBERT_BATCH_SIZE", "64"))
+# Load the model in the Celery parent process so prefork children share its pages.
+SBERT_PRELOAD = os.getenv("SBERT_PRELOAD", "false").lower() in ("1", "true", "yes")
+# When set, embeddings come from a local embedding server instead of an in-process model.
+EMBEDDING_SERVER_URL = os.getenv("EMBEDDING_SERVER_URL", "")
+EMBEDDING_SERVER_TIMEOUT = float(os.getenv("EMBEDDING_SERVER_TIMEOUT", "60"))
+# SBERT vectors, keyed on (model, text hash).
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite3"))
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+
+# --- Lead listing API ---
+# Redis used by the server (also the Celery broker) for the lead listing cache.
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+LEAD_PAGE_SIZE = int(os.getenv("LEAD_PAGE_SIZE", "50"))
+LEAD_PAGE_MAX_SIZE = int(os.getenv("LEAD_PAGE_MAX_SIZE", "200"))
+# Listing pages are cached for a few seconds under a per-service version that the
+# pipeline bumps whenever it changes the service's generation status.
+LEAD_LIST_CACHE_ENABLED = os.getenv("LEAD_LIST_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LEAD_LIST_CACHE_TTL = int(os.getenv("LEAD_LIST_CACHE_TTL", "30"))
@@ -0,0 +1,136 @@
+# Lead_Identification/common/crawl_cache.py
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from Lead_Identification.common.config import (
+    CRAWL_CACHE_ENABLED,
+    CRAWL_CACHE_FRESHNESS,
+    CRAWL_CACHE_MAX_ENTRIES,
+    CRAWL_CACHE_PATH,
+    CRAWL_REVALIDATION_TIMEOUT,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Identification.common.llm_clients import get_http_session
+
+
+class CrawlCache:
+    """
+    Local store of cleaned crawl output, one entry per (crawl profile, URL).
+
+    Each entry keeps the cleaned markdown, its content hash, the fetch time and
+    the ETag / Last-Modified validators of the start page. Entries younger than
+    `freshness` seconds are returned directly; older ones are revalidated with a
+    conditional GET on the start page and reused on 304 Not Modified.
+    """
+
+    def __init__(self, store: DiskCache, freshness: float = CRAWL_CACHE_FRESHNESS):
+        self.store = store
+        self.freshness = freshness
+        self._lock = threading.Lock()
+        self._metrics = {"fresh_hits": 0, "revalidated": 0, "stale": 0, "misses": 0, "stored": 0}
+
+    def _metric(self, key: str):
+        with self._lock:
+            self._metrics[key] += 1
+
+    @staticmethod
+    def _key(url: str, profile: str) -> str:
+        return f"{profile}|{url}"
+
+    def lookup(self, url: str, profile: str) -> Optional[str]:
+        """Returns the cached cleaned content for `url`, or None if it must be crawled."""
+        entry = self.store.get_json(self._key(url, profile))
+        if entry is None:
+            self._metric("misses")
+            return None
+
+        if time.time() - entry["validated_at"] <= self.freshness:
+            self._metric("fresh_hits")
+            return entry["content"]
+
+        if self._not_modified(url, entry):
+            entry["validated_at"] = time.time()
+            self.store.set_json(self._key(url, profile), entry)
+            self._metric("revalidated")
+            return entry["content"]
+
+        self._metric("stale")
+        return None
+
+    def _not_modified(self, url: str, entry: Dict[str, Any]) -> bool:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return False
+
+        try:
+            response = get_http_session("crawl").get(
+                url, headers=headers, timeout=CRAWL_REVALIDATION_TIMEOUT, stream=True
+            )
+            response.close()
+            return response.status_code == 304
+        except Exception as e:
+            print(f"⚠️ Revalidation failed for {url}: {e}")
+            return False
+
+    def store_content(self, url: str, profile: str, content: str, response_headers: Optional[Dict[str, str]] = None):
+        headers = {k.lower(): v for k, v in (response_headers or {}).items()}
+        now = time.time()
+        self.store.set_json(self._key(url, profile), {
+            "url": url,
+            "content": content,
+            "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": now,
+            "validated_at": now,
+        })
+        self._metric("stored")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._metrics)
+        stats["entries"] = self.store.stats()["entries"]
+        return stats
+
+
+_cache: Optional[CrawlCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Returns the process-wide crawl cache, or None when it is disabled."""
+    global _cache
+    if not CRAWL_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            store = DiskCache(CRAWL_CACHE_PATH, table="crawl_pages", max_entries=CRAWL_CACHE_MAX_ENTRIES)
+            _cache = CrawlCache(store)
+        return _cache
+
+
+def lookup_crawl(url: str, profile: str) -> Optional[str]:
+    """Cleaned content of `url` crawled under `profile`, or None."""
+    cache = get_crawl_cache()
+    if not cache:
+        return None
+    return cache.lookup(url, profile)
+
+
+def store_crawl(url: str, profile: str, content: str, results=None):
+    """Stores a crawl's cleaned content, taking validators from its first (start) page."""
+    cache = get_crawl_cache()
+    if not cache or not content.strip():
+        return
+    response_headers = None
+    for result in results or []:
+        response_headers = getattr(result, "response_headers", None)
+        break
+    cache.store_content(url, profile, content, response_headers)
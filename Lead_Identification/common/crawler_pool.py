@@ -0,0 +1,234 @@
+# Lead_Identification/common/crawler_pool.py
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+
+from Lead_Identification.common.config import (
+    CRAWLER_DOMAIN_CONCURRENCY,
+    CRAWLER_DOMAIN_DELAY,
+    CRAWLER_POOL_SIZE,
+)
+
+
+class CrawlerPool:
+    """
+    Long-lived pool of AsyncWebCrawler instances shared by detection and enrichment.
+
+    The browsers live on a dedicated event loop running in a background thread,
+    so they survive across the short-lived loops started by callers. URLs can be
+    submitted from synchronous code (`crawl`) or from any event loop (`acrawl`);
+    each request waits in the crawl queue until a warm crawler is free and the
+    target domain's politeness budget allows it.
+    """
+
+    def __init__(
+        self,
+        size: int = CRAWLER_POOL_SIZE,
+        domain_concurrency: int = CRAWLER_DOMAIN_CONCURRENCY,
+        domain_delay: float = CRAWLER_DOMAIN_DELAY,
+    ):
+        self.size = size
+        self.domain_concurrency = domain_concurrency
+        self.domain_delay = domain_delay
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Only touched from the pool's own loop.
+        self._idle: List[AsyncWebCrawler] = []
+        self._available: Optional[asyncio.Condition] = None
+        self._crawlers: List[AsyncWebCrawler] = []
+        self._launching = 0
+        self._domains: Dict[str, Dict[str, Any]] = {}
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "queued": 0,
+            "peak_queued": 0,
+            "in_flight": 0,
+            "browser_launches": 0,
+            "browser_reuses": 0,
+            "browsers_discarded": 0,
+        }
+
+    # --- Loop management ---
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._available = asyncio.Condition()
+                    ready.set()
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="crawler-pool", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def _metric(self, key: str, value: int = 1):
+        with self._metrics_lock:
+            self._metrics[key] += value
+            if key == "queued":
+                self._metrics["peak_queued"] = max(self._metrics["peak_queued"], self._metrics["queued"])
+
+    # --- Crawler checkout ---
+    async def _acquire(self) -> AsyncWebCrawler:
+        # Waiters re-check both an idle crawler and spare capacity every time they
+        # are woken: a discarded or failed browser frees a slot for a new launch.
+        async with self._available:
+            while True:
+                if self._idle:
+                    self._metric("browser_reuses")
+                    return self._idle.pop()
+                if len(self._crawlers) + self._launching < self.size:
+                    self._launching += 1
+                    break
+                await self._available.wait()
+
+        try:
+            crawler = AsyncWebCrawler()
+            await crawler.start()
+        except Exception:
+            async with self._available:
+                self._launching -= 1
+                self._available.notify()
+            raise
+        async with self._available:
+            self._launching -= 1
+            self._crawlers.append(crawler)
+        self._metric("browser_launches")
+        return crawler
+
+    async def _release(self, crawler: AsyncWebCrawler, healthy: bool = True):
+        if healthy:
+            async with self._available:
+                self._idle.append(crawler)
+                self._available.notify()
+            return
+        # A browser that raised may be wedged; close it and let a waiter launch a replacement.
+        async with self._available:
+            if crawler in self._crawlers:
+                self._crawlers.remove(crawler)
+            self._available.notify()
+        self._metric("browsers_discarded")
+        try:
+            await crawler.close()
+        except Exception:
+            pass
+
+    # --- Politeness ---
+    async def _wait_for_domain(self, domain: str) -> asyncio.Semaphore:
+        state = self._domains.get(domain)
+        if state is None:
+            state = {"semaphore": asyncio.Semaphore(self.domain_concurrency), "last_request": 0.0}
+            self._domains[domain] = state
+
+        await state["semaphore"].acquire()
+        wait = state["last_request"] + self.domain_delay - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        state["last_request"] = time.monotonic()
+        return state["semaphore"]
+
+    # --- Crawling ---
+    async def _crawl(self, url: str, config: Optional[CrawlerRunConfig]):
+        domain = urlparse(url).netloc.lower()
+        self._metric("queued")
+        domain_semaphore = await self._wait_for_domain(domain)
+        try:
+            crawler = await self._acquire()
+        except Exception:
+            domain_semaphore.release()
+            self._metric("queued", -1)
+            self._metric("failed")
+            raise
+        self._metric("queued", -1)
+        self._metric("in_flight")
+
+        healthy = True
+        try:
+            result = await crawler.arun(url=url, config=config)
+            self._metric("completed")
+            return result
+        except Exception:
+            healthy = False
+            self._metric("failed")
+            raise
+        finally:
+            self._metric("in_flight", -1)
+            domain_semaphore.release()
+            await self._release(crawler, healthy)
+
+    def submit(self, url: str, config: Optional[CrawlerRunConfig] = None) -> concurrent.futures.Future:
+        """Queues `url` for crawling and returns a future for the crawl4ai result."""
+        loop = self._ensure_started()
+        self._metric("submitted")
+        return asyncio.run_coroutine_threadsafe(self._crawl(url, config), loop)
+
+    def crawl(self, url: str, config: Optional[CrawlerRunConfig] = None, timeout: Optional[float] = None):
+        """Blocking crawl, for synchronous callers."""
+        return self.submit(url, config).result(timeout=timeout)
+
+    async def acrawl(self, url: str, config: Optional[CrawlerRunConfig] = None):
+        """Awaitable crawl, usable from any event loop."""
+        return await asyncio.wrap_future(self.submit(url, config))
+
+    # --- Lifecycle / metrics ---
+    def stats(self) -> Dict[str, int]:
+        with self._metrics_lock:
+            stats = dict(self._metrics)
+        stats["browsers_alive"] = len(self._crawlers)
+        return stats
+
+    def close(self):
+        with self._start_lock:
+            loop = self._loop
+            if loop is None:
+                return
+
+            async def shutdown():
+                for crawler in list(self._crawlers):
+                    try:
+                        await crawler.close()
+                    except Exception:
+                        pass
+                self._crawlers.clear()
+                self._idle.clear()
+
+            try:
+                asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=30)
+            except Exception as e:
+                print(f"⚠️ Crawler pool shutdown incomplete: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+
+
+_pool: Optional[CrawlerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_crawler_pool() -> CrawlerPool:
+    """Returns the process-wide crawler pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CrawlerPool()
+            atexit.register(_pool.close)
+        return _pool
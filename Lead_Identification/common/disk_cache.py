@@ -0,0 +1,137 @@
+# Lead_Identification/common/disk_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class DiskCache:
+    """
+    Small SQLite-backed key/value cache shared by the pipeline caches.
+
+    Entries expire after `ttl` seconds (None = never) and the least recently
+    used entries are evicted once the table holds more than `max_entries`
+    entries or more than `max_bytes` bytes of values.
+    The database runs in WAL mode so several worker processes can share it.
+    """
+
+    def __init__(self, path: str, table: str = "cache", ttl: Optional[float] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "sets": 0, "expired": 0, "evicted": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+
+    # --- Raw bytes ---
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._metrics["misses"] += 1
+                return None
+
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return None
+
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._metrics["hits"] += 1
+            return bytes(value)
+
+    def set(self, key: str, value: bytes):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), now, now),
+            )
+            self._metrics["sets"] += 1
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def _evict(self):
+        if self.max_entries is not None:
+            count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._metrics["evicted"] += overflow
+
+        if self.max_bytes is not None:
+            total = self._conn.execute(f"SELECT COALESCE(SUM(LENGTH(value)), 0) FROM {self.table}").fetchone()[0]
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return
+            victims = []
+            for key, size in self._conn.execute(
+                f"SELECT key, LENGTH(value) FROM {self.table} ORDER BY accessed_at ASC"
+            ):
+                victims.append(key)
+                excess -= size
+                if excess <= 0:
+                    break
+            self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key in victims])
+            self._metrics["evicted"] += len(victims)
+
+    # --- Convenience helpers ---
+    def get_text(self, key: str) -> Optional[str]:
+        value = self.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set_text(self, key: str, value: str):
+        self.set(key, value.encode("utf-8"))
+
+    def get_json(self, key: str) -> Any:
+        value = self.get_text(key)
+        return json.loads(value) if value is not None else None
+
+    def set_json(self, key: str, value: Any):
+        self.set_text(key, json.dumps(value, ensure_ascii=False))
+
+    # --- Metrics ---
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            metrics = dict(self._metrics)
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["entries"] = entries
+        metrics["hit_rate"] = round(metrics["hits"] / lookups, 3) if lookups else 0.0
+        return metrics
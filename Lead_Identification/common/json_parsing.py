@@ -0,0 +1,362 @@
+# Lead_Identification/common/json_parsing.py
+#
+# Tolerant extraction of JSON from LLM responses, shared by every agent.
+#
+#   extract_json(text, expect=dict, schema={"score": NUMBER, "justification": str})
+#
+# Order of attempts, cheapest first: the whole response as-is (native JSON
+# mode), then each balanced {...} / [...] span found by a streaming scanner,
+# then the same spans after local repair (fences, smart quotes, trailing
+# commas, comments, Python literals, single quotes, raw newlines in strings,
+# truncated output). Only when all of this fails should a caller re-ask the LLM.
+
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+NUMBER = (int, float)
+NULLABLE = type(None)
+
+FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+CLOSERS = {"{": "}", "[": "]"}
+BARE_WORD = re.compile(r"(\w+)(\s*:)?")
+
+
+class JSONParseError(ValueError):
+    """No candidate in the response parsed into a value matching the expected shape."""
+
+    def __init__(self, message: str, text: str = ""):
+        super().__init__(message)
+        self.text = text
+
+
+# --- Metrics ---
+_stats = {"direct": 0, "scanned": 0, "repaired": 0, "reasked": 0, "failed": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def parse_stats() -> Dict[str, int]:
+    """How responses were parsed so far in this process: direct, scanned, repaired, reasked or failed."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+# --- Streaming scanner ---
+class JSONScanner:
+    """
+    Incremental scanner that finds balanced top-level {...} / [...] spans in
+    a text fed chunk by chunk (for example an LLM streaming response).
+    Brackets inside JSON strings are ignored; prose around the JSON is skipped.
+    """
+
+    def __init__(self, kinds: str = "{["):
+        self.kinds = kinds
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consumes `chunk`; returns the spans that closed in it."""
+        completed = []
+        for char in chunk:
+            if not self._stack:
+                if char in self.kinds:
+                    self._stack.append(char)
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in CLOSERS:
+                self._stack.append(char)
+            elif char in "}]":
+                if CLOSERS[self._stack[-1]] != char:
+                    # Mismatched bracket: this span cannot be JSON, resynchronise.
+                    self._reset()
+                    continue
+                self._stack.pop()
+                if not self._stack:
+                    completed.append("".join(self._buffer))
+                    self._buffer = []
+        return completed
+
+    @property
+    def partial(self) -> str:
+        """The span still open at the end of the input (truncated output), if any."""
+        return "".join(self._buffer) if self._stack else ""
+
+    def _reset(self):
+        self._buffer, self._stack = [], []
+        self._in_string = self._escape = False
+
+
+def iter_json_candidates(text: str, kinds: str = "{[") -> Tuple[List[str], str]:
+    """Balanced spans of `text`, largest first, and the unclosed trailing span."""
+    scanner = JSONScanner(kinds)
+    spans = scanner.feed(text)
+    return sorted(spans, key=len, reverse=True), scanner.partial
+
+
+# --- Local repair ---
+def repair_json(text: str) -> str:
+    """
+    Fixes the usual LLM JSON mistakes outside of string values: comments,
+    trailing commas, Python literals and single-quoted strings. Inside strings,
+    raw control characters are escaped. Unclosed strings, objects and arrays
+    (truncated output) are closed.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    quote = None  # '"' or "'" while inside a string
+    escape = False
+    i, n = 0, len(text)
+
+    def last_significant() -> str:
+        for piece in reversed(out):
+            stripped = piece.strip()
+            if stripped:
+                return stripped[-1]
+        return ""
+
+    while i < n:
+        char = text[i]
+        if quote:
+            if escape:
+                escape = False
+                if char == "'" and quote == "'":
+                    out[-1] = "'"  # \' is not a JSON escape
+                else:
+                    out.append(char)
+            elif char == "\\":
+                escape = True
+                out.append(char)
+            elif char == quote:
+                quote = None
+                out.append('"')
+            elif char == '"':
+                out.append('\\"')  # double quote inside a single-quoted string
+            elif char == "\n":
+                out.append("\\n")
+            elif char == "\r":
+                out.append("\\r")
+            elif char == "\t":
+                out.append("\\t")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char == '"':
+            quote = '"'
+            out.append(char)
+        elif char == "'" and last_significant() in ("", "{", "[", ":", ","):
+            quote = "'"
+            out.append('"')
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        elif char in CLOSERS:
+            stack.append(char)
+            out.append(char)
+        elif char in "}]":
+            if last_significant() == ",":
+                _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+            out.append(char)
+        elif char.isalpha() or char == "_":
+            match = BARE_WORD.match(text, i)
+            word = match.group(1)
+            if last_significant() in ("{", ",") and match.group(2):
+                out.append(f'"{word}"')  # unquoted key
+            else:
+                out.append(PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    # Truncated output: close what is still open.
+    if quote:
+        if escape:
+            out.pop()
+        out.append('"')
+    if stack:
+        tail = last_significant()
+        if tail == ",":
+            _drop_trailing_comma(out)
+        elif tail == ":":
+            out.append(" null")
+        for opener in reversed(stack):
+            out.append(CLOSERS[opener])
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: List[str]):
+    for index in range(len(out) - 1, -1, -1):
+        if out[index].strip():
+            if out[index].strip() == ",":
+                del out[index]
+            return
+
+
+# --- Schema validation ---
+def validate_schema(value: Any, schema: Any, path: str = "$") -> Optional[str]:
+    """
+    Checks `value` against a small structural schema; returns an error message
+    or None. A schema is a type or tuple of types, a dict of required keys to
+    schemas, or a one-element list giving the schema of every item.
+    Include NULLABLE in a tuple to accept null.
+    """
+    if schema is None:
+        return None
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return f"{path}: expected object, got {type(value).__name__}"
+        for key, sub_schema in schema.items():
+            if key not in value:
+                return f"{path}: missing key '{key}'"
+            error = validate_schema(value[key], sub_schema, f"{path}.{key}")
+            if error:
+                return error
+        return None
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return f"{path}: expected array, got {type(value).__name__}"
+        for index, item in enumerate(value):
+            error = validate_schema(item, schema[0], f"{path}[{index}]")
+            if error:
+                return error
+        return None
+    types = schema if isinstance(schema, tuple) else (schema,)
+    # bool is an int subclass, but true is not a valid score.
+    if isinstance(value, bool) and bool not in types:
+        return f"{path}: expected {', '.join(t.__name__ for t in types)}, got bool"
+    if not isinstance(value, types):
+        return f"{path}: expected {', '.join(t.__name__ for t in types)}, got {type(value).__name__}"
+    return None
+
+
+# --- Extraction ---
+def _loads(candidate: str) -> Tuple[bool, Any]:
+    try:
+        return True, json.loads(candidate)
+    except (json.JSONDecodeError, ValueError):
+        return False, None
+
+
+def _accept(value: Any, expect: Optional[type], schema: Any) -> Optional[str]:
+    if expect is not None and not isinstance(value, expect):
+        return f"expected {expect.__name__}, got {type(value).__name__}"
+    return validate_schema(value, schema)
+
+
+def extract_json(text: str, expect: Optional[type] = None, schema: Any = None) -> Any:
+    """
+    Returns a JSON value of `text` that matches `expect` (dict or list) and
+    `schema`: the whole text when it parses directly, otherwise the largest
+    matching span (fenced blocks first), tried as-is before being repaired.
+    Raises JSONParseError when none does.
+    """
+    text = (text or "").strip()
+    if not text:
+        _count("failed")
+        raise JSONParseError("empty response", text)
+
+    ok, value = _loads(text)
+    if ok and not _accept(value, expect, schema):
+        _count("direct")
+        return value
+
+    kinds = "{" if expect is dict else "[" if expect is list else "{["
+    fenced = [match.strip() for match in FENCE.findall(text)]
+    sources = fenced + [text]
+    last_error = "no JSON found"
+
+    # 1. Balanced spans as-is.
+    candidates: List[str] = []
+    partials: List[str] = []
+    for source in sources:
+        spans, partial = iter_json_candidates(source, kinds)
+        candidates.extend(spans)
+        if partial:
+            partials.append(partial)
+    for candidate in candidates:
+        ok, value = _loads(candidate)
+        if ok:
+            error = _accept(value, expect, schema)
+            if not error:
+                _count("scanned")
+                return value
+            last_error = error
+
+    # 2. Local repair, including smart quotes used as delimiters and truncated output.
+    for candidate in _repair_candidates(candidates, partials, sources, kinds):
+        ok, value = _loads(candidate)
+        if ok:
+            error = _accept(value, expect, schema)
+            if not error:
+                _count("repaired")
+                return value
+            last_error = error
+
+    _count("failed")
+    raise JSONParseError(f"could not extract JSON: {last_error}", text)
+
+
+def _repair_candidates(candidates: List[str], partials: List[str], sources: List[str], kinds: str) -> Iterable[str]:
+    seen = set()
+    for candidate in candidates + partials:
+        for variant in (candidate, candidate.translate(SMART_QUOTES)):
+            repaired = repair_json(variant)
+            if repaired not in seen:
+                seen.add(repaired)
+                yield repaired
+    # Brackets unbalanced by smart quotes or stray prose: rescan the normalised text.
+    for source in sources:
+        normalised = source.translate(SMART_QUOTES)
+        spans, partial = iter_json_candidates(normalised, kinds)
+        for candidate in spans + ([partial] if partial else []):
+            repaired = repair_json(candidate)
+            if repaired not in seen:
+                seen.add(repaired)
+                yield repaired
+
+
+def parse_with_reask(text: str, reask: Optional[Callable[[str], str]] = None, max_reasks: int = 1,
+                     expect: Optional[type] = None, schema: Any = None) -> Any:
+    """
+    `extract_json`, and only if local repair fails, asks the model again:
+    `reask(error)` must return a new raw response.
+    """
+    for attempt in range(max_reasks + 1):
+        try:
+            return extract_json(text, expect=expect, schema=schema)
+        except JSONParseError as e:
+            if reask is None or attempt == max_reasks:
+                raise
+            _count("reasked")
+            text = reask(str(e))
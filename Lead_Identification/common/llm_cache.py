@@ -0,0 +1,66 @@
+# Lead_Identification/common/llm_cache.py
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from Lead_Identification.common.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CAPTURE_DIR,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+
+_cache: Optional[DiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[DiskCache]:
+    """Returns the process-wide LLM response cache, or None when caching is disabled."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache(
+                LLM_CACHE_PATH,
+                table="llm_responses",
+                ttl=LLM_CACHE_TTL,
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+            )
+        return _cache
+
+
+def llm_cache_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Content-addressed key: identical prompts with identical settings share an entry."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return f"{model}|{prompt_hash}|{temperature}|{max_tokens}"
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    cache = get_llm_cache()
+    return cache.stats() if cache else {}
+
+
+_capture_lock = threading.Lock()
+
+
+def capture_response(provider: str, model: str, prompt: str, response: str, json_mode: bool = False):
+    """Appends a raw LLM response to the LLM_CAPTURE_DIR corpus (no-op when unset)."""
+    if not LLM_CAPTURE_DIR or response is None:
+        return
+    record = {
+        "provider": provider,
+        "model": model,
+        "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "json_mode": json_mode,
+        "response": response,
+    }
+    with _capture_lock:
+        os.makedirs(LLM_CAPTURE_DIR, exist_ok=True)
+        with open(os.path.join(LLM_CAPTURE_DIR, f"{provider}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
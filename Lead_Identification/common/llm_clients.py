@@ -0,0 +1,203 @@
+# Lead_Identification/common/llm_clients.py
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Lead_Identification.common.config import (
+    LLM_HTTP_POOL_CONNECTIONS,
+    LLM_HTTP_POOL_MAXSIZE,
+    LLM_MAX_CONCURRENCY,
+    LLM_RATE_LIMITS,
+)
+from Lead_Identification.common.rate_limit import get_rate_limiter
+
+if TYPE_CHECKING:
+    from google.genai import Client, types
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class LLMClientRegistry:
+    """
+    Process-wide registry of LLM clients.
+
+    Keeps one google-genai Client per API key and one keep-alive requests.Session
+    per HTTP provider, so every call site shares the same connection pools.
+    Each provider also gets a semaphore bounding its in-flight calls and,
+    when configured, a requests-per-minute limit.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = LLM_HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = LLM_HTTP_POOL_MAXSIZE,
+        max_concurrency: Optional[Dict[str, int]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_concurrency = dict(max_concurrency or LLM_MAX_CONCURRENCY)
+        self.rate_limits = dict(rate_limits or LLM_RATE_LIMITS)
+
+        self._lock = threading.Lock()
+        self._gemini_clients: Dict[str, "Client"] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    # --- Counters ---
+    def _counter(self, provider: str) -> Dict[str, int]:
+        return self._counters.setdefault(
+            provider,
+            {"calls": 0, "in_flight": 0, "clients_created": 0, "prompt_tokens": 0, "output_tokens": 0},
+        )
+
+    def _incr(self, provider: str, key: str, value: int = 1):
+        with self._lock:
+            self._counter(provider)[key] += value
+
+    # --- Clients ---
+    def gemini_client(self, api_key: str) -> "Client":
+        """Returns the shared google-genai client for this API key."""
+        # google-genai is heavy to import; only processes that call Gemini pay for it.
+        from google.genai import Client
+
+        with self._lock:
+            client = self._gemini_clients.get(api_key)
+            if client is None:
+                client = Client(api_key=api_key, http_options=self._gemini_http_options())
+                self._gemini_clients[api_key] = client
+                self._counter("gemini")["clients_created"] += 1
+            return client
+
+    def _gemini_http_options(self) -> Optional["types.HttpOptions"]:
+        # google-genai talks to the API through httpx; size its pool like ours.
+        from google.genai import types
+
+        try:
+            import httpx
+            return types.HttpOptions(client_args={
+                "limits": httpx.Limits(
+                    max_connections=self.pool_maxsize,
+                    max_keepalive_connections=self.pool_maxsize,
+                )
+            })
+        except Exception:
+            # Older SDKs do not accept client_args; fall back to their defaults.
+            return None
+
+    def http_session(self, provider: str) -> requests.Session:
+        """Returns the shared keep-alive session for an HTTP provider."""
+        with self._lock:
+            session = self._sessions.get(provider)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[provider] = session
+                self._counter(provider)["clients_created"] += 1
+            return session
+
+    # --- Concurrency ---
+    def _semaphore(self, provider: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(provider)
+            if semaphore is None:
+                limit = self.max_concurrency.get(provider, DEFAULT_MAX_CONCURRENCY)
+                semaphore = threading.BoundedSemaphore(limit)
+                self._semaphores[provider] = semaphore
+            return semaphore
+
+    @contextmanager
+    def slot(self, provider: str):
+        """
+        Holds one of the provider's concurrency slots for the duration of a call,
+        after waiting for its rate limit.
+        """
+        semaphore = self._semaphore(provider)
+        limiter = get_rate_limiter(f"llm:{provider}", self.rate_limits.get(provider, 0))
+        with semaphore:
+            if limiter:
+                limiter.acquire()
+            self._incr(provider, "calls")
+            self._incr(provider, "in_flight")
+            try:
+                yield
+            finally:
+                self._incr(provider, "in_flight", -1)
+
+    # --- Metrics ---
+    def record_usage(self, provider: str, prompt_tokens: Optional[int], output_tokens: Optional[int]):
+        """Adds the token usage reported by a provider response to its counters."""
+        with self._lock:
+            counter = self._counter(provider)
+            counter["prompt_tokens"] += prompt_tokens or 0
+            counter["output_tokens"] += output_tokens or 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Per-provider counters. For HTTP providers, connections_opened and
+        requests_sent come from the urllib3 pools, so connection_reuse is the
+        number of requests that went over an already-open connection.
+        """
+        with self._lock:
+            snapshot = {provider: dict(counter) for provider, counter in self._counters.items()}
+            sessions = dict(self._sessions)
+
+        for provider, session in sessions.items():
+            opened, sent = 0, 0
+            for adapter in set(session.adapters.values()):
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    opened += pool.num_connections
+                    sent += pool.num_requests
+            counter = snapshot.setdefault(provider, {})
+            counter["connections_opened"] = opened
+            counter["requests_sent"] = sent
+            counter["connection_reuse"] = max(0, sent - opened)
+        return snapshot
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._gemini_clients.clear()
+
+
+_registry = LLMClientRegistry()
+
+
+def get_registry() -> LLMClientRegistry:
+    return _registry
+
+
+def get_gemini_client(api_key: str) -> "Client":
+    return _registry.gemini_client(api_key)
+
+
+def get_http_session(provider: str) -> requests.Session:
+    return _registry.http_session(provider)
+
+
+def provider_slot(provider: str):
+    return _registry.slot(provider)
+
+
+def record_usage(provider: str, prompt_tokens: Optional[int], output_tokens: Optional[int]):
+    _registry.record_usage(provider, prompt_tokens, output_tokens)
+
+
+def get_client_stats() -> Dict[str, Dict[str, int]]:
+    return _registry.stats()
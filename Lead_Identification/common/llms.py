@@ -1,45 +1,113 @@
 # Lead_Identification/common/llm.py
 
 import os
-import requests
+import json
+import hashlib
 
 #use .env
-import os
 from dotenv import load_dotenv
-from google import genai
-from google.genai import Client, types
+from google.genai import types
+
+from Lead_Identification.common.config import LLM_HTTP_TIMEOUT, LLM_JSON_MAX_REASKS
+from Lead_Identification.common.json_parsing import parse_with_reask
+from Lead_Identification.common.llm_cache import capture_response, get_llm_cache, llm_cache_key
+from Lead_Identification.common.llm_clients import get_gemini_client, get_http_session, provider_slot, record_usage
 
 # Load .env at startup
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY")
 
-# GEMINI FLASH 2.5
-def call_gemini_flash(prompt: str, system_prompt: str = None, temperature: float = 0.7, max_tokens: int = 300) -> str:
-    try:
-        client = Client(api_key=GEMINI_API_KEY)
+REASK_NOTE = "Your previous answer could not be parsed ({error}). Answer again with the JSON only."
 
-        # Combine system and user prompt
-        full_prompt = f"{system_prompt}\n{prompt}" if system_prompt else prompt
 
-        # Wrap content as Part and use in a list
-        contents = [types.Part.from_text(text=full_prompt)]
+def generate_gemini_content(prompt: str, model: str = "gemini-2.0-flash", temperature: float = 0.7, max_tokens: int = 300, use_cache: bool = True, response_mime_type: str = None, response_schema: dict = None) -> str:
+    """
+    Sends a prompt to Gemini through the shared client and returns the raw text.
+    Identical requests are answered from the local LLM cache.
+    With response_mime_type="application/json" Gemini answers in JSON mode,
+    constrained to `response_schema` (OpenAPI subset) when given.
+    Raises on failure; callers decide how to recover.
+    """
+    cache = get_llm_cache() if use_cache else None
+    cache_model = model
+    if response_mime_type:
+        cache_model = f"{model}|{response_mime_type}"
+        if response_schema:
+            cache_model += "|" + hashlib.sha256(json.dumps(response_schema, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    cache_key = llm_cache_key(cache_model, prompt, temperature, max_tokens)
+    if cache:
+        cached = cache.get_text(cache_key)
+        if cached is not None:
+            return cached
 
-        # Configuration for the generation
-        config = types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=max_tokens,
-            
-        )
+    client = get_gemini_client(GEMINI_API_KEY)
 
-        # Generate response
+    # Wrap content as Part and use in a list
+    contents = [types.Part.from_text(text=prompt)]
+
+    # Configuration for the generation
+    config = types.GenerateContentConfig(
+        temperature=temperature,
+        max_output_tokens=max_tokens,
+        response_mime_type=response_mime_type,
+        response_schema=response_schema,
+    )
+
+    with provider_slot("gemini"):
         response = client.models.generate_content(
-            model="gemini-2.0-flash",  # or gemini-2.0-flash-001 depending on your access
+            model=model,
             contents=contents,
             config=config
         )
 
-        return response.text
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        record_usage("gemini", usage.prompt_token_count, usage.candidates_token_count)
+
+    text = response.text
+    capture_response("gemini", model, prompt, text, json_mode=bool(response_mime_type))
+    if cache and text:
+        cache.set_text(cache_key, text)
+    return text
+
+
+def generate_gemini_json(prompt: str, model: str = "gemini-2.0-flash", temperature: float = 0.7, max_tokens: int = 300, response_schema: dict = None, expect: type = dict, schema=None):
+    """
+    Gemini in JSON mode, parsed with extract_json. Only when local repair fails
+    is the model asked again (LLM_JSON_MAX_REASKS times) with the parse error.
+    Raises JSONParseError when no answer parses.
+    """
+    def generate(text: str) -> str:
+        return generate_gemini_content(
+            text,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_mime_type="application/json",
+            response_schema=response_schema,
+        )
+
+    def reask(error: str) -> str:
+        return generate(f"{prompt}\n\n{REASK_NOTE.format(error=error)}")
+
+    return parse_with_reask(generate(prompt), reask, max_reasks=LLM_JSON_MAX_REASKS, expect=expect, schema=schema)
+
+
+# GEMINI FLASH 2.5
+def call_gemini_flash(prompt: str, system_prompt: str = None, temperature: float = 0.7, max_tokens: int = 300, response_mime_type: str = None) -> str:
+    try:
+        # Combine system and user prompt
+        full_prompt = f"{system_prompt}\n{prompt}" if system_prompt else prompt
+
+        # Generate response
+        return generate_gemini_content(
+            full_prompt,
+            model="gemini-2.0-flash",  # or gemini-2.0-flash-001 depending on your access
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_mime_type=response_mime_type
+        )
 
     except Exception as e:
         print(f"❌ Gemini Flash call failed: {e}")
@@ -47,7 +115,8 @@ def call_gemini_flash(prompt: str, system_prompt: str = None, temperature: float
 
 
 # MISTRAL
-def call_mistral(prompt: str, system_prompt: str = "You are a helpful assistant.", temperature: float = 0.7, max_tokens: int = 300) -> str:
+def call_mistral(prompt: str, system_prompt: str = "You are a helpful assistant.", temperature: float = 0.7, max_tokens: int = 300, json_mode: bool = False) -> str:
+    """json_mode asks Mistral for a JSON object (response_format json_object); the prompt must ask for an object."""
     url = "https://api.mistral.ai/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
@@ -62,13 +131,26 @@ def call_mistral(prompt: str, system_prompt: str = "You are a helpful assistant.
         "temperature": temperature,
         "max_tokens": max_tokens
     }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+
+    cache = get_llm_cache()
+    cache_model = f"{payload['model']}|json" if json_mode else payload["model"]
+    cache_key = llm_cache_key(cache_model, f"{system_prompt}\n{prompt}", temperature, max_tokens)
+    if cache:
+        cached = cache.get_text(cache_key)
+        if cached is not None:
+            return cached
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        with provider_slot("mistral"):
+            response = get_http_session("mistral").post(url, headers=headers, json=payload, timeout=LLM_HTTP_TIMEOUT)
         response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
+        content = response.json()["choices"][0]["message"]["content"]
+        capture_response("mistral", payload["model"], f"{system_prompt}\n{prompt}", content, json_mode=json_mode)
+        if cache and content:
+            cache.set_text(cache_key, content)
+        return content
     except Exception as e:
         print(f"❌ Mistral API call failed: {e}")
         return "[LLM error]"
-
-
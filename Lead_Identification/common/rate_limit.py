@@ -0,0 +1,59 @@
+# Lead_Identification/common/rate_limit.py
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Allows `rate` acquisitions per `period` seconds on average, with bursts of
+    up to `burst` (defaults to one period's worth). `acquire` blocks until a
+    token is available.
+    """
+
+    def __init__(self, rate: float, period: float = 60.0, burst: Optional[float] = None):
+        self.rate = rate
+        self.period = period
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / self.period)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) * self.period / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, period: float = 60.0) -> Optional[RateLimiter]:
+    """
+    Returns the process-wide limiter registered under `name`, creating it on
+    first use. A non-positive rate means unlimited and returns None.
+    """
+    if rate <= 0:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(rate, period)
+            _limiters[name] = limiter
+        return limiter
@@ -0,0 +1,145 @@
+# Lead_Identification/common/search_cache.py
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from Lead_Identification.common.config import (
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_TTL,
+    TAVILY_RPM,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Identification.common.rate_limit import get_rate_limiter
+
+# Typographic quotes folded to their ASCII form before hashing.
+QUOTES = str.maketrans({
+    "“": '"', "”": '"', "„": '"', "«": '"', "»": '"',
+    "‘": "'", "’": "'", "‚": "'", "`": "'",
+})
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and quote canonical form: queries that only differ in those share an entry."""
+    return WHITESPACE.sub(" ", query.translate(QUOTES)).strip().lower()
+
+
+def search_cache_key(query: str, search_depth: str, max_results: int, **options) -> str:
+    """Key on the normalized query plus every parameter that changes the results."""
+    payload = json.dumps(
+        {"query": normalize_query(query), "depth": search_depth, "max_results": max_results, "options": options},
+        sort_keys=True,
+        default=str,
+    )
+    return f"tavily|{search_depth}|{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class CachedTavilyClient:
+    """
+    Drop-in wrapper around `TavilyClient` whose `search` is served from a
+    persistent cache. Misses go through the process-wide Tavily rate limiter;
+    concurrent misses on the same key issue a single paid call.
+    Other client methods are passed through unchanged.
+    """
+
+    def __init__(self, client, store: Optional[DiskCache] = None, rate: float = TAVILY_RPM):
+        self.client = client
+        self.store = store
+        self.rate = rate
+        # key -> [lock, callers holding or waiting for it]; dropped when the last one leaves.
+        self._inflight: Dict[str, list] = {}
+        self._inflight_lock = threading.Lock()
+        self.calls = 0
+
+    def _acquire_key(self, key: str) -> threading.Lock:
+        with self._inflight_lock:
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release_key(self, key: str):
+        with self._inflight_lock:
+            entry = self._inflight[key]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._inflight[key]
+
+    def _call(self, query: str, search_depth: str, max_results: int, **options) -> Dict[str, Any]:
+        limiter = get_rate_limiter("tavily", self.rate)
+        if limiter is not None:
+            limiter.acquire()
+        with self._inflight_lock:
+            self.calls += 1
+        return self.client.search(query=query, search_depth=search_depth, max_results=max_results, **options)
+
+    def search(self, query: str, search_depth: str = "basic", max_results: int = 5, **options) -> Dict[str, Any]:
+        if self.store is None:
+            return self._call(query, search_depth, max_results, **options)
+
+        key = search_cache_key(query, search_depth, max_results, **options)
+        cached = self.store.get_json(key)
+        if cached is not None:
+            return cached
+
+        lock = self._acquire_key(key)
+        try:
+            with lock:
+                # Another thread may have filled the entry while we waited.
+                cached = self.store.get_json(key)
+                if cached is not None:
+                    return cached
+                response = self._call(query, search_depth, max_results, **options)
+                # Empty answers are often transient: only keep responses with results.
+                if response.get("results"):
+                    self.store.set_json(key, response)
+                return response
+        finally:
+            self._release_key(key)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.store.stats() if self.store else {}
+        stats["paid_calls"] = self.calls
+        return stats
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+_search_cache: Optional[DiskCache] = None
+_client: Optional[CachedTavilyClient] = None
+_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[DiskCache]:
+    """Returns the process-wide Tavily result cache, or None when it is disabled."""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    with _lock:
+        if _search_cache is None:
+            _search_cache = DiskCache(
+                SEARCH_CACHE_PATH,
+                table="tavily_results",
+                ttl=SEARCH_CACHE_TTL,
+                max_entries=SEARCH_CACHE_MAX_ENTRIES,
+            )
+        return _search_cache
+
+
+def get_search_client() -> CachedTavilyClient:
+    """Process-wide cached Tavily client shared by every search call site."""
+    global _client
+    if _client is None:
+        store = get_search_cache()
+        with _lock:
+            if _client is None:
+                from tavily import TavilyClient
+
+                _client = CachedTavilyClient(TavilyClient(api_key=os.getenv("TAVILY_API_KEY")), store)
+    return _client
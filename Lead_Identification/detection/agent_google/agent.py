@@ -1,39 +1,98 @@
 # Lead_Identification/detection/agent_google/agent.py
 
+import asyncio
 import json
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
 
+from Lead_Identification.detection.agent_google.utils import generate_search_queries, search_duckduckgo, async_crawl_and_clean, summarize_page
 
-from Lead_Identification.detection.agent_google.utils import generate_search_queries, search_duckduckgo, crawl_and_clean, summarize_page
+# Upper bounds on concurrent work per stage of the agent.
+SEARCH_CONCURRENCY = 4
+CRAWL_CONCURRENCY = 3
+SUMMARY_CONCURRENCY = 4
+URLS_PER_QUERY = 2
+
+_DONE = object()
+
+
+def parse_summary(summary_json: str) -> Optional[Dict]:
+    """Returns the lead described by `summary_json`, or None if the page is not a match."""
+    try:
+        summary = json.loads(summary_json)
+        if summary.get("reason_for_match"):
+            return summary
+    except Exception as e:
+        print(f"[⚠️] Could not parse summary: {e}")
+        print(f"[⚠️] Summary content: {summary_json}")
+    return None
 
-def google_agent(icp: Dict) -> List[Dict]:
 
-    leads = []
+async def stream_google_leads(icp: Dict) -> AsyncIterator[Dict]:
+    """
+    Asyncio version of the Google agent.
+
+    Searches, crawls and summaries run concurrently, each stage bounded by its
+    own semaphore, and leads are yielded as soon as their page is confirmed.
+    """
     print("generating search queries based on ICP...\n")
-    queries = generate_search_queries(icp)
+    queries = await asyncio.to_thread(generate_search_queries, icp)
     print(f"Generated {len(queries)} queries based on ICP")
     print(queries)
-    
-    for query in queries:
-        print(f"[🔍] Searching: {query}")
-        urls = search_duckduckgo(query, top_k=2)
-        
-        for url in urls:
+
+    search_semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    crawl_semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+    summary_semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    leads_queue: asyncio.Queue = asyncio.Queue()
+    seen_urls = set()
+
+    async def process_url(url: str):
+        async with crawl_semaphore:
             print(f"[🌐] Crawling URL: {url}")
-            raw_content = crawl_and_clean(url)
-            summary_json = summarize_page(raw_content, icp)
-            print(f"[📝] Summary for {url}:\n {summary_json}\n")
-
-            try:
-                summary = json.loads(summary_json)
-                if summary.get("reason_for_match"):
-                    leads.append(summary)
-            except Exception as e:
-                print(f"[⚠️] Could not parse summary: {e}")
-                print(f"[⚠️] Summary content: {summary_json}")
-                continue
-            
-            
-    return leads
+            raw_content = await async_crawl_and_clean(url)
+        async with summary_semaphore:
+            summary_json = await asyncio.to_thread(summarize_page, raw_content, icp)
+        print(f"[📝] Summary for {url}:\n {summary_json}\n")
+
+        lead = parse_summary(summary_json)
+        if lead:
+            await leads_queue.put(lead)
 
+    async def process_query(query: str):
+        async with search_semaphore:
+            print(f"[🔍] Searching: {query}")
+            urls = await asyncio.to_thread(search_duckduckgo, query, URLS_PER_QUERY)
 
+        # The same page often answers several queries; crawl it only once.
+        new_urls = [url for url in urls if url not in seen_urls]
+        seen_urls.update(new_urls)
+        results = await asyncio.gather(*(process_url(url) for url in new_urls), return_exceptions=True)
+        for url, result in zip(new_urls, results):
+            if isinstance(result, Exception):
+                print(f"[⚠️] Failed to process {url}: {result}")
+
+    async def run_all():
+        try:
+            await asyncio.gather(*(process_query(query) for query in queries), return_exceptions=True)
+        finally:
+            await leads_queue.put(_DONE)
+
+    producer = asyncio.create_task(run_all())
+    try:
+        while True:
+            lead = await leads_queue.get()
+            if lead is _DONE:
+                break
+            yield lead
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def collect_google_leads(icp: Dict) -> List[Dict]:
+    return [lead async for lead in stream_google_leads(icp)]
+
+
+def google_agent(icp: Dict) -> List[Dict]:
+    """Synchronous entry point used by the detection controller."""
+    return asyncio.run(collect_google_leads(icp))
@@ -1,11 +1,14 @@
 from Lead_Identification.common.llms import call_gemini_flash, call_mistral
+from Lead_Identification.common.json_parsing import JSONParseError, extract_json
+from Lead_Identification.common.crawler_pool import get_crawler_pool
+from Lead_Identification.common.crawl_cache import lookup_crawl, store_crawl
 from ddgs import DDGS
 import os
 import re
 import time
 import asyncio
 
-from crawl4ai import CrawlerRunConfig, AsyncWebCrawler
+from crawl4ai import CrawlerRunConfig
 from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 import json
@@ -98,27 +101,53 @@ def clean_text(raw_text: str) -> str:
     lines = raw_text.splitlines()
     return "\n".join(line for line in lines if not is_noise_line(line))
 
-async def async_crawl_and_clean(url: str) -> str:
-    config = CrawlerRunConfig(
+# Cache namespace: pages crawled with different depths are stored separately.
+CRAWL_PROFILE = "detection"
+
+def crawl_config() -> CrawlerRunConfig:
+    return CrawlerRunConfig(
         deep_crawl_strategy=BFSDeepCrawlStrategy(max_depth=2, max_pages=5, include_external=False),
         scraping_strategy=LXMLWebScrapingStrategy(),
         verbose=False,
     )
 
+def clean_results(results) -> str:
     cleaned_texts = []
+    for result in results:
+        raw = result.markdown or ""
+        cleaned = clean_text(raw)
+        cleaned_texts.append(cleaned)
+    return "\n\n".join(cleaned_texts)
+
+async def async_crawl_and_clean(url: str) -> str:
+    """
+    Deep-crawls `url` through the shared crawler pool and returns the cleaned
+    markdown of every page. The crawl cache is consulted first.
+    """
+    cached = await asyncio.to_thread(lookup_crawl, url, CRAWL_PROFILE)
+    if cached is not None:
+        return cached
     try:
-        async with AsyncWebCrawler() as crawler:
-            results = await crawler.arun(url=url, config=config)
-            for result in results:
-                raw = result.markdown or ""
-                cleaned = clean_text(raw)
-                cleaned_texts.append(cleaned)
+        results = await get_crawler_pool().acrawl(url, crawl_config())
+        content = clean_results(results)
     except Exception as e:
         print(f"❌ Crawling failed for {url}: {e}")
-    return "\n\n".join(cleaned_texts)
+        return ""
+    await asyncio.to_thread(store_crawl, url, CRAWL_PROFILE, content, results)
+    return content
 
 def crawl_and_clean(url: str) -> str:
-    return asyncio.run(async_crawl_and_clean(url))
+    cached = lookup_crawl(url, CRAWL_PROFILE)
+    if cached is not None:
+        return cached
+    try:
+        results = get_crawler_pool().crawl(url, crawl_config())
+        content = clean_results(results)
+    except Exception as e:
+        print(f"❌ Crawling failed for {url}: {e}")
+        return ""
+    store_crawl(url, CRAWL_PROFILE, content, results)
+    return content
 
  # or mistral, gemini, etc.
 
@@ -127,11 +156,14 @@ def crawl_and_clean(url: str) -> str:
 
 def extract_json_from_response(response_text: str) -> str:
     """
-    Extracts and returns the first JSON-like object from a string by capturing the text between the first pair of curly braces.
-    If no braces found, returns empty string.
+    Extracts the JSON object from an LLM response (tolerant to fences,
+    prose and common syntax slips) and returns it re-serialized.
+    If no object can be recovered, returns empty string.
     """
-    match = re.search(r'\{.*?\}', response_text, re.DOTALL)
-    return match.group(0).strip() if match else ""
+    try:
+        return json.dumps(extract_json(response_text, expect=dict), ensure_ascii=False)
+    except JSONParseError:
+        return ""
 
 
 
@@ -175,7 +207,8 @@ Return the result strictly in JSON format, with the following fields:
             prompt=content,
             system_prompt=summary_prompt,
             temperature=0.3,
-            max_tokens=300
+            max_tokens=300,
+            response_mime_type="application/json"
         )
         return extract_json_from_response(summary)
     except Exception as e:
@@ -1,13 +1,23 @@
 
 
 import os
+import sys
 import json
-from typing import List, Dict, Any, TypedDict, Optional
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, TypedDict, Optional, Annotated
 from dotenv import load_dotenv # Explicitly load .env here
 import google.generativeai as genai
-from tavily import TavilyClient
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../")))
+
+from Lead_Identification.common.config import TAVILY_MAX_WORKERS
+from Lead_Identification.common.json_parsing import JSONParseError, extract_json
+from Lead_Identification.common.search_cache import get_search_client
 
 
 # --- Configuration and API Key Validation ---
@@ -39,6 +49,13 @@ class LeadGenerationState(TypedDict):
     company_name: Optional[str]
     question: Optional[str]
     coach_answer: Optional[str]
+    # (lead index, enriched lead) pairs written by the parallel find_key_personnel branches
+    personnel_results: Annotated[List[Dict[str, Any]], operator.add]
+
+class PersonnelTask(TypedDict):
+    index: int
+    lead: LeadProfile
+    decision_makers_titles: List[str]
 
 # --- Node Definitions ---
 
@@ -46,6 +63,10 @@ class LeadGenerationNodes:
     def __init__(self, llm, tavily_client):
         self.llm = llm
         self.tavily = tavily_client
+
+    def search(self, **kwargs) -> Dict[str, Any]:
+        """Tavily search; the shared client throttles its cache misses with the 'tavily' token bucket."""
+        return self.tavily.search(**kwargs)
         
 
     def generate_search_queries(self, state: LeadGenerationState) -> LeadGenerationState:
@@ -79,16 +100,24 @@ class LeadGenerationNodes:
         return {"search_queries": queries}
 
     def perform_web_research(self, state: LeadGenerationState) -> LeadGenerationState:
-        """Performs web research using the generated queries."""
+        """Performs web research using the generated queries, several queries at a time."""
         print("--- Node: perform_web_research ---")
         queries = state['search_queries']
-        all_results = []
-        for query in queries:
+        if not queries:
+            return {"research_results": []}
+
+        def run_query(query):
             try:
-                response = self.tavily.search(query=query, search_depth="basic", max_results=5)
-                all_results.extend(response['results'])
+                return self.search(query=query, search_depth="basic", max_results=5)['results']
             except Exception as e:
                 print(f"Tavily search error for '{query}': {e}")
+                return []
+
+        all_results = []
+        with ThreadPoolExecutor(max_workers=min(TAVILY_MAX_WORKERS, len(queries))) as pool:
+            # map keeps the query order, so results are the same as a sequential run
+            for results in pool.map(run_query, queries):
+                all_results.extend(results)
         print(f"Found {len(all_results)} search results.")
         return {"research_results": all_results}
 
@@ -135,16 +164,8 @@ class LeadGenerationNodes:
         
         response = self.llm.invoke(prompt)
         try:
-            content = response.content.strip()
-            # Robustly extract JSON array from content
-            json_start = content.find('[')
-            json_end = content.rfind(']')
-            if json_start != -1 and json_end != -1:
-                json_string = content[json_start : json_end + 1]
-            else:
-                raise json.JSONDecodeError("Could not find valid JSON array in LLM response", content, 0)
-            
-            leads = json.loads(json_string)
+            # Robustly extract the JSON array of leads from the content
+            leads = extract_json(response.content, expect=list, schema=[{"name": str}])
             # Ensure all expected fields are present and initialize key_personnel
             for lead in leads:
                 lead['url_website'] = lead.get('url_website', None)
@@ -154,64 +175,69 @@ class LeadGenerationNodes:
 
             print(f"Identified {len(leads)} potential leads.")
             return {"potential_leads": leads}
-        except json.JSONDecodeError:
-            print(f"Error decoding potential leads: {response.content}")
+        except JSONParseError as e:
+            print(f"Error decoding potential leads ({e}): {response.content}")
             return {"potential_leads": []}
 
-    def find_key_personnel(self, state: LeadGenerationState) -> LeadGenerationState:
-        """For each lead, find key decision-makers based on the ICP."""
-        print("--- Node: find_key_personnel ---")
-        updated_leads = []
+    def route_key_personnel(self, state: LeadGenerationState):
+        """Fans out one find_key_personnel branch per lead (LangGraph map-reduce)."""
         decision_makers_titles = state['icp'].get('key_decision_makers', [])
         if not decision_makers_titles:
             print("Warning: No 'key_decision_makers' defined in ICP. Skipping personnel search.")
-            return {"potential_leads": state['potential_leads']}
-
-        for lead in state['potential_leads']:
-            company_name = lead['name']
-            print(f"Searching for personnel at: {company_name}")
-            
-            # Construct a targeted query for decision-makers
-            titles_query = " OR ".join([f'"{title}"' for title in decision_makers_titles])
-            query = f'linkedin {company_name} ({titles_query})'
-            
-            try:
-                search_results = self.tavily.search(query=query, search_depth="basic", max_results=3)
-                context = "\n".join([res['content'] for res in search_results['results']])
-
-                prompt = f"""
-                From the text below, extract the names and job titles of individuals who work at '{company_name}'.
-                The target job titles are: {', '.join(decision_makers_titles)}.
-                
-                Context:
-                ---
-                {context}
-                ---
-
-                Return a JSON list of objects with "name", "title", and "linkedin_profile".
-                Example: [{{"name": "Jane Doe", "title": "Chief Technology Officer", "linkedin_profile": "https://www.linkedin.com/in/janedoe"}}]
-                """
-                response = self.llm.invoke(prompt)
-                content = response.content.strip()
-                if content.startswith("```json"):
-                    content = content[7:]
-                if content.endswith("```"):
-                    content = content[:-3]
-                
-                personnel = json.loads(content)
-                # Ensure linkedin_profile is present for each personnel
-                for p in personnel:
-                    p['linkedin_profile'] = p.get('linkedin_profile', None)
-                lead['key_personnel'] = personnel
-                print(f"Found {len(personnel)} key personnel for {company_name}.")
+            return "compile_report"
+        if not state['potential_leads']:
+            return "compile_report"
+        return [
+            Send("find_key_personnel", {"index": i, "lead": lead, "decision_makers_titles": decision_makers_titles})
+            for i, lead in enumerate(state['potential_leads'])
+        ]
 
-            except Exception as e:
-                print(f"Could not find personnel for {company_name}: {e}")
-                lead['key_personnel'] = []
-            
-            updated_leads.append(lead)
-            
-        return {"potential_leads": updated_leads}
+    def find_key_personnel(self, task: PersonnelTask) -> LeadGenerationState:
+        """Finds the key decision-makers of one lead based on the ICP."""
+        lead = task['lead']
+        decision_makers_titles = task['decision_makers_titles']
+        company_name = lead['name']
+        print(f"Searching for personnel at: {company_name}")
+
+        # Construct a targeted query for decision-makers
+        titles_query = " OR ".join([f'"{title}"' for title in decision_makers_titles])
+        query = f'linkedin {company_name} ({titles_query})'
+
+        try:
+            search_results = self.search(query=query, search_depth="basic", max_results=3)
+            context = "\n".join([res['content'] for res in search_results['results']])
+
+            prompt = f"""
+            From the text below, extract the names and job titles of individuals who work at '{company_name}'.
+            The target job titles are: {', '.join(decision_makers_titles)}.
+
+            Context:
+            ---
+            {context}
+            ---
+
+            Return a JSON list of objects with "name", "title", and "linkedin_profile".
+            Example: [{{"name": "Jane Doe", "title": "Chief Technology Officer", "linkedin_profile": "https://www.linkedin.com/in/janedoe"}}]
+            """
+            response = self.llm.invoke(prompt)
+            personnel = extract_json(response.content, expect=list, schema=[dict])
+            # Ensure linkedin_profile is present for each personnel
+            for p in personnel:
+                p['linkedin_profile'] = p.get('linkedin_profile', None)
+            lead = {**lead, 'key_personnel': personnel}
+            print(f"Found {len(personnel)} key personnel for {company_name}.")
+
+        except Exception as e:
+            print(f"Could not find personnel for {company_name}: {e}")
+            lead = {**lead, 'key_personnel': []}
+
+        return {"personnel_results": [{"index": task['index'], "lead": lead}]}
+
+    def merge_key_personnel(self, state: LeadGenerationState) -> LeadGenerationState:
+        """Gathers the parallel branches back into potential_leads, in the original lead order."""
+        print("--- Node: merge_key_personnel ---")
+        results = sorted(state.get('personnel_results', []), key=lambda r: r['index'])
+        return {"potential_leads": [r['lead'] for r in results]}
 
     def compile_report(self, state: LeadGenerationState) -> LeadGenerationState:
         """Compiles the final, enriched report."""
@@ -277,17 +303,35 @@ class LeadGenerationNodes:
             return {"coach_answer": f"Error generating sales coach answer: {str(e)}"}
 
 
-def create_lead_generation_graph():
+_llm = None
+_lead_generation_graph = None
+_sales_coach_graph = None
+_clients_lock = threading.Lock()
+_graphs_lock = threading.Lock()
+
+
+def get_llm():
+    """Process-wide Gemini chat model, shared by every graph."""
+    global _llm
+    if _llm is None:
+        with _clients_lock:
+            if _llm is None:
+                _llm = ChatGoogleGenerativeAI(
+                    model="gemini-2.5-flash", 
+                    temperature=0,
+                    google_api_key=os.getenv("GEMINI_API_KEY")
+                )
+    return _llm
+
+
+def get_tavily_client():
+    """Process-wide Tavily client (cached and rate limited), shared by every graph."""
+    return get_search_client()
+
+
+def create_lead_generation_graph(llm=None, tavily_client=None):
     """Creates the LangGraph workflow for lead generation."""
-    
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash", 
-        temperature=0,
-        google_api_key=os.getenv("GEMINI_API_KEY")
-    )
-    tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-    
-    nodes = LeadGenerationNodes(llm, tavily_client)
+    nodes = LeadGenerationNodes(llm or get_llm(), tavily_client or get_tavily_client())
     
     workflow = StateGraph(LeadGenerationState)
     
@@ -295,27 +339,27 @@ def create_lead_generation_graph():
     workflow.add_node("perform_web_research", nodes.perform_web_research)
     workflow.add_node("identify_potential_leads", nodes.identify_potential_leads)
     workflow.add_node("find_key_personnel", nodes.find_key_personnel)
+    workflow.add_node("merge_key_personnel", nodes.merge_key_personnel)
     workflow.add_node("compile_report", nodes.compile_report)
     
     workflow.set_entry_point("generate_search_queries")
     workflow.add_edge("generate_search_queries", "perform_web_research")
     workflow.add_edge("perform_web_research", "identify_potential_leads")
-    workflow.add_edge("identify_potential_leads", "find_key_personnel")
-    workflow.add_edge("find_key_personnel", "compile_report")
+    workflow.add_conditional_edges(
+        "identify_potential_leads",
+        nodes.route_key_personnel,
+        ["find_key_personnel", "compile_report"],
+    )
+    workflow.add_edge("find_key_personnel", "merge_key_personnel")
+    workflow.add_edge("merge_key_personnel", "compile_report")
     workflow.add_edge("compile_report", END)
     
-    return workflow.compile()
+    # Bounds how many find_key_personnel branches run at once.
+    return workflow.compile().with_config(max_concurrency=TAVILY_MAX_WORKERS)
 
-def create_sales_coach_graph():
+def create_sales_coach_graph(llm=None, tavily_client=None):
     """Creates the LangGraph workflow for sales coaching."""
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash", 
-        temperature=0,
-        google_api_key=os.getenv("GEMINI_API_KEY")
-    )
-    tavily_client = TavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-    
-    nodes = LeadGenerationNodes(llm, tavily_client)
+    nodes = LeadGenerationNodes(llm or get_llm(), tavily_client or get_tavily_client())
     
     workflow = StateGraph(LeadGenerationState)
     
@@ -327,6 +371,29 @@ def create_sales_coach_graph():
     return workflow.compile()
 
 
+def get_lead_generation_graph():
+    """
+    Compiled lead generation graph, built once per process on the shared clients.
+    The graph has no checkpointer, so concurrent invocations are independent.
+    """
+    global _lead_generation_graph
+    if _lead_generation_graph is None:
+        with _graphs_lock:
+            if _lead_generation_graph is None:
+                _lead_generation_graph = create_lead_generation_graph()
+    return _lead_generation_graph
+
+
+def get_sales_coach_graph():
+    """Compiled sales coach graph, built once per process on the shared clients."""
+    global _sales_coach_graph
+    if _sales_coach_graph is None:
+        with _graphs_lock:
+            if _sales_coach_graph is None:
+                _sales_coach_graph = create_sales_coach_graph()
+    return _sales_coach_graph
+
+
 def run_graph(service_name: str):
     """
     Loads the correct ICP and runs the lead generation graph.
@@ -345,7 +412,7 @@ def run_graph(service_name: str):
         return {"error": f"Service '{service_name}' not found in icp.json"}
 
     try:
-        graph = create_lead_generation_graph()
+        graph = get_lead_generation_graph()
         initial_state = {
             "service_name": service_name,
             "icp": selected_icp,
@@ -383,7 +450,7 @@ def run_sales_coach_graph(company_name: str, service_name: str, question: str):
         if "error" in lead_report:
             return {"error": f"Failed to generate lead report for coaching: {lead_report['error']}"}
 
-        graph = create_sales_coach_graph()
+        graph = get_sales_coach_graph()
         initial_state = {
             "service_name": service_name,
             "icp": selected_icp,
@@ -0,0 +1,508 @@
+# Lead_Identification/detection/dedup.py
+
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Legal-form suffixes dropped when comparing company names.
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited", "llc", "plc",
+    "gmbh", "ag", "sa", "sas", "sarl", "srl", "spa", "bv", "nv", "group", "groupe", "holding", "holdings",
+}
+
+# Hosts that say nothing about which company a URL belongs to.
+SHARED_DOMAINS = {
+    "linkedin.com", "facebook.com", "twitter.com", "x.com", "youtube.com", "instagram.com",
+    "wikipedia.org", "crunchbase.com", "bloomberg.com", "reuters.com", "medium.com", "github.com",
+    "google.com", "glassdoor.com", "indeed.com",
+}
+
+
+# Second-level labels under a country code ('acme.co.uk' is registered as 'acme').
+GENERIC_SLDS = {"co", "com", "org", "net", "gov", "ac", "edu"}
+
+# A shared domain cited by more companies than this is a publisher, vendor or
+# directory: it does not even make them candidate duplicates.
+DOMAIN_CANDIDATE_MAX_COMPANIES = 10
+
+# First tokens too common to be used alone as a blocking key.
+BLOCKING_STOPWORDS = {"the", "global", "international", "first", "new", "united", "national", "general"}
+
+# Similarity at or above which two names are merged without asking; between
+# the two thresholds a pair is ambiguous and goes to the resolver (LLM).
+MERGE_THRESHOLD = 0.94
+AMBIGUOUS_THRESHOLD = 0.8
+MAX_BLOCK_SIZE = 400
+
+
+def normalize_company_name(name: str) -> str:
+    """'Société Générale S.A.' -> 'societe generale'."""
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^a-z0-9]+", " ", text.lower().replace("&", " and "))
+    tokens = [token for token in text.split() if token not in LEGAL_SUFFIXES]
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+    return " ".join(tokens)
+
+
+def extract_domain(url: str) -> Optional[str]:
+    """Registrable-ish domain of `url` ('https://www.talan.com/fr' -> 'talan.com')."""
+    if not url:
+        return None
+    netloc = urlparse(url if "://" in url else f"http://{url}").netloc.lower()
+    netloc = netloc.split("@")[-1].split(":")[0]
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return netloc or None
+
+
+def company_domains(lead: Dict) -> List[str]:
+    """Company-specific domains from the lead's relevant_urls (social/news hosts are ignored)."""
+    domains = []
+    for url in lead.get("relevant_urls") or []:
+        domain = extract_domain(url)
+        if domain and not any(domain == shared or domain.endswith("." + shared) for shared in SHARED_DOMAINS):
+            if domain not in domains:
+                domains.append(domain)
+    return domains
+
+
+def registrable_label(domain: str) -> str:
+    """'news.acme.co.uk' -> 'acme'."""
+    labels = domain.split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in GENERIC_SLDS:
+        return labels[-3]
+    return labels[-2] if len(labels) >= 2 else labels[0]
+
+
+def domain_matches_name(domain: str, name: str) -> bool:
+    """
+    Whether `domain` looks like the company's own site: its registrable label is
+    the normalized `name` without spaces ('societe-generale.com') or its first
+    token ('orange.fr' for 'orange business').
+    """
+    label = registrable_label(domain).replace("-", "")
+    tokens = name.split()
+    if not tokens or not label:
+        return False
+    return label == "".join(tokens) or (label == tokens[0] and len(label) >= 3 and label not in BLOCKING_STOPWORDS)
+
+
+def split_domains(company: Dict, name: str) -> Tuple[List[str], List[str]]:
+    """
+    (identity, shared) company domains: only identity domains merge two
+    companies; a shared one (a press article, a partner page) only makes them
+    candidate duplicates for the resolver.
+    """
+    identity, shared = [], []
+    for domain in company_domains(company):
+        (identity if domain_matches_name(domain, name) else shared).append(domain)
+    return identity, shared
+
+
+def normalize_key_personal(people: Iterable) -> List[Dict[str, str]]:
+    """
+    Accepts the shapes the agents produce ("Name (Role)", "Name, Role",
+    {"name", "title", "linkedin_profile"}, ...) and returns
+    [{"name", "role", "linkedin_url"}].
+    """
+    normalized = []
+    for person in people or []:
+        if isinstance(person, dict):
+            name = person.get("name", "")
+            role = person.get("role") or person.get("title") or ""
+            linkedin_url = person.get("linkedin_url") or person.get("linkedin_profile") or ""
+        else:
+            text = str(person).strip()
+            match = re.match(r"^(.*?)\s*\((.*)\)\s*$", text)
+            if match:
+                name, role = match.groups()
+            else:
+                name, _, role = text.partition(",")
+            linkedin_url = ""
+        name = name.strip()
+        if name:
+            normalized.append({"name": name, "role": (role or "").strip(), "linkedin_url": linkedin_url or ""})
+    return normalized
+
+
+def tavily_lead_to_company(lead: Dict) -> Dict:
+    """Converts a Tavily agent LeadProfile into the company schema used by the rest of the pipeline."""
+    urls = [url for url in (lead.get("url_website"), lead.get("linkedin_company")) if url]
+    return {
+        "company_name": lead.get("name", ""),
+        "summary": lead.get("summary", ""),
+        "description": lead.get("description") or "",
+        "reason_for_match": lead.get("reason_for_match"),
+        "key_personal": normalize_key_personal(lead.get("key_personnel", [])),
+        "relevant_urls": urls,
+    }
+
+
+def to_company(lead: Dict) -> Dict:
+    """Returns `lead` in the company schema, whichever agent produced it."""
+    if "company_name" not in lead and "name" in lead:
+        return tavily_lead_to_company(lead)
+    company = dict(lead)
+    # Every field exists up front: a later merge only replaces values, never adds
+    # keys to a record that enrichment may be serializing concurrently.
+    for field in ("summary", "description", "reason_for_match"):
+        company.setdefault(field, None)
+    company["key_personal"] = normalize_key_personal(lead.get("key_personal", []))
+    company["relevant_urls"] = list(lead.get("relevant_urls") or [])
+    return company
+
+
+def merge_companies(target: Dict, other: Dict) -> Dict:
+    """
+    Merges `other` into `target`: key_personal and relevant_urls are unioned, empty fields filled.
+    The lists are rebuilt rather than appended to: `target` may already be handed
+    to an enrichment thread that iterates over them.
+    """
+    people = list(target.get("key_personal") or [])
+    known_people = {person["name"].casefold() for person in people}
+    for person in other.get("key_personal", []):
+        if person["name"].casefold() not in known_people:
+            people.append(person)
+            known_people.add(person["name"].casefold())
+    target["key_personal"] = people
+
+    urls = list(target.get("relevant_urls") or [])
+    for url in other.get("relevant_urls", []):
+        if url not in urls:
+            urls.append(url)
+    target["relevant_urls"] = urls
+
+    for field in ("summary", "description", "reason_for_match"):
+        if not target.get(field) and other.get(field):
+            target[field] = other[field]
+    return target
+
+
+class TrigramEmbedder:
+    """
+    Default name embedding: L2-normalized character-trigram counts. Any object
+    with the same `embed` / `similarity` interface (e.g. SBERT vectors) can be
+    passed to DedupEngine instead.
+    """
+
+    def embed(self, text: str) -> Dict[str, float]:
+        padded = f"  {text} "
+        counts = Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+        norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+        return {gram: c / norm for gram, c in counts.items()}
+
+    def similarity(self, a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(gram, 0.0) for gram, weight in a.items())
+
+
+class DedupEngine:
+    """
+    Pairwise rules shared by the batch and streaming deduplicators.
+
+    Two companies are the same when their normalized names or identity domains
+    (see split_domains) are equal. Otherwise, names sharing a blocking key are compared with a
+    blend of difflib ratio and embedding similarity: high scores merge,
+    middling ones (or one name contained in the other) are ambiguous.
+    """
+
+    def __init__(
+        self,
+        embedder=None,
+        merge_threshold: float = MERGE_THRESHOLD,
+        ambiguous_threshold: float = AMBIGUOUS_THRESHOLD,
+    ):
+        self.embedder = embedder or TrigramEmbedder()
+        self.merge_threshold = merge_threshold
+        self.ambiguous_threshold = ambiguous_threshold
+
+    @staticmethod
+    def blocking_keys(name: str) -> List[str]:
+        tokens = name.split()
+        if not tokens:
+            return []
+        keys = []
+        first = tokens[0] if tokens[0] not in BLOCKING_STOPWORDS or len(tokens) == 1 else " ".join(tokens[:2])
+        keys.append(f"t:{first}")
+        # Catches typos in the first word, and names glued or split differently.
+        keys.append(f"p:{name.replace(' ', '')[:4]}")
+        return keys
+
+    def name_similarity(self, a: str, b: str, a_vec, b_vec) -> float:
+        embedding_score = self.embedder.similarity(a_vec, b_vec)
+        # Cheap filter first: names sharing few trigrams cannot reach the ambiguous band.
+        if embedding_score < self.ambiguous_threshold - 0.3:
+            return embedding_score
+        return 0.5 * SequenceMatcher(None, a, b, autojunk=False).ratio() + 0.5 * embedding_score
+
+    def classify(self, a: str, b: str, a_vec, b_vec) -> str:
+        """'same', 'ambiguous' or 'different' for two normalized names."""
+        if a == b:
+            return "same"
+        score = self.name_similarity(a, b, a_vec, b_vec)
+        if score >= self.merge_threshold:
+            return "same"
+        if score >= self.ambiguous_threshold:
+            return "ambiguous"
+        a_tokens, b_tokens = set(a.split()), set(b.split())
+        if (a_tokens <= b_tokens or b_tokens <= a_tokens) and min(len(a), len(b)) >= 4:
+            return "ambiguous"
+        return "different"
+
+
+class _UnionFind:
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            # Keep the earliest lead as the representative.
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+PairResolver = Callable[[List[Tuple[Dict, Dict]]], List[bool]]
+
+
+def deduplicate(
+    leads: List[Dict],
+    resolver: Optional[PairResolver] = None,
+    engine: Optional[DedupEngine] = None,
+    stats: Optional[Dict] = None,
+) -> List[Dict]:
+    """
+    Deduplicates `leads` locally and returns the merged companies in order of
+    first appearance. Only ambiguous pairs (similar names, or a shared domain
+    that is not the company's own) are passed to `resolver`, most similar
+    first, which returns one boolean (same company?) per pair; without a
+    resolver they stay separate.
+    """
+    engine = engine or DedupEngine()
+    companies = [to_company(lead) for lead in leads]
+    companies = [company for company in companies if company.get("company_name")]
+    names = [normalize_company_name(company["company_name"]) for company in companies]
+    vectors = [engine.embedder.embed(name) for name in names]
+    domains = [split_domains(company, name) for company, name in zip(companies, names)]
+    uf = _UnionFind(len(companies))
+
+    # Exact keys: normalized name and identity domain.
+    first_seen: Dict[str, int] = {}
+    for i in range(len(companies)):
+        for key in [f"n:{names[i]}"] + [f"d:{domain}" for domain in domains[i][0]]:
+            if key in first_seen:
+                uf.union(first_seen[key], i)
+            else:
+                first_seen[key] = i
+
+    # Fuzzy matching inside blocks, one representative per exact-match group.
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for i in range(len(companies)):
+        if uf.find(i) == i:
+            for key in engine.blocking_keys(names[i]):
+                blocks[key].append(i)
+
+    compared = set()
+    ambiguous = []
+    for members in blocks.values():
+        if len(members) > MAX_BLOCK_SIZE:
+            members = members[:MAX_BLOCK_SIZE]
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = members[x], members[y]
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                verdict = engine.classify(names[i], names[j], vectors[i], vectors[j])
+                if verdict == "same":
+                    uf.union(i, j)
+                elif verdict == "ambiguous":
+                    ambiguous.append((i, j))
+
+    # Shared domains: every company citing one is a candidate duplicate of the
+    # others (pairs already merged on an identity domain are dropped below),
+    # unless too many companies cite it.
+    citing: Dict[str, List[int]] = defaultdict(list)
+    for i in range(len(companies)):
+        for domain in domains[i][0] + domains[i][1]:
+            citing[domain].append(i)
+    shared = dict.fromkeys(domain for _, others in domains for domain in others)
+    for domain in shared:
+        if len(citing[domain]) <= DOMAIN_CANDIDATE_MAX_COMPANIES:
+            ambiguous.extend(combinations(citing[domain], 2))
+
+    ambiguous = list(dict.fromkeys((i, j) for i, j in ambiguous if uf.find(i) != uf.find(j)))
+    # Most similar first: a resolver that only answers a budget of pairs spends it where merges are likeliest.
+    ambiguous.sort(key=lambda pair: -engine.name_similarity(names[pair[0]], names[pair[1]], vectors[pair[0]], vectors[pair[1]]))
+    resolved = 0
+    if ambiguous and resolver:
+        try:
+            answers = resolver([(companies[i], companies[j]) for i, j in ambiguous])
+            for (i, j), same in zip(ambiguous, answers):
+                if same:
+                    uf.union(i, j)
+                    resolved += 1
+        except Exception as e:
+            print(f"[⚠️] Ambiguous pair resolution failed, keeping them separate: {e}")
+
+    merged: Dict[int, Dict] = {}
+    for i, company in enumerate(companies):
+        root = uf.find(i)
+        if root not in merged:
+            merged[root] = company
+        else:
+            merge_companies(merged[root], company)
+
+    if stats is not None:
+        stats.update({
+            "input": len(leads),
+            "output": len(merged),
+            "comparisons": len(compared),
+            "ambiguous": len(ambiguous),
+            "resolved_as_same": resolved,
+        })
+    return [merged[root] for root in sorted(merged)]
+
+
+class IncrementalDeduplicator:
+    """
+    Deduplicates companies as they stream in.
+
+    `add` returns the company when it is new, or None when it matches one
+    already emitted (same normalized name, same identity domain, or a fuzzy
+    name match above the merge threshold); in that case its people and URLs
+    are merged into the emitted record. A company that only shares another
+    kind of domain with emitted ones is held back instead: `resolve_held`
+    asks the resolver about those pairs and returns the held companies that
+    turned out to be new. Other ambiguous pairs are not resolved while
+    streaming and stay separate. Thread-safe.
+    """
+
+    def __init__(self, engine: Optional[DedupEngine] = None):
+        self.engine = engine or DedupEngine()
+        self._lock = threading.Lock()
+        self._companies: List[Dict] = []
+        self._by_name: Dict[str, Dict] = {}
+        self._by_domain: Dict[str, Dict] = {}
+        self._citing: Dict[str, List[Dict]] = defaultdict(list)
+        self._blocks: Dict[str, List[Tuple[str, object, Dict]]] = defaultdict(list)
+        self._held: Dict[str, Tuple[Dict, object, List[Dict]]] = {}
+
+    def _find(self, company: Dict, name: str, vector) -> Optional[Dict]:
+        existing = self._by_name.get(name)
+        if existing is not None:
+            return existing
+        for domain in split_domains(company, name)[0]:
+            existing = self._by_domain.get(domain)
+            if existing is not None:
+                return existing
+        for key in self.engine.blocking_keys(name):
+            for other_name, other_vector, other in self._blocks.get(key, []):
+                if self.engine.classify(name, other_name, vector, other_vector) == "same":
+                    return other
+        return None
+
+    def _candidates(self, company: Dict) -> List[Dict]:
+        # Emitted companies citing one of its domains, unless too many do.
+        candidates = []
+        for domain in company_domains(company):
+            citing = self._citing.get(domain, [])
+            if len(citing) <= DOMAIN_CANDIDATE_MAX_COMPANIES:
+                candidates.extend(other for other in citing if all(other is not known for known in candidates))
+        return candidates
+
+    def _index(self, company: Dict, name: str, vector, new: bool):
+        self._by_name.setdefault(name, company)
+        for domain in split_domains(company, name)[0]:
+            self._by_domain.setdefault(domain, company)
+        for domain in company_domains(company):
+            if all(company is not other for other in self._citing[domain]):
+                self._citing[domain].append(company)
+        if new:
+            for key in self.engine.blocking_keys(name):
+                self._blocks[key].append((name, vector, company))
+
+    def _emit(self, company: Dict, name: str, vector, existing: Optional[Dict]) -> Optional[Dict]:
+        if existing is not None:
+            merge_companies(existing, company)
+            self._index(existing, name, vector, new=False)
+            return None
+        self._companies.append(company)
+        self._index(company, name, vector, new=True)
+        return company
+
+    def add(self, lead: Dict) -> Optional[Dict]:
+        company = to_company(lead)
+        if not company.get("company_name"):
+            return None
+        name = normalize_company_name(company["company_name"])
+        vector = self.engine.embedder.embed(name)
+        with self._lock:
+            held = self._held.get(name)
+            if held is not None:
+                merge_companies(held[0], company)
+                return None
+            existing = self._find(company, name, vector)
+            if existing is None:
+                candidates = self._candidates(company)
+                if candidates:
+                    self._held[name] = (company, vector, candidates)
+                    return None
+            return self._emit(company, name, vector, existing)
+
+    def held(self) -> int:
+        """Number of companies waiting for `resolve_held`."""
+        with self._lock:
+            return len(self._held)
+
+    def resolve_held(self, resolver: Optional[PairResolver]) -> List[Dict]:
+        """
+        Sends the held (candidate, company) pairs to `resolver`: a company is
+        merged into the first candidate judged the same, otherwise emitted.
+        Returns the newly emitted companies. Without a resolver, or if it
+        fails, held companies are emitted as distinct.
+        """
+        with self._lock:
+            held, self._held = self._held, {}
+        pairs = [(candidate, company) for company, _, candidates in held.values() for candidate in candidates]
+        answers = [False] * len(pairs)
+        if pairs and resolver:
+            try:
+                answers = list(resolver(pairs))
+            except Exception as e:
+                print(f"[⚠️] Ambiguous pair resolution failed, keeping them separate: {e}")
+
+        same: Dict[int, Dict] = {}
+        for (candidate, company), answer in zip(pairs, answers):
+            if answer:
+                same.setdefault(id(company), candidate)
+
+        emitted = []
+        with self._lock:
+            for name, (company, vector, _) in held.items():
+                match = same.get(id(company))
+                if match is not None:
+                    merge_companies(match, company)
+                    self._index(match, name, vector, new=False)
+                elif self._emit(company, name, vector, self._find(company, name, vector)) is not None:
+                    emitted.append(company)
+        return emitted
+
+    def companies(self) -> List[Dict]:
+        """Every distinct company seen so far, with merged people and URLs."""
+        with self._lock:
+            return list(self._companies)
@@ -1,14 +1,27 @@
-from typing import List, Dict
-from Lead_Identification.detection.agent_google.agent import google_agent
+import asyncio
+import queue
+import threading
+from typing import Iterator, List, Dict
+from Lead_Identification.detection.agent_google.agent import google_agent, stream_google_leads
+from Lead_Identification.detection.dedup import IncrementalDeduplicator, deduplicate, tavily_lead_to_company
 from Lead_Identification.detection.agent_tavily.backend_1_enrichment.lead_enrichment_module import get_enriched_leads_report
 # Uncomment the following line if you have a LinkedIn agent implemented
 # from detection.agent_linkedin import linkedin_agent  # Uncomment if exists
 from Lead_Identification.common.llms import call_gemini_flash,call_mistral
+from Lead_Identification.common.config import DEDUP_LLM_MAX_PAIRS, DEDUP_LLM_PAIRS_PER_PROMPT
+from Lead_Identification.common.json_parsing import extract_json
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 import json
 
+
+def tavily_agent(icp: Dict) -> List[Dict]:
+    """Runs the Tavily agent and returns its leads in the company schema."""
+    report = get_enriched_leads_report(icp) or {}
+    return [tavily_lead_to_company(lead) for lead in report.get("leads", [])]
+
+
 def detection_agent(icp: Dict) -> List[Dict]:
     """
     Runs Tavely and Google agents in parallel, aggregates results,
@@ -20,7 +33,7 @@ def detection_agent(icp: Dict) -> List[Dict]:
     with ThreadPoolExecutor() as executor:
         # Submit both tasks at the same time
         futures = {
-            executor.submit(get_enriched_leads_report, icp): "Tavely",
+            executor.submit(tavily_agent, icp): "Tavely",
             executor.submit(google_agent, icp): "Google"
         }
 
@@ -35,51 +48,132 @@ def detection_agent(icp: Dict) -> List[Dict]:
 
     print(f"=== 🧹 Total leads collected: {len(all_leads)} ===")
 
-    # Call LLM to analyze for duplicates
+    # Local dedup, LLM only for ambiguous pairs
     final_leads = analyze_and_detect_duplicates(all_leads)
 
     return final_leads
 
 
-def analyze_and_detect_duplicates(leads: List[Dict]) -> List[Dict]:
+_STREAM_DONE = object()
+
+
+def stream_detected_companies(icp: Dict) -> Iterator[Dict]:
+    """
+    Streaming version of detection_agent: companies are yielded as soon as an
+    agent confirms them, after incremental dedup against those already yielded.
+    A duplicate arriving later only adds its people and URLs to the first record.
+    A company that only shares a third-party domain (article, vendor page) with
+    one already yielded is held until its pair is resolved by llm_resolve_pairs,
+    in batches of DEDUP_LLM_PAIRS_PER_PROMPT held companies and at the end.
     """
-    Uses LLM to detect potential duplicates or conflicting entries.
+    companies: queue.Queue = queue.Queue()
+
+    def run_google():
+        async def pump():
+            async for lead in stream_google_leads(icp):
+                companies.put(lead)
+        asyncio.run(pump())
+
+    def run_tavily():
+        for company in tavily_agent(icp):
+            companies.put(company)
+
+    def run(agent_name, target):
+        try:
+            target()
+            print(f"[✅] {agent_name} agent finished")
+        except Exception as e:
+            print(f"[❌] {agent_name} agent failed: {e}")
+        finally:
+            companies.put(_STREAM_DONE)
+
+    agents = {"Tavely": run_tavily, "Google": run_google}
+    for agent_name, target in agents.items():
+        threading.Thread(target=run, args=(agent_name, target), name=f"detect-{agent_name}", daemon=True).start()
+
+    deduplicator = IncrementalDeduplicator()
+    running = len(agents)
+    while running:
+        lead = companies.get()
+        if lead is _STREAM_DONE:
+            running -= 1
+            continue
+        company = deduplicator.add(lead)
+        detected = [company] if company is not None else []
+        if deduplicator.held() >= DEDUP_LLM_PAIRS_PER_PROMPT:
+            detected += deduplicator.resolve_held(llm_resolve_pairs)
+        for company in detected:
+            print(f"[📡] Detected {company['company_name']}")
+            yield company
+
+    # Companies still waiting for their pairs once both agents are done.
+    for company in deduplicator.resolve_held(llm_resolve_pairs):
+        print(f"[📡] Detected {company['company_name']}")
+        yield company
+
+    print(f"=== 🧹 Total distinct companies streamed: {len(deduplicator.companies())} ===")
+
+
+def _pair_line(index: int, a: Dict, b: Dict) -> str:
+    def describe(company):
+        return json.dumps({
+            "name": company.get("company_name"),
+            "urls": company.get("relevant_urls", [])[:3],
+            "summary": (company.get("summary") or "")[:200],
+        }, ensure_ascii=False)
+    return f"{index}. A={describe(a)}\n   B={describe(b)}"
+
+
+def llm_resolve_pairs(pairs: List[tuple]) -> List[bool]:
     """
-    prompt = f"""
+    Asks the LLM whether each ambiguous pair refers to the same company.
+    `deduplicate` passes the most similar pairs first; pairs beyond
+    DEDUP_LLM_MAX_PAIRS are kept separate.
+    """
+    answers = [False] * len(pairs)
+    if len(pairs) > DEDUP_LLM_MAX_PAIRS:
+        print(f"[⚠️] {len(pairs) - DEDUP_LLM_MAX_PAIRS} of {len(pairs)} ambiguous pairs not sent to the LLM "
+              f"(DEDUP_LLM_MAX_PAIRS={DEDUP_LLM_MAX_PAIRS}); they stay separate")
+        pairs = pairs[:DEDUP_LLM_MAX_PAIRS]
+    chunks = [list(range(start, min(start + DEDUP_LLM_PAIRS_PER_PROMPT, len(pairs))))
+              for start in range(0, len(pairs), DEDUP_LLM_PAIRS_PER_PROMPT)]
+
+    def resolve(chunk):
+        lines = "\n".join(_pair_line(n, *pairs[i]) for n, i in enumerate(chunk, start=1))
+        prompt = f"""
 You are a lead deduplication assistant.
+For each numbered pair below, decide whether A and B refer to the same company
+(e.g. "OpenAI" vs "OpenAI Inc."), not merely related or similarly named companies.
+
+{lines}
 
-I will give you a list of leads in JSON format. Each lead contains a name, company, role, and reason_for_match.
-
-Your task:
-- Detect if there are leads that seem to refer to the same person or company, even if names are slightly different (e.g. "Ahmed Zitouna" vs "A. Zitouna")
-- Merge such leads if possible
-
-
-Return only the final cleaned list of JSONs (without any additional text or explanation) in the following format:
-[
-  {{
-    - company_name: str
-    - summary: str
-    - description: str
-    - reason_for_match: str or null
-    - key_personal: list of json (can be empty)
-    - relevant_urls: list of str (can be empty)
-  }},
-  ...
-]
-the key personal field should be a list of json objects with the following fields:
-- name: str
-- role: str (can be empty)
-- linkedin_url: str (can be empty)
+Return only a JSON object whose "verdicts" list holds {len(chunk)} booleans, one per pair, in order.
+Example: {{"verdicts": [true, false]}}
 """
+        response = call_mistral(prompt, max_tokens=20 * len(chunk) + 50, temperature=0.0, json_mode=True)
+        verdicts = extract_json(response, expect=dict, schema={"verdicts": [bool]})["verdicts"]
+        return chunk, verdicts
 
-    try:
-        leads_str = json.dumps(leads, indent=2)
-        llm_input = f"{prompt}\n\nLeads:\n{leads_str}"
-        response = call_mistral(llm_input, max_tokens=100000, temperature=0.1)
-        print("llm response: \n", response)
-        return json.loads(response)
-    except Exception as e:
-        print(f"[❌] LLM analysis failed: {e}")
-        return leads
- 
\ No newline at end of file
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in as_completed([executor.submit(resolve, chunk) for chunk in chunks]):
+            try:
+                chunk, verdicts = future.result()
+                for i, verdict in zip(chunk, verdicts):
+                    answers[i] = bool(verdict)
+            except Exception as e:
+                print(f"[⚠️] LLM pair resolution failed for one batch: {e}")
+    return answers
+
+
+def analyze_and_detect_duplicates(leads: List[Dict]) -> List[Dict]:
+    """
+    Deduplicates leads with the local engine (normalized names, company domains,
+    fuzzy and embedding similarity); only the ambiguous pairs go to the LLM.
+    """
+    stats = {}
+    final_leads = deduplicate(leads, resolver=llm_resolve_pairs, stats=stats)
+    print(
+        f"[🧹] Dedup: {stats.get('input', 0)} -> {stats.get('output', 0)} leads "
+        f"({stats.get('ambiguous', 0)} ambiguous pairs, {stats.get('resolved_as_same', 0)} merged by LLM)"
+    )
+    return final_leads
@@ -0,0 +1,164 @@
+# detection/test/dedup_benchmark_test.py
+#
+# Benchmarks the local dedup engine on synthetic lead sets with known duplicates.
+#
+#   python Lead_Identification/detection/test/dedup_benchmark_test.py --leads 10000
+
+import sys
+import os
+import argparse
+import random
+import string
+import time
+from itertools import combinations
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from Lead_Identification.common.config import DEDUP_LLM_MAX_PAIRS
+from Lead_Identification.detection.dedup import deduplicate, normalize_company_name
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "vo", "zu", "ne", "pa", "si", "dor", "lin", "mar", "tek", "ven", "qua", "bri", "sol"]
+WORDS = ["alpha", "nova", "blue", "river", "summit", "atlas", "orbit", "cedar", "harbor", "pioneer"]
+SECTORS = ["data", "energy", "bank", "insurance", "logistics", "health", "motors", "telecom", "retail", "systems"]
+SUFFIXES = ["", " Inc.", " SA", " Group", " Ltd", " GmbH", " S.A.S.", " Holding"]
+
+
+def brand(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.choice([2, 3, 3])))
+
+
+def company_name(rng: random.Random) -> str:
+    # Invented brand, sometimes with a common word, plus a sector word shared by many companies.
+    words = [brand(rng)]
+    if rng.random() < 0.3:
+        words.insert(0, rng.choice(WORDS))
+    words.append(rng.choice(SECTORS))
+    return " ".join(word.capitalize() for word in words)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    if name[i] == " ":
+        return name
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def variant(name: str, rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.3:
+        return name + rng.choice(SUFFIXES[1:])
+    if kind < 0.5:
+        return name.upper()
+    if kind < 0.7:
+        return typo(name, rng)
+    if kind < 0.85:
+        return name.replace(" ", "-")
+    return f"The {name}"
+
+
+def synthetic_leads(count: int, duplicate_rate: float = 0.3, seed: int = 7):
+    """Returns (leads, true cluster id per lead)."""
+    rng = random.Random(seed)
+    leads, clusters, originals = [], [], []
+    names_used = set()
+    while len(leads) < count:
+        if originals and rng.random() < duplicate_rate:
+            cluster = rng.randrange(len(originals))
+            base = originals[cluster]
+            name = variant(base["company_name"], rng)
+            urls = [base["domain_url"]] if rng.random() < 0.5 else []
+        else:
+            name = company_name(rng)
+            if normalize_company_name(name) in names_used:
+                continue
+            names_used.add(normalize_company_name(name))
+            cluster = len(originals)
+            domain_url = f"https://www.{name.lower().replace(' ', '')}.com"
+            originals.append({"company_name": name, "domain_url": domain_url})
+            urls = [domain_url] if rng.random() < 0.7 else []
+        urls.append("https://www.linkedin.com/company/" + name.lower().replace(" ", "-"))
+        leads.append({
+            "company_name": name,
+            "summary": f"{name} summary",
+            "description": "",
+            "reason_for_match": "synthetic",
+            "key_personal": [{"name": f"Person {len(leads)}", "role": "CTO"}],
+            "relevant_urls": urls,
+        })
+        clusters.append(cluster)
+    return leads, clusters
+
+
+def pair_metrics(predicted, truth):
+    """Pairwise precision / recall of the predicted clustering."""
+    def pairs(labels):
+        groups = {}
+        for i, label in enumerate(labels):
+            groups.setdefault(label, []).append(i)
+        return {pair for members in groups.values() for pair in combinations(members, 2)}
+
+    predicted_pairs, true_pairs = pairs(predicted), pairs(truth)
+    true_positives = len(predicted_pairs & true_pairs)
+    precision = true_positives / len(predicted_pairs) if predicted_pairs else 1.0
+    recall = true_positives / len(true_pairs) if true_pairs else 1.0
+    return precision, recall
+
+
+def lead_index(company):
+    return int(company["key_personal"][0]["name"].split()[-1])
+
+
+def run_once(leads, truth, resolver=None):
+    stats = {}
+    start = time.perf_counter()
+    merged = deduplicate(leads, resolver=resolver, stats=stats)
+    elapsed = time.perf_counter() - start
+
+    # Every input lead's person ends up in exactly one merged company.
+    predicted = [None] * len(leads)
+    for cluster, company in enumerate(merged):
+        for person in company["key_personal"]:
+            predicted[int(person["name"].split()[-1])] = cluster
+
+    precision, recall = pair_metrics(predicted, truth)
+    return merged, stats, elapsed, precision, recall
+
+
+def run(count: int):
+    leads, truth = synthetic_leads(count)
+
+    def oracle(pairs):
+        # Stands in for the LLM: answers ambiguous pairs from the ground truth.
+        return [truth[lead_index(a)] == truth[lead_index(b)] for a, b in pairs]
+
+    def budgeted_oracle(pairs):
+        # Like llm_resolve_pairs: only the first DEDUP_LLM_MAX_PAIRS (most similar) pairs are answered.
+        answers = oracle(pairs[:DEDUP_LLM_MAX_PAIRS])
+        return answers + [False] * (len(pairs) - len(answers))
+
+    results = {}
+    for label, resolver in (("local only", None), ("local + resolver", oracle),
+                            (f"local + resolver ({DEDUP_LLM_MAX_PAIRS} pairs)", budgeted_oracle)):
+        merged, stats, elapsed, precision, recall = run_once(leads, truth, resolver)
+        print(f"[{label}] {count} leads -> {len(merged)} companies (truth: {len(set(truth))}) in {elapsed:.2f}s")
+        print(f"  comparisons={stats['comparisons']} ambiguous pairs sent to resolver={stats['ambiguous'] if resolver else 0}")
+        print(f"  pairwise precision={precision:.3f} recall={recall:.3f}")
+        results[label] = (elapsed, precision, recall, stats)
+    return results
+
+
+def test_dedup_benchmark_small():
+    results = run(1000)
+    _, precision, recall, _ = results["local only"]
+    assert precision > 0.98
+    _, precision, recall, stats = results["local + resolver"]
+    assert precision > 0.98 and recall > 0.95
+    # Only a small fraction of leads ever needs the LLM.
+    assert stats["ambiguous"] < 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leads", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.leads)
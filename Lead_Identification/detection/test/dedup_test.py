@@ -0,0 +1,57 @@
+# detection/test/dedup_test.py
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from Lead_Identification.detection.dedup import IncrementalDeduplicator, deduplicate
+
+
+def lead(name, *urls):
+    return {"company_name": name, "summary": "", "key_personal": [], "relevant_urls": list(urls)}
+
+
+def test_shared_article_host_is_only_a_candidate():
+    leads = [
+        lead("Acme Bank", "https://www.lesechos.fr/finance/acme-bank-ia-2024"),
+        lead("Orange", "https://www.orange.com", "https://aws.amazon.com/partners/orange"),
+        lead("Zeta Insurance", "https://www.lesechos.fr/finance/zeta-assurance-cloud"),
+        lead("BNP Paribas", "https://aws.amazon.com/solutions/case-studies/bnp-paribas"),
+    ]
+    asked = []
+
+    def resolver(pairs):
+        asked.extend((a["company_name"], b["company_name"]) for a, b in pairs)
+        return [False] * len(pairs)
+
+    assert [c["company_name"] for c in deduplicate(leads)] == ["Acme Bank", "Orange", "Zeta Insurance", "BNP Paribas"]
+    assert len(deduplicate(leads, resolver=resolver)) == 4
+    assert set(asked) == {("Acme Bank", "Zeta Insurance"), ("Orange", "BNP Paribas")}
+
+
+def test_identity_domain_merges():
+    leads = [
+        lead("Talan Consulting", "https://www.talan.com/fr"),
+        lead("Talan Tunisie", "https://talan.com"),
+        lead("Sopra Steria", "https://www.soprasteria.com"),
+        lead("Groupe Sopra-Steria", "https://soprasteria.com/careers"),
+    ]
+    companies = deduplicate(leads)
+    assert [c["company_name"] for c in companies] == ["Talan Consulting", "Sopra Steria"]
+    assert companies[0]["relevant_urls"] == ["https://www.talan.com/fr", "https://talan.com"]
+
+
+def test_streaming_holds_shared_domain_hits_for_the_resolver():
+    deduplicator = IncrementalDeduplicator()
+    assert deduplicator.add(lead("Acme Bank", "https://www.lesechos.fr/finance/acme-bank-ia-2024"))
+    assert deduplicator.add(lead("Zeta Insurance", "https://www.lesechos.fr/finance/zeta-assurance-cloud")) is None
+    assert deduplicator.add(lead("Acme Banque", "https://www.lesechos.fr/finance/acme-bank-ia-2024")) is None
+    assert deduplicator.held() == 2
+
+    def resolver(pairs):
+        return [b["company_name"] == "Acme Banque" for a, b in pairs]
+
+    assert [c["company_name"] for c in deduplicator.resolve_held(resolver)] == ["Zeta Insurance"]
+    assert [c["company_name"] for c in deduplicator.companies()] == ["Acme Bank", "Zeta Insurance"]
+    assert deduplicator.held() == 0
@@ -0,0 +1,138 @@
+# detection/test/json_parsing_benchmark.py
+#
+# Compares the shared JSON extraction engine with the ad-hoc strategies the
+# agents used before (find/rfind, greedy regex, non-greedy regex) on a corpus
+# of tricky LLM responses: success rate and parse time.
+#
+#   python Lead_Identification/detection/test/json_parsing_benchmark.py
+#   python Lead_Identification/detection/test/json_parsing_benchmark.py --corpus .cache/llm_capture
+#
+# --corpus reads the *.jsonl files written when LLM_CAPTURE_DIR is set; captured
+# responses have no ground truth, so success there means "some JSON value came out".
+
+import sys
+import os
+import argparse
+import glob
+import json
+import re
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from Lead_Identification.common.json_parsing import JSONParseError, extract_json
+
+SCORE = {"score": 72, "justification": "Strong fit on sector and size."}
+VERDICTS = [True, False, True]
+
+# (label, response, expected value)
+BUILTIN_CORPUS = [
+    ("plain object", json.dumps(SCORE), SCORE),
+    ("fenced object", "```json\n" + json.dumps(SCORE, indent=2) + "\n```", SCORE),
+    ("prose around", "Here is the result:\n" + json.dumps(SCORE) + "\nLet me know if you need more.", SCORE),
+    ("braces in prose after", json.dumps(SCORE) + "\nNote: scores use the {0-100} scale.", SCORE),
+    ("braces in string", '{"score": 72, "justification": "Uses {templates} and [lists]"}',
+     {"score": 72, "justification": "Uses {templates} and [lists]"}),
+    ("code block before json", "Call:\n```bash\ncurl https://api/{lead_id}\n```\nResult:\n```json\n" + json.dumps(SCORE) + "\n```", SCORE),
+    ("trailing comma", '{"score": 72, "justification": "Strong fit on sector and size.",}', SCORE),
+    ("single quotes", "{'score': 72, 'justification': 'Strong fit on sector and size.'}", SCORE),
+    ("python literals", '{"growth": True, "budget": None, "score": 72}', {"growth": True, "budget": None, "score": 72}),
+    ("smart quotes", "{“score”: 72, “justification”: “Strong fit on sector and size.”}", SCORE),
+    ("comments", '{\n  "score": 72, // out of 100\n  "justification": "Strong fit on sector and size."\n}', SCORE),
+    ("unquoted keys", '{score: 72, justification: "Strong fit on sector and size."}', SCORE),
+    ("raw newline in string", '{"score": 72, "justification": "Strong fit\non sector and size."}',
+     {"score": 72, "justification": "Strong fit\non sector and size."}),
+    ("truncated object", '{"score": 72, "justification": "Strong fit on sector', {"score": 72, "justification": "Strong fit on sector"}),
+    ("plain array", json.dumps(VERDICTS), VERDICTS),
+    ("array in prose", "The verdicts are " + json.dumps(VERDICTS) + " for the three pairs.", VERDICTS),
+    ("array with index prose", "Pairs [1], [2] and [3]:\n" + json.dumps(VERDICTS), VERDICTS),
+    ("truncated array", '[{"name": "Acme"}, {"name": "Glo', [{"name": "Acme"}, {"name": "Glo"}]),
+]
+
+
+def legacy_find(text):
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        start, end = text.find("["), text.rfind("]")
+    return json.loads(text[start:end + 1])
+
+
+def legacy_greedy(text):
+    match = re.search(r"[{\[].*[}\]]", text, re.DOTALL)
+    return json.loads(match.group(0))
+
+
+def legacy_non_greedy(text):
+    match = re.search(r"\{.*?\}|\[.*?\]", text, re.DOTALL)
+    return json.loads(match.group(0))
+
+
+def shared_engine(text):
+    return extract_json(text)
+
+
+STRATEGIES = [
+    ("find/rfind", legacy_find),
+    ("greedy regex", legacy_greedy),
+    ("non-greedy regex", legacy_non_greedy),
+    ("extract_json", shared_engine),
+]
+
+
+def load_captured(corpus_dir):
+    """Captured responses as (label, response, None): no expected value."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.jsonl"))):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                record = json.loads(line)
+                cases.append((f"{os.path.basename(path)}:{line_number}", record["response"], None))
+    return cases
+
+
+def run_strategy(parse, cases, repeat=20):
+    ok = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ok = 0
+        for _, text, expected in cases:
+            try:
+                value = parse(text)
+            except (JSONParseError, ValueError, AttributeError, TypeError):
+                continue
+            if expected is None or value == expected:
+                ok += 1
+    elapsed = (time.perf_counter() - start) / (repeat * max(1, len(cases)))
+    return ok, elapsed
+
+
+def run(cases, verbose=True):
+    results = {}
+    for name, parse in STRATEGIES:
+        ok, elapsed = run_strategy(parse, cases)
+        results[name] = (ok, elapsed)
+        if verbose:
+            print(f"[{name}] {ok}/{len(cases)} parsed correctly, {elapsed * 1e6:.1f} µs/response")
+    return results
+
+
+def test_json_parsing_benchmark_builtin():
+    results = run(BUILTIN_CORPUS, verbose=False)
+    ok, _ = results["extract_json"]
+    assert ok == len(BUILTIN_CORPUS)
+    # Every legacy strategy fails on part of the corpus.
+    for name in ("find/rfind", "greedy regex", "non-greedy regex"):
+        assert results[name][0] < ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="directory of LLM_CAPTURE_DIR *.jsonl files")
+    args = parser.parse_args()
+
+    print(f"===== built-in corpus ({len(BUILTIN_CORPUS)} responses) =====")
+    run(BUILTIN_CORPUS)
+    if args.corpus:
+        captured = load_captured(args.corpus)
+        print(f"\n===== captured corpus ({len(captured)} responses) =====")
+        run(captured)
@@ -0,0 +1,94 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Identification.common.search_cache import CachedTavilyClient, normalize_query, search_cache_key
+
+
+class FakeTavily:
+    def __init__(self):
+        self.queries = []
+        self._lock = threading.Lock()
+
+    def search(self, query, search_depth="basic", max_results=5, **options):
+        with self._lock:
+            self.queries.append((query, search_depth, max_results))
+        return {"query": query, "results": [{"url": "https://example.com", "content": query}]}
+
+
+def test_normalize_query():
+    assert normalize_query('  Top  “Fintech”\n companies ') == 'top "fintech" companies'
+    assert normalize_query("Acme’s CTO") == "acme's cto"
+
+
+def test_key_depends_on_depth_and_max_results():
+    base = search_cache_key("acme cto", "basic", 5)
+    assert base == search_cache_key("  ACME   cto", "basic", 5)
+    assert base != search_cache_key("acme cto", "advanced", 5)
+    assert base != search_cache_key("acme cto", "basic", 3)
+
+
+def test_cached_search(tmp_path):
+    fake = FakeTavily()
+    client = CachedTavilyClient(fake, DiskCache(str(tmp_path / "search.sqlite3"), ttl=60), rate=0)
+
+    first = client.search(query="Market report for Fintech", search_depth="basic", max_results=5)
+    again = client.search(query="  market  report for FINTECH ", max_results=5)
+    assert again == first
+    assert len(fake.queries) == 1
+
+    client.search(query="Market report for Fintech", search_depth="advanced", max_results=5)
+    assert len(fake.queries) == 2
+    assert client.stats()["paid_calls"] == 2
+
+
+def test_concurrent_misses_share_one_call(tmp_path):
+    fake = FakeTavily()
+    client = CachedTavilyClient(fake, DiskCache(str(tmp_path / "search.sqlite3")), rate=0)
+
+    threads = [threading.Thread(target=client.search, kwargs={"query": "acme cto"}) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(fake.queries) == 1
+
+
+class SlowEmptyTavily(FakeTavily):
+    """Answers without results (never cached) and records how many calls overlap."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    def search(self, query, search_depth="basic", max_results=5, **options):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.1)
+        with self._lock:
+            self.active -= 1
+            self.queries.append((query, search_depth, max_results))
+        return {"query": query, "results": []}
+
+
+def test_uncached_misses_never_overlap(tmp_path):
+    fake = SlowEmptyTavily()
+    client = CachedTavilyClient(fake, DiskCache(str(tmp_path / "search.sqlite3")), rate=0)
+
+    # The third caller arrives while the second, which waited for the first, is calling.
+    threads = []
+    for delay in (0, 0.03, 0.14):
+        time.sleep(delay)
+        threads.append(threading.Thread(target=client.search, kwargs={"query": "acme cto"}))
+        threads[-1].start()
+    for thread in threads:
+        thread.join()
+    assert len(fake.queries) == 3
+    assert fake.max_active == 1
+    assert not client._inflight
@@ -0,0 +1,161 @@
+import hashlib
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import cloudinary.uploader
+from cloudinary import exceptions as cloudinary_exceptions
+
+from Lead_Identification.common.config import (
+    UPLOAD_BACKOFF_BASE,
+    UPLOAD_BACKOFF_MAX,
+    UPLOAD_MANIFEST_PATH,
+    UPLOAD_MAX_RETRIES,
+    UPLOAD_MAX_WORKERS,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+
+# Client-side errors: retrying the same request cannot succeed.
+PERMANENT_ERRORS = (
+    cloudinary_exceptions.BadRequest,
+    cloudinary_exceptions.AuthorizationRequired,
+    cloudinary_exceptions.NotAllowed,
+    cloudinary_exceptions.NotFound,
+    cloudinary_exceptions.AlreadyExists,
+)
+
+
+class CloudinaryUploader:
+    """
+    Upload engine for in-memory documents.
+
+    Uploads run on a bounded thread pool and stream their body from memory.
+    Transient failures (5xx, rate limiting, socket errors) are retried with
+    exponential backoff and jitter. Each upload's content hash is recorded in a
+    manifest, so re-uploading identical content is skipped and the stored URL
+    is returned instead.
+    """
+
+    def __init__(
+        self,
+        credentials: Dict[str, str],
+        folder: Optional[str] = None,
+        resource_type: str = "raw",
+        max_workers: int = UPLOAD_MAX_WORKERS,
+        max_retries: int = UPLOAD_MAX_RETRIES,
+        backoff_base: float = UPLOAD_BACKOFF_BASE,
+        backoff_max: float = UPLOAD_BACKOFF_MAX,
+        manifest: Optional[DiskCache] = None,
+    ):
+        self.credentials = dict(credentials)
+        self.folder = folder
+        self.resource_type = resource_type
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.manifest = manifest
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cloudinary-upload")
+        self._lock = threading.Lock()
+        self._metrics = {"uploaded": 0, "skipped": 0, "retries": 0, "failed": 0}
+
+    def _metric(self, key: str):
+        with self._lock:
+            self._metrics[key] += 1
+
+    def _manifest_key(self, name: str) -> str:
+        return f"{self.credentials.get('cloud_name')}/{self.resource_type}/{self.folder or ''}/{name}"
+
+    def _upload_once(self, name: str, content: bytes) -> str:
+        options = {
+            "public_id": name,
+            "resource_type": self.resource_type,
+            "overwrite": True,
+            **self.credentials,
+        }
+        if self.folder:
+            options["folder"] = self.folder
+        response = cloudinary.uploader.upload(io.BytesIO(content), **options)
+        return response["secure_url"]
+
+    def upload(self, name: str, content: bytes) -> str:
+        """Uploads one document in the calling thread and returns its URL."""
+        content_hash = hashlib.sha256(content).hexdigest()
+        if self.manifest is not None:
+            previous = self.manifest.get_json(self._manifest_key(name))
+            if previous and previous.get("sha256") == content_hash:
+                print(f"= Unchanged, skipping upload of {name}")
+                self._metric("skipped")
+                return previous["url"]
+
+        attempt = 0
+        while True:
+            try:
+                print(f"Uploading {name}...")
+                url = self._upload_once(name, content)
+                break
+            except PERMANENT_ERRORS:
+                self._metric("failed")
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self._metric("failed")
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                print(f"⚠ Upload of {name} failed ({e}), retrying in {delay:.1f}s")
+                self._metric("retries")
+                attempt += 1
+                time.sleep(delay)
+
+        if self.manifest is not None:
+            self.manifest.set_json(self._manifest_key(name), {"sha256": content_hash, "url": url})
+        self._metric("uploaded")
+        print(f"✓ Successfully uploaded {name}")
+        return url
+
+    def submit(self, name: str, content: bytes):
+        """Queues an upload on the pool and returns its future."""
+        return self._executor.submit(self.upload, name, content)
+
+    def upload_many(self, documents: Dict[str, bytes]) -> Dict[str, str]:
+        """
+        Uploads every document concurrently. Returns {name: url} for the ones
+        that succeeded; failures are reported and left out.
+        """
+        futures = {name: self.submit(name, content) for name, content in documents.items()}
+        urls = {}
+        for name, future in futures.items():
+            try:
+                urls[name] = future.result()
+            except Exception as e:
+                print(f"✗ Failed to upload {name}: {e}")
+        return urls
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._metrics)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+_uploaders: Dict[tuple, CloudinaryUploader] = {}
+_uploaders_lock = threading.Lock()
+
+
+def get_uploader(
+    credentials: Dict[str, str], folder: Optional[str] = None, resource_type: str = "raw"
+) -> CloudinaryUploader:
+    """Returns the process-wide uploader for this account, folder and resource type."""
+    key = (credentials.get("cloud_name"), folder, resource_type)
+    with _uploaders_lock:
+        uploader = _uploaders.get(key)
+        if uploader is None:
+            manifest = DiskCache(UPLOAD_MANIFEST_PATH, table="cloudinary_uploads")
+            uploader = CloudinaryUploader(credentials, folder=folder, resource_type=resource_type, manifest=manifest)
+            _uploaders[key] = uploader
+        return uploader
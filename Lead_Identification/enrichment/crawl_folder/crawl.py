@@ -3,11 +3,13 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 import asyncio
-from crawl4ai import CrawlerRunConfig, AsyncWebCrawler
+from crawl4ai import CrawlerRunConfig
 from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
 from crawl4ai.deep_crawling import BFSDeepCrawlStrategy
 import re
 import google.generativeai as genai
+from Lead_Identification.common.crawler_pool import get_crawler_pool
+from Lead_Identification.common.crawl_cache import lookup_crawl, store_crawl
 
 
 
@@ -19,27 +21,51 @@ def clean_text(raw_text: str) -> str:
 def is_noise_line(line: str) -> bool:
     return bool(re.search(r"\[.*?\]", line.strip()))
 
-async def async_crawl_and_clean(url: str) -> str:
-    config = CrawlerRunConfig(
+# Cache namespace: pages crawled with different depths or cleaning are stored
+# separately. Detection's deeper crawl is not reused: the report would then
+# depend on which stage crawled the site first.
+CRAWL_PROFILE = "enrichment"
+
+def crawl_config() -> CrawlerRunConfig:
+    return CrawlerRunConfig(
         deep_crawl_strategy=BFSDeepCrawlStrategy(max_depth=1, max_pages=1, include_external=False),
         scraping_strategy=LXMLWebScrapingStrategy(),
         verbose=False,
     )
 
+def clean_results(results) -> str:
     cleaned_texts = []
+    for result in results:
+        raw = result.markdown or ""
+        cleaned = clean_text(raw)
+        cleaned_texts.append(cleaned)
+    return "\n\n".join(cleaned_texts)
+
+async def async_crawl_and_clean(url: str) -> str:
+    cached = await asyncio.to_thread(lookup_crawl, url, CRAWL_PROFILE)
+    if cached is not None:
+        return cached
     try:
-        async with AsyncWebCrawler() as crawler:
-            results = await crawler.arun(url=url, config=config)
-            for result in results:
-                raw = result.markdown or ""
-                cleaned = clean_text(raw)
-                cleaned_texts.append(cleaned)
+        results = await get_crawler_pool().acrawl(url, crawl_config())
+        content = clean_results(results)
     except Exception as e:
         print(f"❌ Crawling failed for {url}: {e}")
-    return "\n\n".join(cleaned_texts)
+        return ""
+    await asyncio.to_thread(store_crawl, url, CRAWL_PROFILE, content, results)
+    return content
 
 def crawl_and_clean(url: str) -> str:
-    return asyncio.run(async_crawl_and_clean(url))
+    cached = lookup_crawl(url, CRAWL_PROFILE)
+    if cached is not None:
+        return cached
+    try:
+        results = get_crawler_pool().crawl(url, crawl_config())
+        content = clean_results(results)
+    except Exception as e:
+        print(f"❌ Crawling failed for {url}: {e}")
+        return ""
+    store_crawl(url, CRAWL_PROFILE, content, results)
+    return content
 
 
 def summarize_with_gemini(text: str, api_key: str) -> str:
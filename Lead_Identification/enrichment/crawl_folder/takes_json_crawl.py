@@ -11,6 +11,26 @@ def sanitize_filename(name: str) -> str:
 
 ###################
 
+def write_company_crawl(company: dict, api_key: str, report):
+    """
+    Crawls every relevant URL of one company and writes the summaries
+    into its report (any writable text stream).
+    """
+    company_name = sanitize_filename(company["company_name"])
+    report.write(f"Company: {company_name}\n\n")
+
+    if company.get("relevant_urls"):
+        for url in company["relevant_urls"]:
+            try:
+                content = run_crawl_pipeline(url,api_key)
+                report.write(f"URL: {url}\n")
+                report.write(f"Content:\n{content}\n\n")
+            except Exception as e:
+                report.write(f"URL: {url}\nFailed to crawl: {e}\n\n")
+    else:
+        report.write("No relevant URLs provided.\n")
+
+
 def crawl_company_data(companies: list, api_key: str):
     """
     For each company in the list, crawl all relevant URLs
@@ -18,7 +38,7 @@ def crawl_company_data(companies: list, api_key: str):
     
     Parameters:
     - companies: list of company dictionaries.
-    - crawl_url_func: function that takes a URL and returns crawled text.
+    - api_key: Gemini API key used to summarize the crawled pages.
     """
     output_dir = "crawled_data"
     os.makedirs(output_dir, exist_ok=True)
@@ -28,18 +48,7 @@ def crawl_company_data(companies: list, api_key: str):
         file_path = os.path.join(output_dir, f"{company_name}.txt")
 
         with open(file_path, "a", encoding="utf-8") as file:
-            file.write(f"Company: {company_name}\n\n")
-
-            if company["relevant_urls"]:
-                for url in company["relevant_urls"]:
-                    try:
-                        content = run_crawl_pipeline(url,api_key)
-                        file.write(f"URL: {url}\n")
-                        file.write(f"Content:\n{content}\n\n")
-                    except Exception as e:
-                        file.write(f"URL: {url}\nFailed to crawl: {e}\n\n")
-            else:
-                file.write("No relevant URLs provided.\n")
+            write_company_crawl(company, api_key, file)
 
 ###################
 
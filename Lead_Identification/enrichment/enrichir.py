@@ -3,13 +3,18 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 import os
-from Lead_Identification.enrichment.savetocloud import saveContentToCloudinary
-from Lead_Identification.enrichment.json_putter import save_company_jsons
-from Lead_Identification.enrichment.crawl_folder.takes_json_crawl import crawl_company_data
-from Lead_Identification.enrichment.youtube_folder.takes_json_yt import append_youtube_results
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Tuple
+from Lead_Identification.enrichment.savetocloud import uploadReportToCloudinary
+from Lead_Identification.enrichment.report_builder import CompanyReport
+from Lead_Identification.enrichment.json_putter import write_company_json
+from Lead_Identification.enrichment.crawl_folder.takes_json_crawl import write_company_crawl
+from Lead_Identification.enrichment.youtube_folder.takes_json_yt import write_youtube_results
 from dotenv import load_dotenv
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# Number of companies enriched at the same time.
+ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "4"))
 
 # companies=[
 #   {
@@ -56,10 +61,52 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 
 
-def enrich(companies):
-    save_company_jsons(companies)
-    crawl_company_data(companies,GEMINI_API_KEY)
-    append_youtube_results(companies,GEMINI_API_KEY)
-    urls = saveContentToCloudinary()
-    
+def enrich_company(company: Dict) -> Dict[str, str]:
+    """
+    Enriches a single company: detection JSON -> crawl -> YouTube -> upload.
+    The report is built in memory and streamed to Cloudinary.
+    Returns {report_file_name: cloudinary_url}.
+    """
+    report = CompanyReport(company["company_name"])
+    write_company_json(company, report)
+    write_company_crawl(company, GEMINI_API_KEY, report)
+    write_youtube_results(company, GEMINI_API_KEY, report)
+    return uploadReportToCloudinary(report)
+
+
+def enrich(companies, max_workers: int = ENRICH_MAX_WORKERS):
+    """
+    Enriches every company on a bounded worker pool. A failing company is
+    reported and skipped without affecting the others.
+    """
+    if not companies:
+        return {}
+    _, urls = enrich_stream(companies, max_workers)
     return urls
+
+
+def enrich_stream(companies: Iterable[Dict], max_workers: int = ENRICH_MAX_WORKERS) -> Tuple[List[Dict], Dict[str, str]]:
+    """
+    Enriches companies as they arrive from a (streaming) iterable, so the
+    first enrichments overlap with detection still running.
+    Returns (companies consumed, {report_file_name: url}).
+    """
+    consumed = []
+    urls = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for company in companies:
+            consumed.append(company)
+            futures[executor.submit(enrich_company, company)] = company
+            print(f"[⚙️] Enrichment queued for {company.get('company_name')}")
+
+        total = len(futures)
+        for done, future in enumerate(as_completed(futures), start=1):
+            company_name = futures[future].get("company_name")
+            try:
+                urls.update(future.result())
+                print(f"[✅] [{done}/{total}] Enriched {company_name}")
+            except Exception as e:
+                print(f"[❌] [{done}/{total}] Enrichment failed for {company_name}: {e}")
+
+    return consumed, urls
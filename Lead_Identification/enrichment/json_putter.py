@@ -7,21 +7,23 @@ def sanitize_filename(name: str) -> str:
     """Sanitize filename to remove unsafe characters."""
     return re.sub(r'[\\/*?:"<>|]', "_", name)
 
+def write_company_json(company, report):
+    """Writes one company's detection JSON into its report (any writable text stream)."""
+    print("company name", company.get("company_name"))
+    report.write(json.dumps(company, indent=2, ensure_ascii=False))
+    report.write("\n\n")  # Add space between entries
+
 def save_company_jsons(companies, output_dir = "crawled_data"):
     os.makedirs(output_dir, exist_ok=True)
     print(" type of companies", type(companies))
 
     for company in companies:
-        print("company", company)
-        print("type of company", type(company))
-        print("company name", company.get("company_name"))
         company_name = sanitize_filename(company["company_name"])
         file_path = os.path.join(output_dir, f"{company_name}.txt")
 
         # Open in append mode only if file exists, else create
         with open(file_path, "a", encoding="utf-8") as file:
-            file.write(json.dumps(company, indent=2, ensure_ascii=False))
-            file.write("\n\n")  # Add space between entries
+            write_company_json(company, file)
 
 
 
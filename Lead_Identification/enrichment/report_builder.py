@@ -0,0 +1,30 @@
+import io
+import threading
+
+from Lead_Identification.enrichment.json_putter import sanitize_filename
+
+
+class CompanyReport:
+    """
+    In-memory enrichment report for one company.
+
+    The JSON, crawl and YouTube stages write into it like a text file and the
+    uploader reads it back from memory, so a run never touches a shared folder.
+    """
+
+    def __init__(self, company_name: str):
+        self.company_name = company_name
+        self.file_name = f"{sanitize_filename(company_name)}.txt"
+        self._buffer = io.StringIO()
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            return self._buffer.write(text)
+
+    def getvalue(self) -> str:
+        with self._lock:
+            return self._buffer.getvalue()
+
+    def to_bytes(self) -> bytes:
+        return self.getvalue().encode("utf-8")
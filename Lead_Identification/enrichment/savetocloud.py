@@ -1,8 +1,8 @@
 import os
-import cloudinary
-import cloudinary.uploader
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+from Lead_Identification.enrichment.cloud_uploader import CloudinaryUploader, get_uploader
 
 
 def delete_all_files_in_folder(folder_path):
@@ -54,13 +54,6 @@ def upload_txt_files_to_cloudinary(
         Exception: If Cloudinary configuration or upload fails
     """
     
-    # Configure Cloudinary
-    cloudinary.config(
-        cloud_name=cloud_name,
-        api_key=api_key,
-        api_secret=api_secret
-    )
-    
     # Validate folder path
     folder = Path(folder_path)
     if not folder.exists():
@@ -78,39 +71,18 @@ def upload_txt_files_to_cloudinary(
     
     print(f"Found {len(txt_files)} .txt files to upload...")
     
-    uploaded_urls = {}
-    failed_uploads = []
-    
-    for txt_file in txt_files:
-        try:
-            # Prepare upload options
-            upload_options = {
-                "resource_type": resource_type,
-                "use_filename": True,
-                "unique_filename": False,
-                "overwrite": True
-            }
-            
-            # Add folder if specified
-            if folder_name:
-                upload_options["folder"] = folder_name
-            
-            # Upload file
-            print(f"Uploading {txt_file.name}...")
-            response = cloudinary.uploader.upload(
-                str(txt_file),
-                **upload_options
-            )
-            
-            # Store the URL
-            uploaded_urls[txt_file.name] = response["secure_url"]
-            print(f"✓ Successfully uploaded {txt_file.name}")
-            
-        except Exception as e:
-            error_msg = f"Failed to upload {txt_file.name}: {str(e)}"
-            print(f"✗ {error_msg}")
-            failed_uploads.append(error_msg)
-    
+    uploader = CloudinaryUploader(
+        {"cloud_name": cloud_name, "api_key": api_key, "api_secret": api_secret},
+        folder=folder_name,
+        resource_type=resource_type,
+    )
+    try:
+        documents = {txt_file.name: txt_file.read_bytes() for txt_file in txt_files}
+        uploaded_urls = uploader.upload_many(documents)
+    finally:
+        uploader.close()
+    failed_uploads = [name for name in documents if name not in uploaded_urls]
+
     # Summary
     print(f"\nUpload Summary:")
     print(f"Successful uploads: {len(uploaded_urls)}")
@@ -118,8 +90,8 @@ def upload_txt_files_to_cloudinary(
     
     if failed_uploads:
         print("\nFailed uploads:")
-        for error in failed_uploads:
-            print(f"  - {error}")
+        for name in failed_uploads:
+            print(f"  - {name}")
     
     return uploaded_urls
 
@@ -128,6 +100,25 @@ def upload_txt_files_to_cloudinary(
 
 
 
+CLOUDINARY_CREDENTIALS = {
+    "cloud_name": "daop9owk3",
+    "api_key": "663575178492181",
+    "api_secret": "PKtRhurQxgzUgMT8vnMKnKDtQdA",
+}
+CLOUDINARY_FOLDER = "documents"
+
+
+def uploadReportToCloudinary(report, resource_type: str = "raw") -> Dict[str, str]:
+    """
+    Streams an in-memory CompanyReport to Cloudinary and returns {file_name: url}.
+    Nothing is written to disk; unchanged reports are not re-uploaded.
+    """
+    # Goes through the shared pool, so uploads stay bounded however many companies run.
+    uploader = get_uploader(CLOUDINARY_CREDENTIALS, CLOUDINARY_FOLDER, resource_type)
+    url = uploader.submit(report.file_name, report.to_bytes()).result()
+    return {report.file_name: url}
+
+
 # Example usage
 def saveContentToCloudinary():
     # Method 1: Direct credentials
@@ -135,10 +126,8 @@ def saveContentToCloudinary():
         input_dir = "crawled_data"
         urls = upload_txt_files_to_cloudinary(
             folder_path=Path(input_dir).resolve(),
-            cloud_name="daop9owk3",
-            api_key="663575178492181", 
-            api_secret="PKtRhurQxgzUgMT8vnMKnKDtQdA",
-            folder_name="documents"  # Optional: organize in a folder
+            folder_name=CLOUDINARY_FOLDER,  # Optional: organize in a folder
+            **CLOUDINARY_CREDENTIALS
         )
         
         print("\nUploaded URLs:")
@@ -0,0 +1,74 @@
+# enrichment/test/firestore_upload_test.py
+#
+# Runs against the Firestore emulator:
+#   gcloud emulators firestore start --host-port=localhost:8080
+#   FIRESTORE_EMULATOR_HOST=localhost:8080 python -m pytest Lead_Identification/enrichment/test/firestore_upload_test.py
+
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+import pytest
+
+if not os.getenv("FIRESTORE_EMULATOR_HOST"):
+    pytest.skip("FIRESTORE_EMULATOR_HOST is not set", allow_module_level=True)
+
+from Lead_Identification.enrichment.upload_to_firestore import (
+    get_leads_db,
+    lead_document_id,
+    upload_leads_to_firestore,
+)
+
+SERVICE_ID = "emulator-test-service"
+
+
+def make_leads(count):
+    return [
+        {
+            "company_name": f"Company {i}",
+            "key_personal": [{"name": f"Person {i}", "role": "CTO"}],
+        }
+        for i in range(count)
+    ]
+
+
+def service_leads(db):
+    return list(db.collection("Leads").where("service_id", "==", SERVICE_ID).stream())
+
+
+def clear_service(db):
+    for doc in service_leads(db):
+        doc.reference.delete()
+
+
+def test_chunks_large_uploads():
+    db = get_leads_db()
+    clear_service(db)
+    leads = make_leads(1200)
+    urls = {f"Company {i}.txt": f"https://example.com/{i}.txt" for i in range(1200)}
+
+    summary = upload_leads_to_firestore(leads, urls, SERVICE_ID, db=db)
+
+    assert summary["written"] == 1200
+    assert summary["batches"] == 3
+    assert len(service_leads(db)) == 1200
+    doc = db.collection("Leads").document(lead_document_id(SERVICE_ID, "Company 7")).get()
+    assert doc.to_dict()["report_url"] == "https://example.com/7.txt"
+
+
+def test_reruns_are_idempotent():
+    db = get_leads_db()
+    clear_service(db)
+    leads = make_leads(3) + [{"company_name": "  company   1 ", "key_personal": []}]
+
+    first = upload_leads_to_firestore(leads, {}, SERVICE_ID, db=db)
+    assert first["duplicates"] == 1
+
+    # Qualification output must survive a re-run of identification.
+    ref = db.collection("Leads").document(lead_document_id(SERVICE_ID, "Company 0"))
+    ref.update({"qualification_url": "https://example.com/q.json"})
+    upload_leads_to_firestore(leads, {}, SERVICE_ID, db=db)
+
+    assert len(service_leads(db)) == 3
+    assert ref.get().to_dict()["qualification_url"] == "https://example.com/q.json"
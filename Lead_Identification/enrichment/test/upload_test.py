@@ -0,0 +1,147 @@
+# enrichment/test/upload_test.py
+#
+# Exercises the Cloudinary upload engine against a local stand-in server,
+# so no real account or network access is needed.
+
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
+
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Identification.enrichment.cloud_uploader import CloudinaryUploader
+
+
+class FakeCloudinary(BaseHTTPRequestHandler):
+    """Answers Cloudinary upload calls; `fail_next` responses are 503s."""
+
+    requests_seen = []
+    fail_next = 0
+    status_override = None
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            FakeCloudinary.requests_seen.append(self.path)
+            if FakeCloudinary.status_override:
+                status, body = FakeCloudinary.status_override, {"error": {"message": "rejected"}}
+            elif FakeCloudinary.fail_next > 0:
+                FakeCloudinary.fail_next -= 1
+                status, body = 503, {"error": {"message": "unavailable"}}
+            else:
+                n = len(FakeCloudinary.requests_seen)
+                status, body = 200, {"secure_url": f"https://fake.local/raw/upload/{n}.txt"}
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCloudinary)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset_server():
+    FakeCloudinary.requests_seen = []
+    FakeCloudinary.fail_next = 0
+    FakeCloudinary.status_override = None
+
+
+def make_uploader(server, manifest=None):
+    credentials = {
+        "cloud_name": "demo",
+        "api_key": "key",
+        "api_secret": "secret",
+        "upload_prefix": f"http://127.0.0.1:{server.server_address[1]}",
+    }
+    return CloudinaryUploader(credentials, folder="documents", max_workers=4, backoff_base=0.01, manifest=manifest)
+
+
+def test_concurrent_upload_many():
+    server = start_server()
+    reset_server()
+    uploader = make_uploader(server)
+    try:
+        documents = {f"company_{i}.txt": f"report {i}".encode("utf-8") for i in range(10)}
+        urls = uploader.upload_many(documents)
+        assert set(urls) == set(documents)
+        assert len(FakeCloudinary.requests_seen) == 10
+        assert all(path.endswith("/v1_1/demo/raw/upload") for path in FakeCloudinary.requests_seen)
+    finally:
+        uploader.close()
+        server.shutdown()
+
+
+def test_retries_transient_failures():
+    server = start_server()
+    reset_server()
+    FakeCloudinary.fail_next = 2
+    uploader = make_uploader(server)
+    try:
+        url = uploader.upload("retry.txt", b"content")
+        assert url.startswith("https://fake.local/")
+        assert uploader.stats()["retries"] == 2
+        assert len(FakeCloudinary.requests_seen) == 3
+    finally:
+        uploader.close()
+        server.shutdown()
+
+
+def test_does_not_retry_client_errors():
+    server = start_server()
+    reset_server()
+    FakeCloudinary.status_override = 400
+    uploader = make_uploader(server)
+    try:
+        failed = False
+        try:
+            uploader.upload("bad.txt", b"content")
+        except Exception:
+            failed = True
+        assert failed
+        assert len(FakeCloudinary.requests_seen) == 1
+        assert uploader.stats()["failed"] == 1
+    finally:
+        uploader.close()
+        server.shutdown()
+
+
+def test_skips_unchanged_content():
+    server = start_server()
+    reset_server()
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = DiskCache(os.path.join(tmp, "manifest.sqlite3"), table="cloudinary_uploads")
+        uploader = make_uploader(server, manifest)
+        try:
+            first = uploader.upload("same.txt", b"v1")
+            second = uploader.upload("same.txt", b"v1")
+            assert first == second
+            assert len(FakeCloudinary.requests_seen) == 1
+
+            uploader.upload("same.txt", b"v2")
+            assert len(FakeCloudinary.requests_seen) == 2
+            assert uploader.stats()["skipped"] == 1
+        finally:
+            uploader.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    test_concurrent_upload_many()
+    test_retries_transient_failures()
+    test_does_not_retry_client_errors()
+    test_skips_unchanged_content()
+    print("✅ All upload tests passed")
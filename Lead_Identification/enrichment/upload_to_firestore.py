@@ -2,22 +2,44 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../")))
 
+import hashlib
+import re
 import firebase_admin
 from firebase_admin import credentials, firestore
 from typing import List, Dict
 
 from Automated_lead_engagement.server.models.lead import Lead,KeyPersonal
-
-
-
-# Initialize Firebase
-cred = credentials.Certificate("./secret/serviceAccountKey.json")
-if not firebase_admin._apps:
-    firebase_admin.initialize_app(cred)
-else:
-    #reinitialize the app if it already exists
-    firebase_admin.initialize_app(cred, name='default')
-db = firestore.client()
+from Lead_Identification.enrichment.json_putter import sanitize_filename
+
+# Firestore rejects batches with more than 500 writes.
+FIRESTORE_BATCH_LIMIT = 500
+SERVICE_ACCOUNT_PATH = "./secret/serviceAccountKey.json"
+
+_db = None
+
+
+def get_leads_db():
+    """
+    Returns the Firestore client, initializing Firebase on first use.
+    When FIRESTORE_EMULATOR_HOST is set, connects to the emulator instead
+    (no service account needed).
+    """
+    global _db
+    if _db is None:
+        if os.getenv("FIRESTORE_EMULATOR_HOST"):
+            from google.cloud import firestore as gcloud_firestore
+            _db = gcloud_firestore.Client(project=os.getenv("GCLOUD_PROJECT", "demo-leads"))
+        else:
+            if not firebase_admin._apps:
+                firebase_admin.initialize_app(credentials.Certificate(SERVICE_ACCOUNT_PATH))
+            _db = firestore.client()
+    return _db
+
+
+def lead_document_id(service_id: str, company_name: str) -> str:
+    """Deterministic Leads document id: the same company in the same service always maps to the same doc."""
+    normalized = re.sub(r"\s+", " ", company_name).strip().casefold()
+    return hashlib.sha1(f"{service_id}|{normalized}".encode("utf-8")).hexdigest()
 
 # Function to parse key_personals from raw strings
 # def parse_key_personals(raw_list: List[str]) -> List[Dict[str, str]]:
@@ -30,33 +52,77 @@ db = firestore.client()
 #             parsed.append({"name": item.strip(), "role": ""})
 #     return parsed
 
+def build_lead_document(lead: Dict, report_urls: Dict[str, str], service_id: str) -> Dict:
+    company_name = lead["company_name"]
+    parsed_key_personals = lead.get("key_personal", [])
+
+    # Create Lead instance for validation
+    report_url = report_urls.get(f"{sanitize_filename(company_name)}.txt") or report_urls.get(company_name + ".txt", "x")
+    lead_model = Lead(
+        id="",  # The document id is derived from service + company
+        company_name=company_name,
+        key_personals=[KeyPersonal(**kp) for kp in parsed_key_personals],
+        report_url=report_url,
+        qualification_url="",
+        service_id=service_id
+    )
+    # qualification_url belongs to the qualification step: leave it alone on re-runs.
+    return lead_model.dict(exclude={"id", "qualification_url"})
+
+
 # Main function to upload leads
 def upload_leads_to_firestore(
     raw_leads: List[Dict],
     report_urls: Dict[str, str],
-    service_id: str
-):
+    service_id: str,
+    db=None,
+    batch_size: int = FIRESTORE_BATCH_LIMIT,
+) -> Dict:
+    """
+    Writes the leads in WriteBatch chunks of at most 500 operations.
+    Documents get deterministic ids and are merged, so re-running a service
+    updates its leads instead of duplicating them.
+
+    Returns a summary: {"written", "duplicates", "invalid", "failed", "batches", "ids"}.
+    """
+    db = db or get_leads_db()
+    batch_size = min(batch_size, FIRESTORE_BATCH_LIMIT)
+    summary = {"written": 0, "duplicates": 0, "invalid": 0, "failed": 0, "batches": 0, "ids": []}
+
+    documents = {}
     for lead in raw_leads:
-        company_name = lead["company_name"]
-        key_personals_raw = lead.get("key_personal", [])
-
-        print("key personal raw:", key_personals_raw)
-        parsed_key_personals = key_personals_raw
-
-        print("parsed key personals:", parsed_key_personals)
-
-        # Create Lead instance for validation
-        lead_model = Lead(
-            id="",  # Will not be used; Firestore auto-ID
-            company_name=company_name,
-            key_personals=[KeyPersonal(**kp) for kp in parsed_key_personals],
-            report_url=report_urls.get(company_name +".txt", "x"),
-            qualification_url="",
-            service_id=service_id
-        )
-
-        # Upload using Firestore auto-ID
-        db.collection("Leads").add(lead_model.dict(exclude={"id"}))
+        try:
+            doc_id = lead_document_id(service_id, lead["company_name"])
+            document = build_lead_document(lead, report_urls, service_id)
+        except Exception as e:
+            print(f"[⚠️] Skipping invalid lead {lead.get('company_name')}: {e}")
+            summary["invalid"] += 1
+            continue
+        if doc_id in documents:
+            summary["duplicates"] += 1
+        documents[doc_id] = document
+
+    leads_ref = db.collection("Leads")
+    items = list(documents.items())
+    for start in range(0, len(items), batch_size):
+        chunk = items[start:start + batch_size]
+        batch = db.batch()
+        for doc_id, document in chunk:
+            batch.set(leads_ref.document(doc_id), document, merge=True)
+        try:
+            batch.commit()
+            summary["written"] += len(chunk)
+            summary["ids"].extend(doc_id for doc_id, _ in chunk)
+        except Exception as e:
+            print(f"[❌] Firestore batch {summary['batches'] + 1} failed: {e}")
+            summary["failed"] += len(chunk)
+        summary["batches"] += 1
+
+    print(
+        f"[✅] Firestore upload: {summary['written']} written, {summary['failed']} failed, "
+        f"{summary['duplicates']} duplicates, {summary['invalid']} invalid, {summary['batches']} batches"
+    )
+    return summary
 
 
 
@@ -10,6 +10,24 @@ def sanitize_filename(name: str) -> str:
 
 #################
 
+def write_youtube_results(company: dict, api_key: str, report):
+    """Writes the YouTube search summaries of one company into its report."""
+    company_name = sanitize_filename(company["company_name"])
+    print("Processing company:", company_name)
+
+    try:
+        yt_results = lanceYoutubeSearch(api_key,company["company_name"],company["company_name"])
+    except Exception as e:
+        yt_results = f"Failed to fetch YouTube results: {e}"
+
+    report.write("\n--- YouTube Search Results ---\n")
+    if isinstance(yt_results, list):
+        for result in yt_results:
+            report.write(f"- {result}\n")
+    else:
+        report.write(f"{yt_results}\n")
+
+
 def append_youtube_results(companies: list,api_key: str,):
     """
     Appends YouTube search results to company text files in 'crawled_data'.
@@ -20,20 +38,7 @@ def append_youtube_results(companies: list,api_key: str,):
 
     for company in companies:
         company_name = sanitize_filename(company["company_name"])
-        print("Processing company:", company_name)
         file_path = os.path.join(output_dir, f"{company_name}.txt")
 
-        try:
-            yt_results = lanceYoutubeSearch(api_key,company["company_name"],company["company_name"])
-        except Exception as e:
-            yt_results = f"Failed to fetch YouTube results: {e}"
-
         with open(file_path, "a", encoding="utf-8") as file:
-            file.write("\n--- YouTube Search Results ---\n")
-            if isinstance(yt_results, list):
-                for result in yt_results:
-                    file.write(f"- {result}\n")
-            else:
-                file.write(f"{yt_results}\n")
-
-
+            write_youtube_results(company, api_key, file)
@@ -2,6 +2,7 @@ import subprocess
 import json
 import os
 import re
+import tempfile
 from yt_dlp import YoutubeDL
 import google.generativeai as genai
 
@@ -29,25 +30,26 @@ def clean_subtitle_text(subtitle_text: str) -> str:
     return cleaned
 
 def download_transcript(video_id):
-    ydl_opts = {
-        'skip_download': True,
-        'writesubtitles': True,
-        'writeautomaticsub': True,
-        'subtitleslangs': ['en'],
-        'subtitlesformat': 'srt',
-        'outtmpl': '%(id)s.%(ext)s'
-    }
-    with YoutubeDL(ydl_opts) as ydl:
-        try:
-            ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-            srt_file = f"{video_id}.en.srt"
-            if os.path.exists(srt_file):
-                with open(srt_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                os.remove(srt_file)
-                return clean_subtitle_text(content)
-        except Exception as e:
-            print(f"Failed to get transcript for video {video_id}: {e}")
+    # Subtitles land in a private temp dir so concurrent runs never share files.
+    with tempfile.TemporaryDirectory(prefix="yt_subs_") as tmp_dir:
+        ydl_opts = {
+            'skip_download': True,
+            'writesubtitles': True,
+            'writeautomaticsub': True,
+            'subtitleslangs': ['en'],
+            'subtitlesformat': 'srt',
+            'outtmpl': os.path.join(tmp_dir, '%(id)s.%(ext)s')
+        }
+        with YoutubeDL(ydl_opts) as ydl:
+            try:
+                ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
+                srt_file = os.path.join(tmp_dir, f"{video_id}.en.srt")
+                if os.path.exists(srt_file):
+                    with open(srt_file, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                    return clean_subtitle_text(content)
+            except Exception as e:
+                print(f"Failed to get transcript for video {video_id}: {e}")
     return None
 
 def save_transcripts(keyword, videos):
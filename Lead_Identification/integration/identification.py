@@ -31,38 +31,46 @@ def run_lead_pipeline(icp: Dict) -> List[Dict]:
 
 from typing import Dict, List
 from Lead_Identification.enrichment.upload_to_firestore import upload_leads_to_firestore
-from Lead_Identification.detection.detection_agent import detection_agent
-from Lead_Identification.enrichment.enrichir import enrich 
+from Lead_Identification.detection.detection_agent import detection_agent, stream_detected_companies
+from Lead_Identification.enrichment.enrichir import enrich, enrich_stream
 
 
-def run_lead_pipeline(icp: Dict, service_id: str) -> List[Dict]:
+def run_lead_pipeline(icp: Dict, service_id: str, streaming: bool = True) -> List[Dict]:
     """
     Combines detection and enrichment into a single processing pipeline.
+
+    In streaming mode (default), each company is enriched as soon as a
+    detection agent confirms it, instead of after all agents and the global
+    dedup have finished.
     
     Args:
         icp (Dict): Ideal Customer Profile
+        service_id (str): Service the leads are uploaded for
+        streaming (bool): Overlap detection and enrichment
     
     Returns:
         List[Dict]: Final enriched leads
     """
-    print("==========[🔎] Starting detection phase...===============")
-    detected_leads = detection_agent(icp)
-    
-    print(f"[✅] Detection complete. {len(detected_leads)} leads found.")
-    
-    print("=======[⚙️] Starting enrichment phase...=======")
-    
-    print("detected leads", detected_leads)
-    
-    
+    if streaming:
+        print("==========[🔎⚙️] Starting streaming detection + enrichment...===============")
+        detected_leads, urls = enrich_stream(stream_detected_companies(icp))
+        print(f"[✅] Detection complete. {len(detected_leads)} leads found.")
+    else:
+        print("==========[🔎] Starting detection phase...===============")
+        detected_leads = detection_agent(icp)
+
+        print(f"[✅] Detection complete. {len(detected_leads)} leads found.")
 
-    urls = enrich(detected_leads)
+        print("=======[⚙️] Starting enrichment phase...=======")
+
+        print("detected leads", detected_leads)
+
+        urls = enrich(detected_leads)
 
 
     upload_leads_to_firestore(detected_leads, urls, service_id)
 
 
     print("==========Enriched=============")
-    
-
 
+    return detected_leads
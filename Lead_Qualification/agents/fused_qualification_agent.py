@@ -0,0 +1,48 @@
+from typing import Dict, Tuple
+from pathlib import Path
+import os
+from dotenv import load_dotenv
+from Lead_Identification.common.json_parsing import JSONParseError
+from Lead_Identification.common.llms import generate_gemini_json  # ✅ Gemini SDK (client partagé)
+from Lead_Qualification.agents.qualification_judge_agent import GCPT_SCHEMA, calculate_gpct_score
+
+load_dotenv()
+
+class FusedQualificationAgent:
+    """
+    Mode "fused" : un seul appel Gemini (JSON mode) extrait les données du lead
+    et évalue les preuves GCPT, à la place de ParsingAgent + QualificationParsingAgent
+    + QualificationJudgeAgent. Le rapport n'est envoyé qu'une fois.
+    """
+
+    def __init__(self):
+        # Charger le prompt
+        self.prompt_template = Path(
+            "Lead_Qualification/prompts/fused_qualification_prompt.txt"
+        ).read_text(encoding="utf-8")
+
+        # Clé API Gemini
+        self.api_key = os.getenv("GEMINI_API_KEY")
+        if not self.api_key:
+            raise ValueError("❌ GEMINI_API_KEY is missing in your .env file.")
+
+    def analyse_report(self, report_text: str) -> Tuple[Dict, float, str]:
+        """Renvoie (lead parsé, score GPCT, justification GPCT), comme les trois agents du mode "split"."""
+        # Pas de response_schema : les champs de "lead" sont libres, Gemini exige des propriétés fixes.
+        try:
+            result = generate_gemini_json(
+                f"{self.prompt_template}\n{report_text}",
+                model="gemini-2.5-flash-lite",
+                temperature=0.2,
+                max_tokens=100000,
+                schema={"lead": dict, "gcpt": GCPT_SCHEMA},
+            )
+        except JSONParseError as e:
+            raise Exception(f"❌ Fused Phase: {e}\nResponse: {e.text}")
+        parsed_lead = result["lead"]
+        gcpt = result["gcpt"]
+
+        score = calculate_gpct_score(gcpt)
+        justification = gcpt.get("justification", "No justification provided.")
+
+        return parsed_lead, score, justification
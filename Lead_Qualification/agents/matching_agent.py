@@ -1,15 +1,28 @@
-from typing import Dict, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import json
 import os
+import threading
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer
 from numpy import dot
 from numpy.linalg import norm
-from google.genai import Client, types  # ✅ Gemini SDK
+from Lead_Identification.common.config import SBERT_MODEL_NAME
+from Lead_Qualification.utils.embedding_store import EmbeddingStore, cosine_similarities, get_embedding_cache
+from Lead_Identification.common.json_parsing import NUMBER, JSONParseError
+from Lead_Identification.common.llms import generate_gemini_json  # ✅ Gemini SDK (client partagé)
 
 load_dotenv()
 
+# ICP encodés gardés en mémoire par un worker (les plus récemment utilisés).
+ICP_VECTOR_CACHE_SIZE = 32
+
+MATCH_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {"score": {"type": "NUMBER"}, "justification": {"type": "STRING"}},
+    "required": ["score", "justification"],
+}
+
 class MatchingAgent:
     def __init__(self):
         # Charger le prompt LLM
@@ -19,23 +32,43 @@ class MatchingAgent:
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("❌ GEMINI_API_KEY is missing in your .env file.")
-        
-        # Initialiser le client Gemini
-        self.client = Client(api_key=self.api_key)
 
-        # Charger SBERT Model pour Semantic Similarity
-        self.sbert_model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
-
-    def semantic_score(self, icp: Dict[str, Any], lead: Dict[str, Any]) -> float:
-        lead_text = lead.get("description", "")
+        # SBERT pour la similarité sémantique : le modèle partagé n'est chargé qu'au premier encodage
+        self.embeddings = EmbeddingStore(SBERT_MODEL_NAME, get_embedding_cache())
+        self._icp_vectors = OrderedDict()
+        self._icp_vectors_lock = threading.Lock()
+
+    def _icp_vector(self, icp_text: str):
+        # L'ICP est le même pour tous les leads d'un service : un seul encodage.
+        with self._icp_vectors_lock:
+            vector = self._icp_vectors.get(icp_text)
+            if vector is not None:
+                self._icp_vectors.move_to_end(icp_text)
+                return vector
+        vector = self.embeddings.encode([icp_text])[0]
+        with self._icp_vectors_lock:
+            self._icp_vectors[icp_text] = vector
+            if len(self._icp_vectors) > ICP_VECTOR_CACHE_SIZE:
+                self._icp_vectors.popitem(last=False)
+        return vector
+
+    def semantic_scores(self, icp: Dict[str, Any], leads: List[Dict[str, Any]]) -> List[float]:
+        """Scores sémantiques (sur 100) de tous les leads d'un service, encodés en un seul batch."""
         icp_text = icp.get("target_description", "")
+        scores = [0.0] * len(leads)
+        indexed = [(i, lead.get("description", "")) for i, lead in enumerate(leads)]
+        indexed = [(i, text) for i, text in indexed if text]
+        if not icp_text or not indexed:
+            return scores
+
+        matrix = self.embeddings.encode([text for _, text in indexed])
+        similarities = cosine_similarities(matrix, self._icp_vector(icp_text))
+        for (i, _), similarity in zip(indexed, similarities):
+            scores[i] = float(similarity) * 100  # On ramène sur 100 pts
+        return scores
 
-        if not lead_text or not icp_text:
-            return 0.0
-
-        embeddings = self.sbert_model.encode([lead_text, icp_text])
-        cosine_sim = self.cosine_similarity(embeddings[0], embeddings[1])
-        return cosine_sim * 100  # On ramène sur 100 pts
+    def semantic_score(self, icp: Dict[str, Any], lead: Dict[str, Any]) -> float:
+        return self.semantic_scores(icp, [lead])[0]
 
     def cosine_similarity(self, vec1, vec2):
         return dot(vec1, vec2) / (norm(vec1) * norm(vec2))
@@ -43,40 +76,28 @@ class MatchingAgent:
     def llm_match_score(self, icp: Dict[str, Any], lead: Dict[str, Any], semantic_score: float) -> Tuple[float, str]:
         prompt = f"{self.prompt_template}\n\nICP:\n{json.dumps(icp, indent=2)}\n\nLEAD:\n{json.dumps(lead, indent=2)}\n\nSEMANTIC SCORE (description matching): {semantic_score:.2f}/100\n\nGive the final MATCH SCORE over 100 and justify."
         
-        # ✅ Utilisation de Gemini 2.5 Flash Lite
-        contents = [types.Part.from_text(text=prompt)]
-        config = types.GenerateContentConfig(
-            temperature=0.2,
-            max_output_tokens=500
-        )
-
-        response = self.client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=contents,
-            config=config
-        )
-
-        raw_output = response.text.strip()  # ✅ Récupération du texte Gemini
-
-        print("🟡 Réponse brute LLM :", raw_output)
-
-        # Parsing JSON response from LLM
+        # ✅ Utilisation de Gemini 2.5 Flash Lite, réponse contrainte par MATCH_RESPONSE_SCHEMA
         try:
-            json_start = raw_output.find('{')
-            json_end = raw_output.rfind('}') + 1
-            json_part = raw_output[json_start:json_end]
-            result = json.loads(json_part)
+            result = generate_gemini_json(
+                prompt,
+                model="gemini-2.5-flash-lite",
+                temperature=0.2,
+                max_tokens=500,
+                response_schema=MATCH_RESPONSE_SCHEMA,
+                schema={"score": NUMBER + (str,)},
+            )
 
             score = float(result.get("score", 0))
             justification = result.get("justification", "No justification provided.")
             return score, justification
 
-        except Exception:
-            raise Exception(f"⚠️ Erreur de parsing JSON. Réponse brute :\n{raw_output}")
+        except JSONParseError as e:
+            raise Exception(f"⚠️ Erreur de parsing JSON. Réponse brute :\n{e.text}")
 
-    def calculate_match_score(self, icp: Dict[str, Any], lead: Dict[str, Any]) -> Tuple[float, str]:
+    def calculate_match_score(self, icp: Dict[str, Any], lead: Dict[str, Any], semantic_score: Optional[float] = None) -> Tuple[float, str]:
         try:
-            semantic_score = self.semantic_score(icp, lead)
+            if semantic_score is None:
+                semantic_score = self.semantic_score(icp, lead)
             final_score, justification = self.llm_match_score(icp, lead, semantic_score)
             return final_score, justification
 
@@ -1,13 +1,66 @@
 import json
-import re
 from typing import Dict, Tuple
 from pathlib import Path
 import os
 from dotenv import load_dotenv
-from google.genai import Client, types  # ✅ Gemini SDK
+from Lead_Identification.common.json_parsing import JSONParseError
+from Lead_Identification.common.llms import generate_gemini_json  # ✅ Gemini SDK (client partagé)
 
 load_dotenv()
 
+# Champs lus par calculate_gpct_score : une réponse sans eux est rejetée au parsing.
+GCPT_SCHEMA = {
+    "goals_assessment": {"strategic_alignment": str},
+    "plans_evidence": {"decision_maker_engagement": str},
+    "challenges_analysis": {"technology_gaps": list},
+    "timeline_indicators": {"urgency": str},
+}
+
+# Même structure côté Gemini (sous-ensemble OpenAPI) : la réponse est contrainte dès la génération.
+LEVEL = {"type": "STRING", "enum": ["Low", "Medium", "High"]}
+
+
+def _object(properties: dict) -> dict:
+    return {"type": "OBJECT", "properties": properties, "required": list(properties)}
+
+
+GCPT_RESPONSE_SCHEMA = _object({
+    "goals_assessment": _object({"strategic_alignment": LEVEL}),
+    "plans_evidence": _object({"decision_maker_engagement": LEVEL}),
+    "challenges_analysis": _object({"technology_gaps": {"type": "ARRAY", "items": {"type": "STRING"}}}),
+    "timeline_indicators": _object({"urgency": LEVEL}),
+    "justification": {"type": "STRING"},
+})
+
+
+def calculate_gpct_score(data: dict) -> float:
+    """Score GPCT sur 100 à partir des niveaux Low/Medium/High évalués par le juge."""
+    weights = {
+        "goals": 0.4,
+        "plans": 0.3,
+        "challenges": 0.2,
+        "timeline": 0.1
+    }
+
+    conversion = {"Low": 1, "Medium": 3, "High": 5}
+
+    goals = conversion.get(data["goals_assessment"]["strategic_alignment"], 1)
+    plans = conversion.get(data["plans_evidence"]["decision_maker_engagement"], 1)
+    timeline = conversion.get(data["timeline_indicators"]["urgency"], 1)
+
+    tech_gaps = len(data["challenges_analysis"].get("technology_gaps", []))
+    challenges = max(0, min(5, 5 - tech_gaps))
+
+    total = (
+        weights["goals"] * goals +
+        weights["plans"] * plans +
+        weights["challenges"] * challenges +
+        weights["timeline"] * timeline
+    ) * 20
+
+    return round(min(100, max(0, total)), 2)
+
+
 class QualificationJudgeAgent:
     def __init__(self):
         # Charger le prompt
@@ -20,74 +73,26 @@ class QualificationJudgeAgent:
         if not self.api_key:
             raise ValueError("❌ GEMINI_API_KEY is missing in your .env file.")
 
-        # Client Gemini
-        self.client = Client(api_key=self.api_key)
-
     def judge_gcpt(self, parsed_gcpt: Dict) -> Tuple[float, str]:
         judge_prompt = f"{self.prompt_template}\n\n{json.dumps(parsed_gcpt, indent=2)}"
 
-        # Préparer la requête Gemini
-        contents = [types.Part.from_text(text=judge_prompt)]
-        config = types.GenerateContentConfig(
-            temperature=0.2,
-            max_output_tokens=100000
-        )
-
-        # Appel API Gemini
-        response = self.client.models.generate_content(
-            model="gemini-2.5-flash-lite",
-            contents=contents,
-            config=config
-        )
-
-        raw_output = response.text.strip()
-
-        judged_gcpt = self._extract_and_validate_json(raw_output)
+        # Requête Gemini en JSON mode, relancée si la réponse reste illisible
+        try:
+            judged_gcpt = generate_gemini_json(
+                judge_prompt,
+                model="gemini-2.5-flash-lite",
+                temperature=0.2,
+                max_tokens=100000,
+                response_schema=GCPT_RESPONSE_SCHEMA,
+                schema=GCPT_SCHEMA,
+            )
+        except JSONParseError as e:
+            raise Exception(f"❌ Judge Phase: {e}\nResponse: {e.text}")
 
         score = self._calculate_gpct_score(judged_gcpt)
         justification = judged_gcpt.get("justification", "No justification provided.")
 
         return score, justification
 
-    def _extract_and_validate_json(self, text: str) -> Dict:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if not match:
-            raise Exception(f"❌ Judge Phase: No JSON found.\nResponse: {text}")
-
-        json_str = self._clean_json_string(match.group(0))
-
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as jde:
-            raise Exception(f"❌ Judge Phase: JSON Decode Error: {str(jde)}\nRaw JSON: {json_str}")
-
-    def _clean_json_string(self, text: str) -> str:
-        text = text.replace("\u201c", "\"").replace("\u201d", "\"")
-        text = text.replace("\u2018", "'").replace("\u2019", "'")
-        return text.strip()
-
     def _calculate_gpct_score(self, data: dict) -> float:
-        weights = {
-            "goals": 0.4,
-            "plans": 0.3,
-            "challenges": 0.2,
-            "timeline": 0.1
-        }
-
-        conversion = {"Low": 1, "Medium": 3, "High": 5}
-
-        goals = conversion.get(data["goals_assessment"]["strategic_alignment"], 1)
-        plans = conversion.get(data["plans_evidence"]["decision_maker_engagement"], 1)
-        timeline = conversion.get(data["timeline_indicators"]["urgency"], 1)
-
-        tech_gaps = len(data["challenges_analysis"].get("technology_gaps", []))
-        challenges = max(0, min(5, 5 - tech_gaps))
-
-        total = (
-            weights["goals"] * goals +
-            weights["plans"] * plans +
-            weights["challenges"] * challenges +
-            weights["timeline"] * timeline
-        ) * 20
-
-        return round(min(100, max(0, total)), 2)
+        return calculate_gpct_score(data)
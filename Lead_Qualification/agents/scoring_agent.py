@@ -1,11 +1,43 @@
 import os
-import requests
-from typing import Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from Lead_Identification.common.config import JUSTIFICATION_BACKEND, JUSTIFICATION_MAX_WORKERS, LLM_HTTP_TIMEOUT
+from Lead_Identification.common.llm_clients import get_http_session, provider_slot, record_usage
+from Lead_Qualification.utils.justification import template_justification
+
+JUSTIFICATION_BACKENDS = ("template", "llm", "deferred")
+
+# Pool partagé des justifications LLM différées.
+_deferred_pool = None
+_deferred_lock = threading.Lock()
+
+
+def _get_deferred_pool() -> ThreadPoolExecutor:
+    global _deferred_pool
+    with _deferred_lock:
+        if _deferred_pool is None:
+            _deferred_pool = ThreadPoolExecutor(max_workers=JUSTIFICATION_MAX_WORKERS, thread_name_prefix="justification")
+        return _deferred_pool
+
 
 class ScoringAgent:
-    def __init__(self):
+    """
+    Score final et classification calculés localement. La justification vient
+    du backend choisi :
+    - "template" : paragraphe local déterministe, aucun appel réseau ;
+    - "llm"      : paragraphe Together, bloquant (comportement historique) ;
+    - "deferred" : paragraphe local renvoyé tout de suite, version LLM générée
+                   en arrière-plan puis transmise à `on_justification`.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = (backend or JUSTIFICATION_BACKEND).lower()
+        if self.backend not in JUSTIFICATION_BACKENDS:
+            raise ValueError(f"❌ Unknown JUSTIFICATION_BACKEND '{self.backend}' (expected one of {JUSTIFICATION_BACKENDS}).")
+
         self.api_key = os.getenv("TOGETHER_SCORING_API_KEY")
-        if not self.api_key:
+        if not self.api_key and self.backend != "template":
             raise ValueError("❌ TOGETHER_SCORING_API_KEY is not set in environment variables.")
 
         self.llm_url = "https://api.together.xyz/inference"
@@ -16,11 +48,14 @@ class ScoringAgent:
         match_score: float,
         match_justification: str,
         qualification_score: float,
-        qualification_justification: str
+        qualification_justification: str,
+        on_justification: Optional[Callable[[str], None]] = None
     ) -> Dict[str, object]:
         """
         Calcule le score final, la classification (Hot/Cold), et la justification finale.
-        Retourne un objet JSON (dict) au lieu d'un tuple.
+        Retourne un objet JSON (dict) au lieu d'un tuple. `justification_source`
+        indique d'où vient le paragraphe ("template" ou "llm").
+        En mode "deferred", `on_justification` reçoit le paragraphe LLM une fois prêt.
         """
         try:
             # Score pondéré
@@ -29,24 +64,68 @@ class ScoringAgent:
             # Classification
             classification = "Hot" if final_score >= 75 else "Cold"
 
-            # Justification finale via LLM
-            final_justification = self._generate_final_justification(
-                match_justification,
-                qualification_justification,
-                final_score,
-                classification
-            )
+            if self.backend == "llm":
+                # Justification finale via LLM
+                final_justification = self._generate_final_justification(
+                    match_justification,
+                    qualification_justification,
+                    final_score,
+                    classification
+                )
+                source = "llm"
+            else:
+                final_justification = template_justification(
+                    match_score,
+                    match_justification,
+                    qualification_score,
+                    qualification_justification,
+                    final_score,
+                    classification
+                )
+                source = "template"
+                if self.backend == "deferred" and on_justification is not None:
+                    self._defer_justification(
+                        match_justification,
+                        qualification_justification,
+                        final_score,
+                        classification,
+                        on_justification
+                    )
 
             # Retour JSON
             return {
                 "final_score": final_score,
                 "classification": classification,
-                "justification": final_justification
+                "justification": final_justification,
+                "justification_source": source
             }
 
         except Exception as e:
             raise Exception(f"❌ ScoringAgent error: {str(e)}")
 
+    def _defer_justification(
+        self,
+        match_justification: str,
+        qualification_justification: str,
+        final_score: float,
+        classification: str,
+        on_justification: Callable[[str], None]
+    ):
+        """Génère le paragraphe LLM en arrière-plan ; en cas d'échec, la version locale reste en place."""
+        def run():
+            try:
+                text = self._generate_final_justification(
+                    match_justification,
+                    qualification_justification,
+                    final_score,
+                    classification
+                )
+                on_justification(text)
+            except Exception as e:
+                print(f"⚠ Justification LLM différée abandonnée : {e}")
+
+        _get_deferred_pool().submit(run)
+
     def _generate_final_justification(
         self,
         match_justification: str,
@@ -85,23 +164,27 @@ Your task:
 Respond with only the paragraph. Do not include labels, headers, or explanations.
 """
 
-        response = requests.post(
-            self.llm_url,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": self.model_name,
-                "prompt": prompt,
-                "max_tokens": 150,
-                "temperature": 0.3,
-                "top_p": 0.9
-            }
-        )
+        with provider_slot("together"):
+            response = get_http_session("together").post(
+                self.llm_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model_name,
+                    "prompt": prompt,
+                    "max_tokens": 150,
+                    "temperature": 0.3,
+                    "top_p": 0.9
+                },
+                timeout=LLM_HTTP_TIMEOUT
+            )
 
         if response.status_code == 200:
             json_response = response.json()
+            usage = json_response.get("usage") or {}
+            record_usage("together", usage.get("prompt_tokens"), usage.get("completion_tokens"))
             try:
                 # Extraction robuste du texte généré
                 text = None
@@ -0,0 +1,99 @@
+# Lead_Qualification/benchmark_qualification.py
+#
+# Compare les modes de qualification "split" (5 appels LLM par lead) et
+# "fused" (3 appels) sur les rapports locaux : latence par lead, appels et
+# tokens par fournisseur. Le cache LLM est désactivé pour mesurer de vrais appels.
+#
+#   python Lead_Qualification/benchmark_qualification.py --limit 5
+#   python Lead_Qualification/benchmark_qualification.py --modes fused --reports Lead_Qualification/data/rapports
+
+import os
+import sys
+import argparse
+import glob
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+os.environ["LLM_CACHE_ENABLED"] = "false"
+
+from Lead_Identification.common.llm_clients import get_client_stats
+from Lead_Qualification.main import analyse_report, create_agents, score_analysis
+
+COUNTERS = ("calls", "prompt_tokens", "output_tokens")
+
+
+def usage_snapshot():
+    stats = get_client_stats()
+    return {provider: {key: stats[provider].get(key, 0) for key in COUNTERS} for provider in stats}
+
+
+def usage_delta(before, after):
+    delta = {}
+    for provider, counters in after.items():
+        previous = before.get(provider, {})
+        delta[provider] = {key: counters[key] - previous.get(key, 0) for key in COUNTERS}
+    return {provider: counters for provider, counters in delta.items() if counters["calls"]}
+
+
+def run_mode(mode, reports, icp):
+    agents = create_agents(mode)
+    latencies, failures = [], 0
+    before = usage_snapshot()
+    with ThreadPoolExecutor(max_workers=2) as side_pool:
+        for path in reports:
+            with open(path, encoding="utf-8") as f:
+                report_text = f.read()
+            start = time.perf_counter()
+            try:
+                analysis = analyse_report(os.path.basename(path), report_text, side_pool, agents)
+                semantic_score = agents.matching.semantic_score(icp, analysis["parsed_lead"])
+                result = score_analysis(analysis, icp, semantic_score, agents)
+            except Exception as e:
+                failures += 1
+                print(f"⚠ [{mode}] {os.path.basename(path)} : {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+            print(f"[{mode}] {result['company_name']}: final={result['final_score']} "
+                  f"(match={result['match_score']}, gpct={result['qualification_score']}) "
+                  f"in {latencies[-1]:.1f}s")
+    return latencies, failures, usage_delta(before, usage_snapshot())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark split vs fused qualification")
+    parser.add_argument("--reports", default="Lead_Qualification/data/leads", help="dossier de rapports .txt")
+    parser.add_argument("--icp", default="Lead_Qualification/data/icp.json")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["split", "fused"], choices=["split", "fused"])
+    args = parser.parse_args()
+
+    reports = sorted(glob.glob(os.path.join(args.reports, "*.txt")))[:args.limit]
+    with open(args.icp, encoding="utf-8") as f:
+        icp = json.load(f).get("ideal_customer_profile", {})
+    if not reports:
+        print(f"❌ Aucun rapport dans {args.reports}")
+        return
+
+    summary = {}
+    for mode in args.modes:
+        summary[mode] = run_mode(mode, reports, icp)
+
+    print(f"\n===== {len(reports)} rapports =====")
+    for mode, (latencies, failures, usage) in summary.items():
+        calls = sum(c["calls"] for c in usage.values())
+        prompt_tokens = sum(c["prompt_tokens"] for c in usage.values())
+        output_tokens = sum(c["output_tokens"] for c in usage.values())
+        done = max(1, len(latencies))
+        median = statistics.median(latencies) if latencies else 0.0
+        print(f"[{mode}] ok={len(latencies)} failed={failures} median={median:.1f}s/lead "
+              f"calls/lead={calls / done:.1f} prompt_tokens/lead={prompt_tokens / done:.0f} "
+              f"output_tokens/lead={output_tokens / done:.0f}")
+        for provider, counters in usage.items():
+            print(f"     {provider}: {counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,229 @@
 import os
-import requests
-from firebase_admin import credentials, firestore, initialize_app
-from Lead_Qualification.rapport_qualification import generer_rapport_pdf
-from Lead_Qualification.agents.parsing_agent import ParsingAgent
-from Lead_Qualification.agents.matching_agent import MatchingAgent
-from Lead_Qualification.agents.qualification_parsing_agent import QualificationParsingAgent
-from Lead_Qualification.agents.qualification_judge_agent import QualificationJudgeAgent
-from Lead_Qualification.agents.scoring_agent import ScoringAgent
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional
 from server.common.firebase_config import get_firestore_db
+from Lead_Identification.common.config import QUALIFICATION_BATCH_SIZE, QUALIFICATION_MAX_WORKERS, QUALIFICATION_MODE, REPORT_PREFETCH
+from Lead_Identification.common.json_parsing import parse_stats
 
 # ==== CONFIG ====
 service_id_input = "f0764e2e-78ca-4c5d-8913-b6d8e586c92e"  # <-- à remplacer par le service_id voulu
 
-# Initialisation des agents
-parsing_agent = ParsingAgent()
-matching_agent = MatchingAgent()
-qualification_parsing_agent = QualificationParsingAgent()
-qualification_judge_agent = QualificationJudgeAgent()
-scoring_agent = ScoringAgent()
+# Attente max (s) de l'écriture du lead avant d'y ajouter une justification différée.
+DEFERRED_WRITE_TIMEOUT = 120
 
-# Connexion à Firebase
-# cred = credentials.Certificate("secret/serviceAccountKey.json")  # Ton fichier clé Firebase
-# initialize_app(cred)
-db = get_firestore_db()
+_agents = None
+_agents_lock = threading.Lock()
 
 
-def process_leads(service_id_input=service_id_input):
+def get_agents() -> SimpleNamespace:
+    """
+    Initialisation des agents au premier appel : importer ce module ne charge
+    ni les SDK LLM ni les prompts. Seuls les agents du QUALIFICATION_MODE
+    courant sont créés.
+    """
+    global _agents
+    with _agents_lock:
+        if _agents is None:
+            _agents = create_agents(QUALIFICATION_MODE)
+        return _agents
 
+
+def create_agents(mode: str) -> SimpleNamespace:
+    from Lead_Qualification.agents.matching_agent import MatchingAgent
+    from Lead_Qualification.agents.scoring_agent import ScoringAgent
+
+    agents = SimpleNamespace(mode=mode, matching=MatchingAgent(), scoring=ScoringAgent())
+    if mode == "fused":
+        from Lead_Qualification.agents.fused_qualification_agent import FusedQualificationAgent
+
+        agents.fused = FusedQualificationAgent()
+    elif mode == "split":
+        from Lead_Qualification.agents.parsing_agent import ParsingAgent
+        from Lead_Qualification.agents.qualification_parsing_agent import QualificationParsingAgent
+        from Lead_Qualification.agents.qualification_judge_agent import QualificationJudgeAgent
+
+        agents.parsing = ParsingAgent()
+        agents.qualification_parsing = QualificationParsingAgent()
+        agents.qualification_judge = QualificationJudgeAgent()
+    else:
+        raise ValueError(f"❌ QUALIFICATION_MODE inconnu : {mode} (attendu : split ou fused)")
+    return agents
+
+
+def fetch_report(report_url: str) -> Optional[str]:
+    """Télécharge le rapport d'un lead (session keep-alive partagée, cache local, préchargement)."""
+    from Lead_Qualification.utils.report_fetcher import get_report_fetcher
+
+    return get_report_fetcher().fetch(report_url)
+
+
+def analyse_lead(lead_id: str, lead_data: Dict, side_pool: ThreadPoolExecutor, agents: Optional[SimpleNamespace] = None) -> Optional[Dict]:
+    """
+    Phase 1 d'un lead : téléchargement et parsing. En mode "split", les deux
+    chaînes indépendantes tournent en parallèle : parsing du lead dans le thread
+    courant, parsing GPCT -> juge dans `side_pool`. En mode "fused", un seul appel.
+    """
+    agents = agents or get_agents()
+    report_url = lead_data.get("report_url")
+
+    print(f"📄 Traitement du lead : {lead_id}")
+
+    if not report_url:
+        print(f"⚠ Lead {lead_id} n'a pas de report_url")
+        return None
+
+    report_text = fetch_report(report_url)
+    if report_text is None:
+        return None
+    return analyse_report(lead_id, report_text, side_pool, agents)
+
+
+def analyse_report(lead_id: str, report_text: str, side_pool: ThreadPoolExecutor, agents: SimpleNamespace) -> Dict:
+    if agents.mode == "fused":
+        parsed_lead, qualification_score, qualification_justification = agents.fused.analyse_report(report_text)
+        return {
+            "lead_id": lead_id,
+            "parsed_lead": parsed_lead,
+            "qualification_score": qualification_score,
+            "qualification_justification": qualification_justification,
+        }
+
+    def judge_chain():
+        parsed_gcpt = agents.qualification_parsing.parse_report(report_text)
+        return agents.qualification_judge.judge_gcpt(parsed_gcpt)
+
+    judge_future = side_pool.submit(judge_chain)
+    try:
+        parsed_lead = agents.parsing.parse_lead_report(report_text)
+    finally:
+        # Toujours attendre la chaîne GPCT pour ne pas laisser d'appel orphelin.
+        qualification_score, qualification_justification = judge_future.result()
+
+    return {
+        "lead_id": lead_id,
+        "parsed_lead": parsed_lead,
+        "qualification_score": qualification_score,
+        "qualification_justification": qualification_justification,
+    }
+
+
+def score_analysis(analysis: Dict, icp: Dict, semantic_score: float, agents: Optional[SimpleNamespace] = None,
+                   on_justification: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Matching LLM (score sémantique déjà calculé) et scoring final (pondération 0.7 / 0.3).
+    `on_justification` reçoit la justification LLM quand le backend est "deferred".
+    """
+    agents = agents or get_agents()
+    parsed_lead = analysis["parsed_lead"]
+    qualification_score = analysis["qualification_score"]
+    match_score, match_justification = agents.matching.calculate_match_score(icp, parsed_lead, semantic_score)
+    scoring_result = agents.scoring.score_lead(
+        match_score,
+        match_justification,
+        qualification_score,
+        analysis["qualification_justification"],
+        on_justification=on_justification
+    )
+
+    qualification_result = {
+        "company_name": parsed_lead.get("company_name", "Inconnu"),
+        "match_score": match_score,
+        "qualification_score": qualification_score,
+        "final_score": scoring_result["final_score"],
+        "classification": scoring_result["classification"],
+        "justification": scoring_result["justification"],
+        "justification_source": scoring_result["justification_source"]
+    }
+    return qualification_result
+
+
+def finish_lead(analysis: Dict, icp: Dict, semantic_score: float) -> Dict:
+    """
+    Phase 3 d'un lead : matching LLM, scoring, mise à jour Firestore. Avec une
+    justification différée, le lead est écrit tout de suite avec le paragraphe
+    local, puis seul le champ justification est remplacé quand le LLM a répondu.
+    """
+    lead_ref = get_firestore_db().collection("Leads").document(analysis["lead_id"])
+    # Signalé dans tous les cas (finally) : en cas d'échec de l'écriture principale,
+    # le callback différé rend aussitôt son worker au lieu d'attendre le timeout.
+    main_write_done = threading.Event()
+    main_write = {"ok": False}
+
+    def write_llm_justification(text: str):
+        # Ne jamais passer avant l'écriture principale, qui écraserait le paragraphe LLM.
+        if not main_write_done.wait(timeout=DEFERRED_WRITE_TIMEOUT) or not main_write["ok"]:
+            return
+        lead_ref.update({
+            "qualification.justification": text,
+            "qualification.justification_source": "llm"
+        })
+
+    try:
+        qualification_result = score_analysis(analysis, icp, semantic_score, on_justification=write_llm_justification)
+        lead_ref.update({
+            "qualification": qualification_result
+        })
+        main_write["ok"] = True
+    finally:
+        main_write_done.set()
+    return qualification_result
+
+
+def _run_phase(futures: Dict, label: str) -> Dict:
+    """Attend les futures {future: lead_id} ; un lead en échec est isolé des autres."""
+    results = {}
+    total = len(futures)
+    for done, future in enumerate(as_completed(futures), start=1):
+        lead_id = futures[future]
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"⚠ [{label} {done}/{total}] Erreur analyse lead {lead_id} : {e}")
+            continue
+        if result:
+            results[lead_id] = result
+    return results
+
+
+_side_pool = None
+
+
+def qualify_lead(lead_id: str, icp: Dict) -> Optional[Dict]:
+    """
+    Qualifie un seul lead (utilisé par le pipeline Celery, lead par lead, dès
+    que son rapport est publié). Renvoie None si le lead n'a pas pu être analysé.
+    """
+    global _side_pool
+    with _agents_lock:
+        if _side_pool is None:
+            _side_pool = ThreadPoolExecutor(max_workers=QUALIFICATION_MAX_WORKERS)
+
+    lead_doc = get_firestore_db().collection("Leads").document(lead_id).get()
+    if not lead_doc.exists:
+        print(f"⚠ Lead {lead_id} introuvable")
+        return None
+
+    analysis = analyse_lead(lead_id, lead_doc.to_dict(), _side_pool)
+    if analysis is None:
+        return None
+    semantic_score = get_agents().matching.semantic_score(icp, analysis["parsed_lead"])
+    return finish_lead(analysis, icp, semantic_score)
+
+
+def process_leads(service_id_input=service_id_input, max_workers: int = QUALIFICATION_MAX_WORKERS,
+                  batch_size: int = QUALIFICATION_BATCH_SIZE):
+    """
+    Qualifie tous les leads d'un service sur un pool de `max_workers` threads,
+    par lots de `batch_size` : un lot est scoré et écrit dans Firestore pendant
+    que le suivant est analysé, un rapport lent ne retient que son lot.
+    Les limites par fournisseur LLM sont appliquées par le registre de clients ;
+    l'échec d'un lead est isolé et n'affecte pas les autres.
+    """
+
+    db = get_firestore_db()
+    agents = get_agents()
     leads_data = []
 
     # Créer le dossier outputs si inexistant
@@ -41,69 +238,70 @@ def process_leads(service_id_input=service_id_input):
     print(f"✅ ICP récupéré pour service {service_id_input}")
 
     # ==== Récupération des leads pour ce service ====
-    leads = db.collection("Leads").where("service_id", "==", service_id_input).stream(timeout=600)
+    leads = [
+        (lead.id, lead.to_dict())
+        for lead in db.collection("Leads").where("service_id", "==", service_id_input).stream(timeout=600)
+    ]
+    report_urls = [lead_data.get("report_url") for _, lead_data in leads]
 
-    for lead in leads:
-        lead_data = lead.to_dict()
-        report_url = lead_data.get("report_url")
+    from Lead_Qualification.utils.report_fetcher import get_report_fetcher
+    fetcher = get_report_fetcher()
+    # Les rapports des premiers leads sont téléchargés pendant que le pool démarre.
+    prefetched = {"until": max_workers + REPORT_PREFETCH}
+    prefetch_lock = threading.Lock()
+    fetcher.prefetch(report_urls[:prefetched["until"]])
 
-        print(f"📄 Traitement du lead : {lead.id}")
+    def analyse_with_prefetch(index: int, lead_id: str, lead_data: Dict, side_pool: ThreadPoolExecutor):
+        # Garde REPORT_PREFETCH rapports d'avance sur les leads en cours d'analyse. Les fenêtres
+        # de leads consécutifs se chevauchent : seuls les rapports jamais demandés sont soumis.
+        until = index + max_workers + REPORT_PREFETCH
+        with prefetch_lock:
+            start = prefetched["until"]
+            prefetched["until"] = max(start, until)
+        fetcher.prefetch(report_urls[start:until])
+        return analyse_lead(lead_id, lead_data, side_pool)
 
-        if not report_url:
-            print(f"⚠ Lead {lead.id} n'a pas de report_url")
-            continue
+    finishing = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as lead_pool, \
+            ThreadPoolExecutor(max_workers=max_workers) as side_pool:
+        for start in range(0, len(leads), batch_size):
+            batch = leads[start:start + batch_size]
 
-        # Télécharger le rapport depuis Cloudinary
-        try:
-            response = requests.get(report_url)
-            if response.status_code != 200:
-                print(f"⚠ Impossible de télécharger {report_url}")
-                continue
-            report_text = response.text
-        except Exception as e:
-            print(f"⚠ Erreur téléchargement {report_url} : {e}")
-            continue
+            # Phase 1 : téléchargement + parsing (lead et GPCT) des leads du lot
+            analyses = _run_phase({
+                lead_pool.submit(analyse_with_prefetch, index, lead_id, lead_data, side_pool): lead_id
+                for index, (lead_id, lead_data) in enumerate(batch, start=start)
+            }, f"parsing {start // batch_size + 1}")
 
-        # Analyse du lead
-        try:
-            parsed_lead = parsing_agent.parse_lead_report(report_text)
-            match_score, match_justification = matching_agent.calculate_match_score(icp, parsed_lead)
-            parsed_gcpt = qualification_parsing_agent.parse_report(report_text)
-            qualification_score, qualification_justification = qualification_judge_agent.judge_gcpt(parsed_gcpt)
-            scoring_result = scoring_agent.score_lead(
-                match_score,
-                match_justification,
-                qualification_score,
-                qualification_justification
-            )
-
-            qualification_result = {
-                "company_name": parsed_lead.get("company_name", "Inconnu"),
-                "match_score": match_score,
-                "qualification_score": qualification_score,
-                "final_score": scoring_result["final_score"],
-                "classification": scoring_result["classification"],
-                "justification": scoring_result["justification"]
-            }
-            leads_data.append(qualification_result)
-
-
-            db.collection("Leads").document(lead.id).update({
-                "qualification": qualification_result
+            # Phase 2 : scores sémantiques du lot en un seul batch SBERT
+            lead_ids = list(analyses)
+            semantic_scores = agents.matching.semantic_scores(icp, [analyses[lead_id]["parsed_lead"] for lead_id in lead_ids])
+
+            # Phase 3 : matching LLM, scoring et mise à jour Firestore, sans attendre :
+            # ces tâches passent avant celles du lot suivant dans la file du pool.
+            finishing.update({
+                lead_pool.submit(finish_lead, analyses[lead_id], icp, score): lead_id
+                for lead_id, score in zip(lead_ids, semantic_scores)
             })
-            print(f"✅ Lead {lead.id} analysé avec succès")
-            
-        except Exception as e:
-            print(f"⚠ Erreur analyse lead {lead.id} : {e}")
-            continue
+
+        results = _run_phase(finishing, "scoring")
+
+    for lead_id, qualification_result in results.items():
+        leads_data.append(qualification_result)
+        print(f"✅ Lead {lead_id} analysé avec succès")
+    print(f"📦 Rapports : {fetcher.stats()}")
+    print(f"🧾 Parsing JSON : {parse_stats()}")
 
     # ==== Génération du rapport PDF ====
     # if leads_data:
+    #     from Lead_Qualification.rapport_qualification import generer_rapport_pdf
     #     output_path = os.path.join("outputs", "rapport_final.pdf")
     #     generer_rapport_pdf(leads_data, output_path)
     #     print(f"✅ Rapport PDF généré : {output_path}")
     # else:
     #     print("⚠ Aucun lead analysé, pas de PDF généré.")
 
+    return leads_data
+
 if __name__ == "__main__":
     process_leads()
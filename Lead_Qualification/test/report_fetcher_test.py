@@ -0,0 +1,89 @@
+import sys
+import os
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Qualification.utils.report_fetcher import ReportFetcher
+
+URL = "https://res.cloudinary.com/demo/raw/upload/acme.txt"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Serves `body` with an ETag, answers 304 to a matching If-None-Match, or raises when `down`."""
+
+    def __init__(self, body="rapport v1"):
+        self.body = body
+        self.down = False
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        with self._lock:
+            self.requests.append(dict(headers or {}))
+        if self.down:
+            raise ConnectionError("network down")
+        etag = f'"{hash(self.body)}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {"ETag": etag})
+
+
+def make_fetcher(tmp_path, session, freshness=60):
+    store = DiskCache(str(tmp_path / "reports.sqlite3"), table="reports")
+    return ReportFetcher(store, freshness=freshness, max_workers=2, session=session)
+
+
+def test_fresh_hit(tmp_path):
+    session = FakeSession()
+    fetcher = make_fetcher(tmp_path, session)
+
+    assert fetcher.fetch(URL) == "rapport v1"
+    assert fetcher.fetch(URL) == "rapport v1"
+    assert len(session.requests) == 1
+    assert fetcher.stats()["fresh_hits"] == 1
+
+
+def test_revalidation_with_304(tmp_path):
+    session = FakeSession()
+    fetcher = make_fetcher(tmp_path, session, freshness=0)
+
+    assert fetcher.fetch(URL) == "rapport v1"
+    assert fetcher.fetch(URL) == "rapport v1"
+    assert "If-None-Match" in session.requests[-1]
+    assert fetcher.stats()["revalidated"] == 1
+
+    session.body = "rapport v2"
+    assert fetcher.fetch(URL) == "rapport v2"
+
+
+def test_stale_copy_on_error(tmp_path):
+    session = FakeSession()
+    fetcher = make_fetcher(tmp_path, session, freshness=0)
+
+    assert fetcher.fetch(URL) == "rapport v1"
+    session.down = True
+    assert fetcher.fetch(URL) == "rapport v1"
+    assert fetcher.stats()["stale_served"] == 1
+    assert fetcher.fetch("https://res.cloudinary.com/demo/raw/upload/other.txt") is None
+
+
+def test_finished_prefetch_is_not_reused(tmp_path):
+    session = FakeSession()
+    fetcher = make_fetcher(tmp_path, session, freshness=0)
+
+    fetcher.prefetch([URL])
+    fetcher._pool.shutdown(wait=True)
+    assert not fetcher._pending
+
+    # The next fetch revalidates instead of returning the old prefetched result.
+    session.body = "rapport v2"
+    assert fetcher.fetch(URL) == "rapport v2"
@@ -0,0 +1,70 @@
+"""
+Small local embedding server: one SentenceTransformer shared by every worker
+that sets EMBEDDING_SERVER_URL, instead of one copy per process.
+
+    python -m Lead_Qualification.utils.embedding_server --port 8765
+    EMBEDDING_SERVER_URL=http://127.0.0.1:8765 celery -A server.common.celery_config worker ...
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from Lead_Identification.common.config import SBERT_BATCH_SIZE, SBERT_MODEL_NAME
+from Lead_Qualification.utils.sbert import get_sbert_model
+
+_encode_lock = threading.Lock()
+
+
+class EmbeddingHandler(BaseHTTPRequestHandler):
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "model": SBERT_MODEL_NAME})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/encode":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            texts = body["texts"]
+            batch_size = body.get("batch_size") or SBERT_BATCH_SIZE
+        except Exception as e:
+            self._send_json(400, {"error": f"invalid request: {e}"})
+            return
+
+        # One encode at a time: the model already batches internally.
+        with _encode_lock:
+            embeddings = get_sbert_model().encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        self._send_json(200, {"model": SBERT_MODEL_NAME, "embeddings": embeddings.tolist()})
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SBERT embedding server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    get_sbert_model()
+    server = ThreadingHTTPServer((args.host, args.port), EmbeddingHandler)
+    print(f"✅ Embedding server ready on http://{args.host}:{args.port} ({SBERT_MODEL_NAME})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from Lead_Identification.common.config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_PATH,
+    SBERT_BATCH_SIZE,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Qualification.utils.sbert import get_sbert_encoder
+
+
+class EmbeddingStore:
+    """
+    Persistent SBERT embeddings, keyed by (model name, text hash).
+
+    `encode` returns one float32 row per text: stored vectors are read back,
+    and all missing texts are encoded together in a single batched call. The
+    encoder is only obtained when something actually needs encoding.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        store: Optional[DiskCache] = None,
+        batch_size: int = SBERT_BATCH_SIZE,
+        encoder_factory: Callable = get_sbert_encoder,
+    ):
+        self.model_name = model_name
+        self.store = store
+        self.batch_size = batch_size
+        self.encoder_factory = encoder_factory
+
+    def _key(self, text: str) -> str:
+        return f"{self.model_name}|{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing = {}
+        for i, text in enumerate(texts):
+            cached = self.store.get(self._key(text)) if self.store is not None else None
+            if cached is not None:
+                vectors[i] = np.frombuffer(cached, dtype=np.float32)
+            else:
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            unique_texts = list(missing)
+            encoded = self.encoder_factory().encode(unique_texts, batch_size=self.batch_size, convert_to_numpy=True)
+            for text, vector in zip(unique_texts, np.asarray(encoded, dtype=np.float32)):
+                if self.store is not None:
+                    self.store.set(self._key(text), vector.tobytes())
+                for i in missing[text]:
+                    vectors[i] = vector
+
+        if not vectors:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(vectors)
+
+
+def cosine_similarities(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row of `matrix` with `vector`."""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = matrix @ vector / norms
+    return np.nan_to_num(scores)
+
+
+_store: Optional[DiskCache] = None
+_store_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[DiskCache]:
+    """Returns the process-wide embedding cache, or None when it is disabled."""
+    global _store
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = DiskCache(EMBEDDING_CACHE_PATH, table="embeddings", max_entries=EMBEDDING_CACHE_MAX_ENTRIES)
+        return _store
@@ -0,0 +1,47 @@
+# Lead_Qualification/utils/justification.py
+#
+# Justification locale (sans LLM) du ScoringAgent : un paragraphe déterministe
+# construit à partir des justifications de matching et de qualification.
+
+import re
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+MAX_SENTENCE_CHARS = 220
+
+
+def first_sentence(text: str, max_chars: int = MAX_SENTENCE_CHARS) -> str:
+    """Première phrase non vide du texte, coupée proprement à `max_chars`."""
+    text = " ".join((text or "").split())
+    if not text:
+        return ""
+    sentence = SENTENCE_END.split(text, maxsplit=1)[0].rstrip(".!? ")
+    if len(sentence) > max_chars:
+        sentence = sentence[:max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+    return sentence
+
+
+def template_justification(
+    match_score: float,
+    match_justification: str,
+    qualification_score: float,
+    qualification_justification: str,
+    final_score: float,
+    classification: str
+) -> str:
+    """Paragraphe court : classification et scores, puis l'essentiel de chaque analyse."""
+    parts = [
+        f"Classified {classification} with a final score of {final_score}/100 "
+        f"(ICP match {match_score}/100, GPCT qualification {qualification_score}/100)."
+    ]
+    fit = first_sentence(match_justification)
+    if fit:
+        parts.append(f"Fit: {_end_sentence(fit)}")
+    qualification = first_sentence(qualification_justification)
+    if qualification:
+        parts.append(f"Qualification: {_end_sentence(qualification)}")
+    return " ".join(parts)
+
+
+def _end_sentence(sentence: str) -> str:
+    # Une phrase tronquée finit déjà par "…" : pas de point en plus.
+    return sentence if sentence.endswith("…") else sentence + "."
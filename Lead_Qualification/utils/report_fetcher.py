@@ -0,0 +1,154 @@
+# Lead_Qualification/utils/report_fetcher.py
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from Lead_Identification.common.config import (
+    REPORT_CACHE_ENABLED,
+    REPORT_CACHE_FRESHNESS,
+    REPORT_CACHE_MAX_BYTES,
+    REPORT_CACHE_PATH,
+    REPORT_FETCH_MAX_WORKERS,
+    REPORT_FETCH_TIMEOUT,
+)
+from Lead_Identification.common.disk_cache import DiskCache
+from Lead_Identification.common.llm_clients import get_http_session
+
+
+class ReportFetcher:
+    """
+    Téléchargement des rapports de leads (Cloudinary) sur la session keep-alive
+    partagée "reports", avec un cache local par URL.
+
+    Une entrée plus jeune que `freshness` secondes est servie sans réseau ; une
+    entrée plus ancienne est revalidée par GET conditionnel (ETag /
+    Last-Modified) et réutilisée sur 304. Le cache est borné en octets, éviction LRU.
+    `prefetch` télécharge en avance sur un pool borné, vers le cache ; `fetch`
+    réutilise un téléchargement encore en cours pour la même URL.
+    """
+
+    def __init__(self, store: Optional[DiskCache] = None, freshness: float = REPORT_CACHE_FRESHNESS,
+                 timeout: float = REPORT_FETCH_TIMEOUT, max_workers: int = REPORT_FETCH_MAX_WORKERS,
+                 session=None):
+        self.store = store
+        self.session = session
+        self.freshness = freshness
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-fetch")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"fresh_hits": 0, "revalidated": 0, "downloaded": 0, "stale_served": 0, "failed": 0, "prefetched": 0}
+
+    def _metric(self, key: str):
+        with self._lock:
+            self._metrics[key] += 1
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Contenu du rapport, ou None s'il n'a pas pu être téléchargé."""
+        with self._lock:
+            future = self._pending.get(url)
+        if future is not None:
+            return future.result()
+        return self._fetch(url)
+
+    def prefetch(self, urls: Iterable[str]):
+        """
+        Lance en arrière-plan le téléchargement des URLs qui ne sont pas déjà en
+        cours. Sans cache, le résultat n'aurait nulle part où attendre : no-op.
+        """
+        if self.store is None:
+            return
+        for url in urls:
+            if not url:
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                future = self._pool.submit(self._fetch, url)
+                self._pending[url] = future
+                self._metrics["prefetched"] += 1
+            # Hors du verrou : le callback s'exécute tout de suite si le future est déjà terminé.
+            future.add_done_callback(lambda done, url=url: self._forget(url, done))
+
+    def _forget(self, url: str, future: Future):
+        # Une fois terminé, le résultat est dans le cache : un fetch ultérieur repasse
+        # par la fraîcheur / revalidation au lieu de réutiliser un ancien résultat.
+        with self._lock:
+            if self._pending.get(url) is future:
+                del self._pending[url]
+
+    def _fetch(self, url: str) -> Optional[str]:
+        entry = self.store.get_json(url) if self.store else None
+        if entry is not None and time.time() - entry["validated_at"] <= self.freshness:
+            self._metric("fresh_hits")
+            return entry["text"]
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            session = self.session or get_http_session("reports")
+            response = session.get(url, headers=headers, timeout=self.timeout)
+        except Exception as e:
+            return self._failed(url, entry, f"Erreur téléchargement {url} : {e}")
+
+        if response.status_code == 304 and entry is not None:
+            entry["validated_at"] = time.time()
+            self.store.set_json(url, entry)
+            self._metric("revalidated")
+            return entry["text"]
+
+        if response.status_code != 200:
+            return self._failed(url, entry, f"Impossible de télécharger {url} (HTTP {response.status_code})")
+
+        text = response.text
+        if self.store:
+            now = time.time()
+            self.store.set_json(url, {
+                "text": text,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": now,
+                "validated_at": now,
+            })
+        self._metric("downloaded")
+        return text
+
+    def _failed(self, url: str, entry: Optional[Dict[str, Any]], message: str) -> Optional[str]:
+        # Les rapports publiés ne changent pas : une copie ancienne vaut mieux qu'aucun rapport.
+        if entry is not None:
+            print(f"⚠ {message} ; copie en cache utilisée")
+            self._metric("stale_served")
+            return entry["text"]
+        print(f"⚠ {message}")
+        self._metric("failed")
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._metrics)
+        if self.store:
+            stats["entries"] = self.store.stats()["entries"]
+        return stats
+
+
+_fetcher: Optional[ReportFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_report_fetcher() -> ReportFetcher:
+    """Fetcher partagé par le processus (cache désactivable par REPORT_CACHE_ENABLED)."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            store = None
+            if REPORT_CACHE_ENABLED:
+                store = DiskCache(REPORT_CACHE_PATH, table="reports", max_bytes=REPORT_CACHE_MAX_BYTES)
+            _fetcher = ReportFetcher(store)
+        return _fetcher
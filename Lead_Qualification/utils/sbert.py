@@ -0,0 +1,59 @@
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+from Lead_Identification.common.config import (
+    EMBEDDING_SERVER_TIMEOUT,
+    EMBEDDING_SERVER_URL,
+    SBERT_MODEL_NAME,
+)
+from Lead_Identification.common.llm_clients import get_http_session
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_sbert_model():
+    """
+    Returns the process-wide SentenceTransformer, loading it on first use.
+    sentence_transformers (and torch) are only imported here, so processes that
+    never compute embeddings do not pay for them.
+    """
+    global _model
+    with _model_lock:
+        if _model is None:
+            from sentence_transformers import SentenceTransformer
+            print(f"🧠 Chargement du modèle SBERT {SBERT_MODEL_NAME}...")
+            _model = SentenceTransformer(SBERT_MODEL_NAME)
+        return _model
+
+
+def preload_sbert_model():
+    """Loads the model ahead of time, e.g. in a Celery parent before it forks its workers."""
+    if not EMBEDDING_SERVER_URL:
+        get_sbert_model()
+
+
+class RemoteEncoder:
+    """Same `encode` interface as SentenceTransformer, backed by the local embedding server."""
+
+    def __init__(self, url: str, timeout: float = EMBEDDING_SERVER_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def encode(self, texts: List[str], batch_size: Optional[int] = None, convert_to_numpy: bool = True):
+        response = get_http_session("embeddings").post(
+            f"{self.url}/encode",
+            json={"texts": texts, "batch_size": batch_size},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return np.asarray(response.json()["embeddings"], dtype=np.float32)
+
+
+def get_sbert_encoder():
+    """Returns the embedding server client when EMBEDDING_SERVER_URL is set, else the in-process model."""
+    if EMBEDDING_SERVER_URL:
+        return RemoteEncoder(EMBEDDING_SERVER_URL)
+    return get_sbert_model()
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List
-from server.services.lead_service import get_all_leads
-from server.models.lead import Lead
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from typing import List, Optional
+from server.services.lead_service import get_all_leads, list_leads
+from server.models.lead import Lead, LeadPage
+from Lead_Identification.common.config import LEAD_PAGE_SIZE, LEAD_PAGE_MAX_SIZE
 
 router = APIRouter()
 
@@ -14,3 +15,46 @@ def get_leads_endpoint(service_id: str ):
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         raise HTTPException(status_code=500, detail="An error occurred while retrieving leads.")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+@router.get("/list/{service_id}", response_model=LeadPage, response_model_exclude_unset=True)
+def list_leads_endpoint(
+    service_id: str,
+    response: Response,
+    limit: int = Query(LEAD_PAGE_SIZE, ge=1, le=LEAD_PAGE_MAX_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, e.g. company_name,qualification.final_score"),
+    classification: Optional[str] = None,
+    min_score: Optional[float] = None,
+    sort: str = Query("id", description="id, score or classification"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Paginated listing; pass `next_cursor` back as `cursor` for the next page. Supports If-None-Match."""
+    try:
+        page = list_leads(
+            service_id,
+            limit=limit,
+            cursor=cursor,
+            fields=[field.strip() for field in fields.split(",") if field.strip()] if fields else None,
+            classification=classification,
+            min_score=min_score,
+            sort=sort,
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="An error occurred while retrieving leads.")
+
+    etag = page.pop("etag")
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return page
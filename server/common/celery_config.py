@@ -1,5 +1,6 @@
 # Automated_lead_engagement/server/common/celery_config.py
 from celery import Celery
+from celery.signals import worker_init
 
 celery_app = Celery(
     "lead_generator",
@@ -8,7 +9,7 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    imports=('server.scripts.celery_test', 'server.services.identification_service',)
+    imports=('server.scripts.celery_test', 'server.services.identification_service', 'server.services.pipeline_tasks',)
 )
 
 celery_app.conf.task_routes = {
@@ -16,3 +17,10 @@ celery_app.conf.task_routes = {
 }
 
 
+@worker_init.connect
+def preload_models(**kwargs):
+    # Optional: load SBERT once in the parent so prefork children share it copy-on-write.
+    from Lead_Identification.common.config import SBERT_PRELOAD
+    if SBERT_PRELOAD:
+        from Lead_Qualification.utils.sbert import preload_sbert_model
+        preload_sbert_model()
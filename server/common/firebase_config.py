@@ -1,15 +1,26 @@
+import threading
+
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials
+
+CREDENTIALS_PATH = "server/utils/firebase_cred.json"
 
-# Load Firebase credentials only once
-cred = credentials.Certificate("server/utils/firebase_cred.json")
+_db = None
+_db_lock = threading.Lock()
 
 
 def get_firestore_db():
-    # Initialize Firebase app if not already initialized
-    if not firebase_admin._apps:
-        firebase_admin.initialize_app(cred)
+    # Credentials, the Firebase app and the Firestore client (grpc) are only
+    # loaded on first use, so importing the server stays cheap.
+    global _db
+    with _db_lock:
+        if _db is None:
+            from firebase_admin import firestore
+
+            # Initialize Firebase app if not already initialized
+            if not firebase_admin._apps:
+                firebase_admin.initialize_app(credentials.Certificate(CREDENTIALS_PATH))
 
-    # Expose Firestore DB
-    db = firestore.client()
-    return db
+            # Expose Firestore DB
+            _db = firestore.client()
+        return _db
@@ -0,0 +1,18 @@
+import threading
+
+from Lead_Identification.common.config import REDIS_URL
+
+_redis = None
+_redis_lock = threading.Lock()
+
+
+def get_redis():
+    # The client only opens connections on first command; the import is
+    # deferred too, so importing the server stays cheap.
+    global _redis
+    with _redis_lock:
+        if _redis is None:
+            import redis
+
+            _redis = redis.Redis.from_url(REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
+        return _redis
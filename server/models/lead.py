@@ -13,3 +13,26 @@ class Lead(BaseModel):
     report_url: Optional[str] = ""
     qualification_url: Optional[str] = ""
     service_id: str 
+
+class Qualification(BaseModel):
+    company_name: Optional[str] = None
+    match_score: Optional[float] = None
+    qualification_score: Optional[float] = None
+    final_score: Optional[float] = None
+    classification: Optional[str] = None
+    justification: Optional[str] = None
+    justification_source: Optional[str] = None
+
+class LeadSummary(BaseModel):
+    # Every field but the id is optional: a listing only returns the projected fields.
+    id: str
+    company_name: Optional[str] = None
+    key_personals: Optional[List[KeyPersonal]] = None
+    report_url: Optional[str] = None
+    qualification_url: Optional[str] = None
+    service_id: Optional[str] = None
+    qualification: Optional[Qualification] = None
+
+class LeadPage(BaseModel):
+    leads: List[LeadSummary]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
 
 class Service(BaseModel):
     id: str
@@ -7,6 +7,8 @@ class Service(BaseModel):
     service_name: str
     icp: Dict
     generation_status: str
+    # Set when the run is done: deferred LLM justifications may still replace template ones.
+    justifications_deferred: Optional[bool] = None
     created_at: str = ""
 
 
@@ -0,0 +1,101 @@
+# server/scripts/check_import_budget.py
+#
+# Measures the import time of each entry point with `python -X importtime` and
+# fails when one goes over its budget, so cold starts of autoscaled workers
+# do not silently regress.
+#
+#   python -m server.scripts.check_import_budget
+#   python -m server.scripts.check_import_budget --repeat 5 --budget server.main=800
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+
+# Entry point -> (code to import it, budget in milliseconds)
+ENTRY_POINTS: Dict[str, Tuple[str, float]] = {
+    "server.main": ("import server.main", 1500),
+    "celery worker": (
+        "import server.common.celery_config, server.services.identification_service, "
+        "server.services.pipeline_tasks, server.scripts.celery_test",
+        1000,
+    ),
+    "Lead_Qualification.main": ("import Lead_Qualification.main", 1000),
+}
+
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(code: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Imports `code` in a fresh interpreter. Returns the total import time in ms
+    and the slowest top-level imports as (module, cumulative ms).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        last_line = (result.stderr.strip().splitlines() or ["unknown error"])[-1]
+        raise RuntimeError(last_line)
+
+    total_us = 0
+    top_level = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        if len(indent) == 1:
+            top_level.append((module, int(cumulative_us) / 1000))
+    top_level.sort(key=lambda item: item[1], reverse=True)
+    return total_us / 1000, top_level
+
+
+def parse_overrides(values: List[str]) -> Dict[str, float]:
+    overrides = {}
+    for value in values:
+        name, _, budget = value.rpartition("=")
+        overrides[name] = float(budget)
+    return overrides
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check for the entry points")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point; the fastest is kept")
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level imports to show")
+    parser.add_argument("--budget", action="append", default=[], metavar="NAME=MS", help="override a budget")
+    args = parser.parse_args()
+
+    overrides = parse_overrides(args.budget)
+    failures = 0
+
+    for name, (code, budget) in ENTRY_POINTS.items():
+        budget = overrides.get(name, budget)
+        try:
+            runs = [measure(code) for _ in range(max(1, args.repeat))]
+        except RuntimeError as e:
+            print(f"❌ {name}: import failed ({e})")
+            failures += 1
+            continue
+
+        total, top_level = min(runs, key=lambda run: run[0])
+        status = "✅" if total <= budget else "❌"
+        print(f"{status} {name}: {total:.0f} ms (budget {budget:.0f} ms)")
+        for module, cumulative in top_level[:args.top]:
+            print(f"     {cumulative:8.1f} ms  {module}")
+        if total > budget:
+            failures += 1
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,21 @@
 # Automated_lead_engagement/server/services/identification_service.py
-from firebase_admin import firestore
 from server.common.firebase_config import get_firestore_db
-from celery import shared_task
 from server.common.celery_config import celery_app
-from Lead_Identification.integration.identification import run_lead_pipeline
-from Lead_Qualification.main import process_leads
-
-db= get_firestore_db()
+from server.services.pipeline_tasks import start_pipeline
+from server.services.lead_cache import bump_leads_version
 
 @celery_app.task
 def run_pipeline_task(icp: dict, service_id: str):
+    """
+    Former monolithic pipeline task, kept so messages already queued still run:
+    it now starts the stage-level DAG (see pipeline_tasks).
+    """
     print("Running pipeline task***")
-    db= get_firestore_db()
-    try:
-        print(f"Running lead pipeline for service_id: {service_id} with ICP: {icp}")
-        run_lead_pipeline(icp, service_id)
-        db.collection("services").document(service_id).update({"generation_status": "done"})
-    except Exception as e:
-        db.collection("services").document(service_id).update({"generation_status": "error"})
-        raise e
-    print ("=========start lead qualification=====")
-    try:
-        process_leads(service_id)
-        print("Lead qualification completed successfully")
-        
-    except Exception as e:
-        print(f"Error during lead qualification: {e}")
-        
-        raise e
-    
+    return start_pipeline(icp, service_id)
 
 
 def get_icp(service_id: str) -> dict:
+    db = get_firestore_db()
     doc = db.collection("services").document(service_id).get()
     if doc.exists:
         return doc.to_dict().get("icp")
@@ -39,7 +23,9 @@ def get_icp(service_id: str) -> dict:
         raise ValueError("Service not found")
 
 def update_generation_status(service_id: str, status: str):
+    db = get_firestore_db()
     db.collection("services").document(service_id).update({"generation_status": status})
+    bump_leads_version(service_id)
 
 def generate_leads(service_id: str):
     try:
@@ -48,8 +34,8 @@ def generate_leads(service_id: str):
         print(f"Fetching ICP for service_id: {service_id}")
         icp = get_icp(service_id)
         print(f"ICP fetched")
-        print(f"Running pipeline task for service_id: {service_id}")
-        run_pipeline_task.delay(icp, service_id)
+        print(f"Starting lead pipeline for service_id: {service_id}")
+        start_pipeline(icp, service_id)
     except Exception as e:
         update_generation_status(service_id, "error")
         print(f"Error generating leads for service_id {service_id}: {e}")
@@ -0,0 +1,64 @@
+# Automated_lead_engagement/server/services/lead_cache.py
+#
+# Short-lived Redis cache of lead listing pages:
+#   leads:version:{service_id}                     bumped by the pipeline
+#   leads:page:{service_id}:{version}:{params}     page payload, LEAD_LIST_CACHE_TTL seconds
+# Bumping the version makes every cached page of the service unreachable at
+# once; the TTL bounds staleness for writes that do not bump it (late LLM
+# justifications, manual deletions). Redis errors are logged and treated as
+# cache misses: the listing then reads Firestore directly.
+
+import hashlib
+import json
+from typing import Dict, Optional
+
+from Lead_Identification.common.config import LEAD_LIST_CACHE_ENABLED, LEAD_LIST_CACHE_TTL
+from server.common.redis_config import get_redis
+
+
+def _version_key(service_id: str) -> str:
+    return f"leads:version:{service_id}"
+
+
+def _page_key(service_id: str, version: int, params: Dict) -> str:
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+    return f"leads:page:{service_id}:{version}:{digest}"
+
+
+def current_version(service_id: str) -> Optional[int]:
+    """Cache version of the service's pages, or None when the cache is disabled or unavailable."""
+    if not LEAD_LIST_CACHE_ENABLED:
+        return None
+    try:
+        value = get_redis().get(_version_key(service_id))
+    except Exception as e:
+        print(f"[⚠️] Lead cache unavailable: {e}")
+        return None
+    return int(value) if value else 0
+
+
+def bump_leads_version(service_id: str):
+    """Invalidates every cached listing page of the service."""
+    if not LEAD_LIST_CACHE_ENABLED:
+        return
+    try:
+        get_redis().incr(_version_key(service_id))
+    except Exception as e:
+        print(f"[⚠️] Could not invalidate lead cache of {service_id}: {e}")
+
+
+def get_page(service_id: str, version: int, params: Dict) -> Optional[Dict]:
+    try:
+        cached = get_redis().get(_page_key(service_id, version, params))
+    except Exception as e:
+        print(f"[⚠️] Lead cache unavailable: {e}")
+        return None
+    return json.loads(cached) if cached else None
+
+
+def set_page(service_id: str, version: int, params: Dict, page: Dict):
+    # Stored under the version read before the Firestore query: a bump during the query wins.
+    try:
+        get_redis().set(_page_key(service_id, version, params), json.dumps(page, default=str), ex=LEAD_LIST_CACHE_TTL)
+    except Exception as e:
+        print(f"[⚠️] Could not cache lead page: {e}")
@@ -1,11 +1,26 @@
-from typing import List
-from firebase_admin import firestore
+import base64
+import hashlib
+import json
+from typing import Dict, List, Optional
 from server.common.firebase_config import get_firestore_db
-from server.models.lead import Lead  # assuming Lead model is defined using Pydantic
+from server.models.lead import Lead, Qualification  # assuming Lead model is defined using Pydantic
+from server.services import lead_cache
+from Lead_Identification.common.config import LEAD_PAGE_SIZE, LEAD_PAGE_MAX_SIZE
+
+# Sort orders of the listing: (field path, direction) before the document id tie-breaker.
+# Sorting on a qualification field only returns qualified leads (Firestore skips
+# documents missing an order field); each order needs its composite index with service_id.
+SORTS = {
+    "id": [],
+    "score": [("qualification.final_score", "DESCENDING")],
+    "classification": [("qualification.classification", "ASCENDING"), ("qualification.final_score", "DESCENDING")],
+}
+LEAD_FIELDS = {"company_name", "key_personals", "report_url", "qualification_url", "service_id", "qualification"}
+QUALIFICATION_FIELDS = set(Qualification.__fields__)
 
-db = get_firestore_db()
 
 def get_all_leads(service_id: str) -> List[Lead]:
+    db = get_firestore_db()
     # Check if generation is done
     service_doc = db.collection("services").document(service_id).get()
     if not service_doc.exists:
@@ -25,3 +40,129 @@ def get_all_leads(service_id: str) -> List[Lead]:
         leads.append(Lead(**lead_data))
 
     return leads
+
+
+def _check_generation_done(db, service_id: str):
+    service_doc = db.collection("services").document(service_id).get()
+    if not service_doc.exists:
+        raise ValueError("Service not found")
+    if service_doc.to_dict().get("generation_status") != "done":
+        raise ValueError("Lead generation not completed yet")
+
+
+def _parse_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    for field in fields:
+        head, _, sub = field.partition(".")
+        if head not in LEAD_FIELDS or (sub and (head != "qualification" or sub not in QUALIFICATION_FIELDS)):
+            raise ValueError(f"Unknown lead field: {field}")
+    return _without_covered(fields)
+
+
+def _without_covered(field_paths) -> List[str]:
+    # Firestore rejects a projection holding both "qualification" and "qualification.x".
+    field_paths = set(field_paths)
+    return sorted(path for path in field_paths if path.partition(".")[0] not in field_paths - {path})
+
+
+def _encode_cursor(values: List, doc_id: str) -> str:
+    payload = json.dumps({"values": values, "id": doc_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor: str, order: List) -> List:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        values, doc_id = payload["values"], payload["id"]
+    except Exception:
+        raise ValueError("Invalid cursor") from None
+    if len(values) != len(order):
+        raise ValueError("Cursor does not match the sort order")
+    return values + [doc_id]
+
+
+def _nested_value(data: Dict, field_path: str):
+    for key in field_path.split("."):
+        data = (data or {}).get(key)
+    return data
+
+
+def _query_page(service_id: str, limit: int, cursor: Optional[str], fields: Optional[List[str]],
+                classification: Optional[str], min_score: Optional[float], sort: str) -> Dict:
+    from google.cloud.firestore_v1 import FieldPath
+
+    db = get_firestore_db()
+    if cursor is None:
+        # Later pages come from a cursor handed out by a first page, once generation was done.
+        _check_generation_done(db, service_id)
+
+    order = SORTS[sort]
+    query = db.collection("Leads").where("service_id", "==", service_id)
+    if classification:
+        query = query.where("qualification.classification", "==", classification)
+    if min_score is not None:
+        query = query.where("qualification.final_score", ">=", min_score)
+    for field_path, direction in order:
+        query = query.order_by(field_path, direction=direction)
+    query = query.order_by(FieldPath.document_id())
+    if fields:
+        # Sort fields are always read: the next cursor is built from them.
+        query = query.select(_without_covered(set(fields) | {field_path for field_path, _ in order}))
+    if cursor:
+        query = query.start_after(_decode_cursor(cursor, order))
+
+    docs = list(query.limit(limit + 1).stream())
+    leads = []
+    for doc in docs[:limit]:
+        lead_data = doc.to_dict()
+        lead_data["id"] = doc.id
+        leads.append(lead_data)
+
+    next_cursor = None
+    if len(docs) > limit:
+        last = leads[-1]
+        next_cursor = _encode_cursor([_nested_value(last, field_path) for field_path, _ in order], last["id"])
+    return {"leads": leads, "next_cursor": next_cursor}
+
+
+def list_leads(
+    service_id: str,
+    limit: int = LEAD_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    classification: Optional[str] = None,
+    min_score: Optional[float] = None,
+    sort: str = "id",
+) -> Dict:
+    """
+    One page of the service's leads: {"leads", "next_cursor", "etag"}.
+
+    `fields` projects the documents (e.g. ["company_name", "qualification.final_score"]
+    to skip key_personals); `next_cursor` is None on the last page. Pages are
+    cached in Redis for a few seconds, keyed on the service's cache version,
+    so polling dashboards mostly skip Firestore.
+    """
+    if sort not in SORTS:
+        raise ValueError(f"Unknown sort: {sort} (expected one of {', '.join(SORTS)})")
+    if min_score is not None and sort != "score":
+        # Firestore orders a range filter's field first.
+        raise ValueError("min_score requires sort=score")
+    limit = max(1, min(limit, LEAD_PAGE_MAX_SIZE))
+    fields = _parse_fields(fields)
+
+    params = {
+        "limit": limit, "cursor": cursor, "fields": fields,
+        "classification": classification, "min_score": min_score, "sort": sort,
+    }
+    version = lead_cache.current_version(service_id)
+    if version is not None:
+        page = lead_cache.get_page(service_id, version, params)
+        if page is not None:
+            return page
+
+    page = _query_page(service_id, limit, cursor, fields, classification, min_score, sort)
+    page["etag"] = '"' + hashlib.sha256(json.dumps(page, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32] + '"'
+    if version is not None:
+        lead_cache.set_page(service_id, version, params, page)
+    return page
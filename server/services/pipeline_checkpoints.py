@@ -0,0 +1,138 @@
+# Automated_lead_engagement/server/services/pipeline_checkpoints.py
+#
+# Checkpoints of the lead pipeline DAG, stored in Firestore:
+#   pipeline_runs/{run_id}                        run status, ICP, detection result
+#   pipeline_runs/{run_id}/companies/{company_id} per-company stage and outputs
+# A retried task reads its checkpoint first and skips work that already finished.
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from server.common.firebase_config import get_firestore_db
+
+RUNS_COLLECTION = "pipeline_runs"
+
+# Per-company stages, in order.
+STAGES = ["detected", "enriched", "uploaded", "qualified"]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _run_ref(run_id: str):
+    return get_firestore_db().collection(RUNS_COLLECTION).document(run_id)
+
+
+def _company_ref(run_id: str, company_id: str):
+    return _run_ref(run_id).collection("companies").document(company_id)
+
+
+def create_run(run_id: str, service_id: str, icp: Dict):
+    _run_ref(run_id).set({
+        "service_id": service_id,
+        "icp": icp,
+        "status": "running",
+        "detection_done": False,
+        "created_at": _now(),
+        "updated_at": _now(),
+    }, merge=True)
+
+
+def get_run(run_id: str) -> Optional[Dict]:
+    doc = _run_ref(run_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def update_run(run_id: str, **fields):
+    fields["updated_at"] = _now()
+    _run_ref(run_id).set(fields, merge=True)
+
+
+def add_detected_company(run_id: str, company_id: str, lead: Dict) -> bool:
+    """
+    Checkpoints a company streamed out of detection. Returns True when its
+    chain must be dispatched, False when a previous attempt already did it
+    (then only its lead is refreshed).
+    """
+    ref = _company_ref(run_id, company_id)
+    doc = ref.get()
+    if doc.exists and doc.to_dict().get("dispatched"):
+        ref.set({"lead": lead, "updated_at": _now()}, merge=True)
+        return False
+    ref.set({
+        "lead": lead,
+        "stage": "detected",
+        "failed": False,
+        "dispatched": True,
+        "updated_at": _now(),
+    }, merge=True)
+    return True
+
+
+def update_company_leads(run_id: str, companies: Dict[str, Dict]):
+    """Writes the final merged leads ({company_id: lead}) without touching stages."""
+    db = get_firestore_db()
+    items = list(companies.items())
+    for start in range(0, len(items), 500):
+        batch = db.batch()
+        for company_id, lead in items[start:start + 500]:
+            batch.set(_company_ref(run_id, company_id), {"lead": lead, "updated_at": _now()}, merge=True)
+        batch.commit()
+
+
+def mark_finished(run_id: str, company_id: str):
+    """The company's chain is over, whether it succeeded or failed."""
+    _company_ref(run_id, company_id).set({"finished": True, "updated_at": _now()}, merge=True)
+
+
+def claim_finalization(run_id: str) -> bool:
+    """Atomically flags the run as finalizing; True for the single caller that wins."""
+    from google.cloud import firestore
+
+    ref = _run_ref(run_id)
+
+    @firestore.transactional
+    def claim(transaction) -> bool:
+        snapshot = ref.get(transaction=transaction)
+        if (snapshot.to_dict() or {}).get("finalize_claimed"):
+            return False
+        transaction.update(ref, {"finalize_claimed": True, "updated_at": _now()})
+        return True
+
+    return claim(get_firestore_db().transaction())
+
+
+def get_company(run_id: str, company_id: str) -> Optional[Dict]:
+    doc = _company_ref(run_id, company_id).get()
+    return doc.to_dict() if doc.exists else None
+
+
+def reached(checkpoint: Optional[Dict], stage: str) -> bool:
+    """True if the company's checkpoint is at `stage` or further."""
+    if not checkpoint:
+        return False
+    return STAGES.index(checkpoint.get("stage", "detected")) >= STAGES.index(stage)
+
+
+def mark_stage(run_id: str, company_id: str, stage: str, **outputs):
+    outputs.update({"stage": stage, "updated_at": _now()})
+    _company_ref(run_id, company_id).set(outputs, merge=True)
+
+
+def mark_failed(run_id: str, company_id: str, stage: str, error: str):
+    _company_ref(run_id, company_id).set({
+        "failed": True,
+        "failed_stage": stage,
+        "error": error,
+        "updated_at": _now(),
+    }, merge=True)
+
+
+def list_companies(run_id: str) -> List[Dict]:
+    companies = []
+    for doc in _run_ref(run_id).collection("companies").stream():
+        company = doc.to_dict()
+        company["company_id"] = doc.id
+        companies.append(company)
+    return companies
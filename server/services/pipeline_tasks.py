@@ -0,0 +1,242 @@
+# Automated_lead_engagement/server/services/pipeline_tasks.py
+#
+# The lead pipeline as a DAG of Celery tasks:
+#
+#   detect_task ──► per company, as soon as detection emits it:
+#                       enrich_task → upload_task → qualify_task → company_done_task
+#               ──► finalize_task, once detection is over and every company chain has finished
+#
+# Detection streams deduplicated companies, and each company's chain is dispatched
+# as soon as it is emitted, so enrichment overlaps with detection still running.
+# Every stage checkpoints its output (see pipeline_checkpoints); a retried task
+# resumes from the last finished stage. A company that still fails after its
+# retries, or whose chain raises, is marked failed and skipped by the later
+# stages. If detection or finalize_task fails, the run and its service are
+# marked as errored.
+#
+# "done" does not wait for deferred justifications (JUSTIFICATION_BACKEND=
+# "deferred"): they run in the worker that qualified each lead and may replace
+# a lead's template paragraph after the run is done. finalize_task then sets
+# justifications_deferred on the service; a lead's own justification_source
+# turns "llm" once its paragraph has arrived.
+
+import uuid
+from typing import Dict, Optional
+
+from celery import chain
+
+from Lead_Identification.common.config import JUSTIFICATION_BACKEND
+from server.common.celery_config import celery_app
+from server.common.firebase_config import get_firestore_db
+from server.services import pipeline_checkpoints as checkpoints
+from server.services.lead_cache import bump_leads_version
+
+TASK_OPTIONS = {"bind": True, "max_retries": 3, "acks_late": True}
+RETRY_BASE_DELAY = 10
+
+
+def _retry_delay(task) -> int:
+    return RETRY_BASE_DELAY * (2 ** task.request.retries)
+
+
+def _retry_or_fail(task, run_id: str, company_id: str, stage: str, error: Exception):
+    """Retries the task with exponential backoff; once out of retries, marks the company failed."""
+    if task.request.retries < task.max_retries:
+        raise task.retry(exc=error, countdown=_retry_delay(task))
+    print(f"[❌] {company_id}: stage '{stage}' failed after {task.max_retries} retries: {error}")
+    try:
+        checkpoints.mark_failed(run_id, company_id, stage, str(error))
+    except Exception as e:
+        # The later stages still skip work they cannot do; the chain must not fail here.
+        print(f"[⚠️] {company_id}: could not checkpoint the failure: {e}")
+
+
+def _require(checkpoint: Optional[Dict], what: str) -> Dict:
+    if checkpoint is None:
+        raise LookupError(f"missing checkpoint: {what}")
+    return checkpoint
+
+
+def _fail_run(run_id: str, error: str):
+    """Marks the run and its service as errored. Never raises: it runs from error handlers."""
+    try:
+        checkpoints.update_run(run_id, status="error", error=error)
+        run = checkpoints.get_run(run_id)
+        if run:
+            _set_generation_status(run["service_id"], "error")
+    except Exception as e:
+        print(f"[❌] Run {run_id}: could not record the failure ({error}): {e}")
+
+
+def _set_generation_status(service_id: str, status: str, **fields):
+    get_firestore_db().collection("services").document(service_id).update({"generation_status": status, **fields})
+    # Cached lead listings of the service are stale once the run ends.
+    bump_leads_version(service_id)
+
+
+def start_pipeline(icp: Dict, service_id: str, run_id: Optional[str] = None) -> str:
+    """Creates the run checkpoint and dispatches the DAG. Returns the run id."""
+    run_id = run_id or str(uuid.uuid4())
+    checkpoints.create_run(run_id, service_id, icp)
+    detect_task.delay(run_id)
+    print(f"[🚀] Pipeline run {run_id} started for service {service_id}")
+    return run_id
+
+
+def _dispatch_company(run_id: str, company_id: str):
+    chain(
+        enrich_task.si(run_id, company_id),
+        upload_task.si(run_id, company_id),
+        qualify_task.si(run_id, company_id),
+        company_done_task.si(run_id, company_id),
+    ).on_error(company_failed_task.s(run_id, company_id)).delay()
+
+
+def _maybe_finalize(run_id: str):
+    """Dispatches finalize_task once detection is over and every dispatched company has finished."""
+    run = checkpoints.get_run(run_id)
+    if not run or not run.get("detection_done"):
+        return
+    companies = checkpoints.list_companies(run_id)
+    if any(c.get("dispatched") and not c.get("finished") for c in companies):
+        return
+    if checkpoints.claim_finalization(run_id):
+        finalize_task.s(run_id).on_error(pipeline_failed_task.s(run_id)).delay()
+
+
+@celery_app.task(**TASK_OPTIONS)
+def detect_task(self, run_id: str):
+    try:
+        run = _require(checkpoints.get_run(run_id), f"run {run_id}")
+        if run.get("detection_done"):
+            # Every company was dispatched before detection was marked done.
+            company_ids = run.get("company_ids", [])
+            print(f"[↩️] Run {run_id}: reusing checkpointed detection ({len(company_ids)} companies)")
+        else:
+            from Lead_Identification.detection.detection_agent import stream_detected_companies
+            from Lead_Identification.enrichment.upload_to_firestore import lead_document_id
+
+            print("==========[🔎] Starting streaming detection...===============")
+            companies = {}
+            for company in stream_detected_companies(run["icp"]):
+                company_id = lead_document_id(run["service_id"], company["company_name"])
+                companies[company_id] = company
+                # Companies already dispatched by a previous attempt of this task are not re-run.
+                if checkpoints.add_detected_company(run_id, company_id, company):
+                    _dispatch_company(run_id, company_id)
+            # Duplicates found after a company was emitted merged people and URLs into it:
+            # stages that have not started yet pick up the merged lead.
+            checkpoints.update_company_leads(run_id, companies)
+            company_ids = list(companies)
+            checkpoints.update_run(run_id, detection_done=True, company_ids=company_ids)
+            print(f"[✅] Detection complete. {len(company_ids)} leads found.")
+        # Chains that finished before detection did left the finalization to us.
+        _maybe_finalize(run_id)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=_retry_delay(self))
+        _fail_run(run_id, str(e))
+        raise
+    return len(company_ids)
+
+
+@celery_app.task(**TASK_OPTIONS)
+def enrich_task(self, run_id: str, company_id: str):
+    try:
+        company = _require(checkpoints.get_company(run_id, company_id), f"company {company_id}")
+        if company.get("failed") or checkpoints.reached(company, "enriched"):
+            return company_id
+
+        from Lead_Identification.enrichment.enrichir import enrich_company
+
+        report_urls = enrich_company(company["lead"])
+        checkpoints.mark_stage(run_id, company_id, "enriched", report_urls=report_urls)
+        print(f"[✅] Enriched {company['lead'].get('company_name')}")
+    except Exception as e:
+        _retry_or_fail(self, run_id, company_id, "enriched", e)
+    return company_id
+
+
+@celery_app.task(**TASK_OPTIONS)
+def upload_task(self, run_id: str, company_id: str):
+    try:
+        company = _require(checkpoints.get_company(run_id, company_id), f"company {company_id}")
+        if company.get("failed") or checkpoints.reached(company, "uploaded"):
+            return company_id
+
+        from Lead_Identification.enrichment.upload_to_firestore import upload_leads_to_firestore
+
+        run = _require(checkpoints.get_run(run_id), f"run {run_id}")
+        summary = upload_leads_to_firestore([company["lead"]], company.get("report_urls", {}), run["service_id"])
+        if not summary["written"]:
+            raise RuntimeError("lead was not written to Firestore")
+        checkpoints.mark_stage(run_id, company_id, "uploaded", lead_id=summary["ids"][0])
+    except Exception as e:
+        _retry_or_fail(self, run_id, company_id, "uploaded", e)
+    return company_id
+
+
+@celery_app.task(**TASK_OPTIONS)
+def qualify_task(self, run_id: str, company_id: str) -> Dict:
+    try:
+        company = _require(checkpoints.get_company(run_id, company_id), f"company {company_id}")
+        if company.get("failed") or checkpoints.reached(company, "qualified"):
+            return {"company_id": company_id, "failed": bool(company.get("failed"))}
+
+        from Lead_Qualification.main import qualify_lead
+
+        run = _require(checkpoints.get_run(run_id), f"run {run_id}")
+        qualification = qualify_lead(company.get("lead_id", company_id), run["icp"])
+        if qualification is None:
+            # No report to qualify: retrying will not help.
+            checkpoints.mark_failed(run_id, company_id, "qualified", "lead could not be analysed")
+            return {"company_id": company_id, "failed": True}
+        checkpoints.mark_stage(run_id, company_id, "qualified", qualification=qualification)
+    except Exception as e:
+        _retry_or_fail(self, run_id, company_id, "qualified", e)
+        return {"company_id": company_id, "failed": True}
+    return {"company_id": company_id, "failed": False}
+
+
+@celery_app.task(**TASK_OPTIONS)
+def company_done_task(self, run_id: str, company_id: str):
+    try:
+        checkpoints.mark_finished(run_id, company_id)
+        _maybe_finalize(run_id)
+    except Exception as e:
+        raise self.retry(exc=e, countdown=_retry_delay(self))
+    return company_id
+
+
+@celery_app.task
+def company_failed_task(request, exc, traceback, run_id: str, company_id: str):
+    """Errback of a company chain (Celery calls it with the failed task's request)."""
+    print(f"[❌] {company_id}: chain failed in task {getattr(request, 'id', '?')}: {exc}")
+    try:
+        checkpoints.mark_failed(run_id, company_id, "chain", str(exc))
+        checkpoints.mark_finished(run_id, company_id)
+        _maybe_finalize(run_id)
+    except Exception as e:
+        print(f"[❌] {company_id}: could not record the chain failure: {e}")
+
+
+@celery_app.task(bind=True)
+def finalize_task(self, run_id: str):
+    run = checkpoints.get_run(run_id)
+    companies = checkpoints.list_companies(run_id)
+    summary = {
+        "companies": len(companies),
+        "qualified": sum(1 for c in companies if c.get("stage") == "qualified"),
+        "failed": sum(1 for c in companies if c.get("failed")),
+    }
+    checkpoints.update_run(run_id, status="done", summary=summary)
+    _set_generation_status(run["service_id"], "done", justifications_deferred=JUSTIFICATION_BACKEND == "deferred")
+    print(f"==========[🏁] Run {run_id} finished: {summary}=============")
+    return summary
+
+
+@celery_app.task
+def pipeline_failed_task(request, exc, traceback, run_id: str):
+    """Errback of finalize_task (Celery calls it with the failed task's request)."""
+    print(f"[❌] Run {run_id}: pipeline failed in task {getattr(request, 'id', '?')}: {exc}")
+    _fail_run(run_id, str(exc))
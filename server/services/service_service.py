@@ -5,9 +5,9 @@ from server.common.firebase_config import get_firestore_db
 from server.models.service import Service
 import uuid
 from typing import Optional, Dict
-db= get_firestore_db()
 
 def add_service(service: Service):
+    db = get_firestore_db()
     service_dict = service.dict()
     service_ref = db.collection("services").document(service.id)
     service_ref.set(service_dict)
@@ -15,14 +15,17 @@ def add_service(service: Service):
 
 
 def delete_service(service_id: str):
+    db = get_firestore_db()
     db.collection("services").document(service_id).delete()
 
 
 def change_icp(service_id: str, icp: Dict):
+    db = get_firestore_db()
     service_ref = db.collection("services").document(service_id)
     service_ref.update({"icp": icp})
 
 def get_service(service_id: str) -> Optional[Service]:
+    db = get_firestore_db()
     service_ref = db.collection("services").document(service_id)
     service_data = service_ref.get().to_dict()
     if service_data:
@@ -30,6 +33,7 @@ def get_service(service_id: str) -> Optional[Service]:
     return None
 
 def get_all_services() -> list[Service]:
+    db = get_firestore_db()
     print("Fetching all services")
     services_ref = db.collection("services").stream()
     if not services_ref:
@@ -0,0 +1,221 @@
+import sys
+import os
+from functools import cmp_to_key
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from fastapi import Response
+
+from server.api.endpoints import lead as lead_endpoint
+from server.services import lead_cache, lead_service
+
+SERVICE_ID = "svc-1"
+
+
+def nested(data, field_path):
+    for key in field_path.split("."):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeDocument:
+    def __init__(self, docs, doc_id):
+        self._docs, self.id = docs, doc_id
+
+    def get(self):
+        return FakeSnapshot(self.id, self._docs.get(self.id))
+
+
+class FakeQuery:
+    """The subset of Firestore queries used by lead_service: ==/>= filters, order_by, select, start_after, limit."""
+
+    def __init__(self, docs, filters=(), orders=(), fields=None, after=None, count=None):
+        self._docs, self._filters, self._orders = docs, list(filters), list(orders)
+        self._fields, self._after, self._count = fields, after, count
+
+    def _with(self, **changes):
+        state = {"filters": self._filters, "orders": self._orders, "fields": self._fields,
+                 "after": self._after, "count": self._count}
+        state.update(changes)
+        return FakeQuery(self._docs, **state)
+
+    def where(self, field_path, op, value):
+        return self._with(filters=self._filters + [(field_path, op, value)])
+
+    def order_by(self, field_path, direction="ASCENDING"):
+        return self._with(orders=self._orders + [(str(field_path), direction)])
+
+    def select(self, field_paths):
+        return self._with(fields=list(field_paths))
+
+    def start_after(self, values):
+        return self._with(after=list(values))
+
+    def limit(self, count):
+        return self._with(count=count)
+
+    def _sort_values(self, doc_id, data):
+        return [doc_id if field_path == "__name__" else nested(data, field_path) for field_path, _ in self._orders]
+
+    def _compare(self, a, b):
+        for x, y, (_, direction) in zip(a, b, self._orders):
+            if x != y:
+                result = -1 if x < y else 1
+                return -result if direction == "DESCENDING" else result
+        return 0
+
+    def stream(self):
+        rows = []
+        for doc_id, data in self._docs.items():
+            ok = True
+            for field_path, op, value in self._filters:
+                actual = nested(data, field_path)
+                ok = ok and actual is not None and (actual == value if op == "==" else actual >= value)
+            # Firestore skips documents missing an order field.
+            ok = ok and None not in self._sort_values(doc_id, data)
+            if ok:
+                rows.append((self._sort_values(doc_id, data), doc_id, data))
+        rows.sort(key=cmp_to_key(lambda a, b: self._compare(a[0], b[0])))
+        if self._after is not None:
+            rows = [row for row in rows if self._compare(row[0], self._after) > 0]
+        rows = rows[:self._count] if self._count is not None else rows
+        for _, doc_id, data in rows:
+            if self._fields is not None:
+                projected = {}
+                for field_path in self._fields:
+                    value = nested(data, field_path)
+                    if value is not None:
+                        target = projected
+                        *parents, last = field_path.split(".")
+                        for key in parents:
+                            target = target.setdefault(key, {})
+                        target[last] = value
+                data = projected
+            yield FakeSnapshot(doc_id, data)
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id):
+        return FakeDocument(self._docs, doc_id)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.collections = {"services": {}, "Leads": {}}
+        self.reads = 0
+
+    def collection(self, name):
+        if name == "Leads":
+            self.reads += 1
+        return FakeCollection(self.collections[name])
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode("utf-8")
+        return int(self.data[key])
+
+
+def setup(monkeypatch, cache=True):
+    db, redis = FakeFirestore(), FakeRedis()
+    db.collections["services"][SERVICE_ID] = {"generation_status": "done"}
+    for i, (score, classification) in enumerate([(91, "Hot"), (40, "Cold"), (77, "Hot"), (12, "Cold"), (77, "Hot")]):
+        db.collections["Leads"][f"lead-{i}"] = {
+            "company_name": f"Company {i}",
+            "service_id": SERVICE_ID,
+            "report_url": f"https://reports/{i}.txt",
+            "key_personals": [{"name": f"Person {i}", "role": "CTO"}],
+            "qualification": {"final_score": score, "classification": classification, "justification": "..."},
+        }
+    monkeypatch.setattr(lead_service, "get_firestore_db", lambda: db)
+    monkeypatch.setattr(lead_cache, "get_redis", lambda: redis)
+    monkeypatch.setattr(lead_cache, "LEAD_LIST_CACHE_ENABLED", cache)
+    return db, redis
+
+
+def all_pages(**params):
+    ids, cursor = [], None
+    while True:
+        page = lead_service.list_leads(SERVICE_ID, cursor=cursor, **params)
+        ids.extend(lead["id"] for lead in page["leads"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip(monkeypatch):
+    setup(monkeypatch, cache=False)
+
+    assert all_pages(limit=2) == [f"lead-{i}" for i in range(5)]
+    # Ties on the score are broken by the document id, across page boundaries too.
+    assert all_pages(limit=2, sort="score") == ["lead-0", "lead-2", "lead-4", "lead-1", "lead-3"]
+    assert all_pages(limit=1, sort="score", min_score=50) == ["lead-0", "lead-2", "lead-4"]
+
+
+def test_projected_fields_only(monkeypatch):
+    setup(monkeypatch, cache=False)
+
+    page = lead_service.list_leads(SERVICE_ID, limit=2, fields=["company_name", "qualification.final_score"])
+    assert page["leads"] == [
+        {"id": "lead-0", "company_name": "Company 0", "qualification": {"final_score": 91}},
+        {"id": "lead-1", "company_name": "Company 1", "qualification": {"final_score": 40}},
+    ]
+
+
+def list_endpoint(if_none_match=None):
+    response = Response()
+    result = lead_endpoint.list_leads_endpoint(
+        SERVICE_ID, response, limit=2, cursor=None, fields=None, classification=None,
+        min_score=None, sort="id", if_none_match=if_none_match,
+    )
+    return result, response
+
+
+def test_not_modified_on_matching_if_none_match(monkeypatch):
+    setup(monkeypatch, cache=False)
+
+    page, response = list_endpoint()
+    etag = response.headers["ETag"]
+    assert [lead["id"] for lead in page["leads"]] == ["lead-0", "lead-1"]
+
+    not_modified, _ = list_endpoint(if_none_match=f'W/{etag}')
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_new_etag_after_version_bump(monkeypatch):
+    db, _ = setup(monkeypatch)
+
+    first = lead_service.list_leads(SERVICE_ID, limit=2)
+    reads = db.reads
+    db.collections["Leads"]["lead-0"]["company_name"] = "Company 0 renamed"
+
+    # Served from Redis until the pipeline bumps the service's version.
+    assert lead_service.list_leads(SERVICE_ID, limit=2)["etag"] == first["etag"]
+    assert db.reads == reads
+
+    lead_cache.bump_leads_version(SERVICE_ID)
+    fresh = lead_service.list_leads(SERVICE_ID, limit=2)
+    assert fresh["etag"] != first["etag"]
+    assert fresh["leads"][0]["company_name"] == "Company 0 renamed"